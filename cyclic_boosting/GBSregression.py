@@ -49,6 +49,7 @@ class CBGBSRegressor(RegressorMixin, CyclicBoostingBase, IdentityLinkMixin):
         learn_rate=None,
         regalpha=0.0,
         aggregate=True,
+        minimal_feature_factor_change=None,
     ):
         CyclicBoostingBase.__init__(
             self,
@@ -63,6 +64,7 @@ class CBGBSRegressor(RegressorMixin, CyclicBoostingBase, IdentityLinkMixin):
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
         )
 
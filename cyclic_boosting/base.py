@@ -21,6 +21,7 @@ from cyclic_boosting.utils import (
     slice_finite_semi_positive,
     nans,
     get_X_column,
+    get_target,
     ConvergenceError,
     ConvergenceParameters,
 )
@@ -31,6 +32,9 @@ from typing import Any, Dict, Optional, Union, Tuple, List, Set
 
 _logger = logging.getLogger(__name__)
 
+#: Maximal number of iterations between two visits of a converged feature
+_MAXIMAL_FEATURE_VISIT_INTERVAL = 8
+
 
 def get_influence_category(feature: Feature, influence_categories: dict) -> Union[None, str]:
     influence_category = None
@@ -235,6 +239,16 @@ class CyclicBoostingBase(
     aggregate: boolean or None
         Description is required
 
+    minimal_feature_factor_change: float or None
+        If set, features whose factors change by less than this value (mean
+        absolute change in link space) in an iteration are considered
+        converged and are only visited in every second, fourth, up to every
+        eighth iteration, which saves their parameter calculation and
+        smoothing. A feature is visited in every iteration again as soon as
+        its factors change more. Before the stop criteria are accepted and in
+        the last iteration, all features are visited. If None (default), all
+        features are visited in every iteration.
+
     Notes
     -----
 
@@ -281,6 +295,7 @@ class CyclicBoostingBase(
         output_column: Optional[str] = None,
         learn_rate: Optional[float] = None,
         aggregate: Optional[bool] = True,
+        minimal_feature_factor_change: Optional[float] = None,
     ):
         if smoother_choice is None:
             self.smoother_choice = common_smoothers.SmootherChoiceWeightedMean()
@@ -302,6 +317,8 @@ class CyclicBoostingBase(
         self.training_iterations_hierarchical_features = training_iterations_hierarchical_features
         self.feature_importances = {}
         self.aggregate = aggregate
+        self.minimal_feature_factor_change = minimal_feature_factor_change
+        self.skipped_features_ = []
 
         self.weight_column = weight_column
         self.weights = None
@@ -313,6 +330,8 @@ class CyclicBoostingBase(
         self.minimal_loss_change = minimal_loss_change
         self.minimal_factor_change = minimal_factor_change
         self.maximal_iterations = maximal_iterations
+        # iterations after which the fit is stopped early, not seen by the learning rate
+        self._iteration_cap = None
         self.observers = observers
         if self.observers is None:
             self.observers = []
@@ -338,6 +357,12 @@ class CyclicBoostingBase(
             sum_weights = numexpr.evaluate("sum(weights)")
             return sum_weighted_error / sum_weights
 
+    def _score_loss(self, X: Union[pd.DataFrame, np.ndarray], y: np.ndarray, weights: np.ndarray) -> float:
+        """Loss of the fitted estimator on the samples ``X`` and ``y``, e.g.,
+        of a test set. Estimators whose :meth:`loss` needs further inputs from
+        ``X`` set them up here."""
+        return self.loss(self.predict(X), y, weights)
+
     @property
     def global_scale_(self) -> np.ndarray:
         """
@@ -442,10 +467,13 @@ class CyclicBoostingBase(
         to it.
         """
         self.features = create_features(self.feature_groups, self.feature_properties, self.smoother_choice)
+        if self.minimal_feature_factor_change is not None:
+            for feature in self.features:
+                feature.minimal_factor_change = self.minimal_feature_factor_change
 
     def _get_prior_predictions(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
         if self.prior_prediction_column is None:
-            prior_prediction_link = np.repeat(self.global_scale_link_, X.shape[0])
+            prior_prediction_link = np.repeat(self.global_scale_link_, len(X))
         else:
             prior_pred = get_X_column(X, self.prior_prediction_column)
             prior_prediction_link = self.link_func(prior_pred) + self.prior_pred_link_offset_
@@ -556,6 +584,9 @@ class CyclicBoostingBase(
 
     def remove_preds(self, pred: CBLinkPredictionsFactors, X: np.ndarray) -> None:
         for feature in self.features:
+            if feature.stop_iterations and feature.last_visit_iteration < self.iteration_:
+                # not updated in this iteration, see _is_feature_skipped
+                continue
             if feature.feature_type is None:
                 weights = self.weights
             else:
@@ -655,6 +686,27 @@ class CyclicBoostingBase(
 
         factors_link, uncertainties_link = self.calc_parameters(feature, y, pred, prefit_data=prefit_data)
 
+        self.update_feature_factors(feature, factors_link, uncertainties_link, X, y, pred)
+        feature_predictions = self._pred_feature(X, feature, is_fit=True)
+        pred.update_predictions(feature_predictions, feature)
+
+        return pred
+
+    def update_feature_factors(
+        self,
+        feature: Feature,
+        factors_link: np.ndarray,
+        uncertainties_link: np.ndarray,
+        X: np.ndarray,
+        y: np.ndarray,
+        pred: Optional[CBLinkPredictionsFactors],
+    ) -> None:
+        """Set the factors of a feature from the bin results of
+        :meth:`calc_parameters`, i.e., smooth them, apply the learning rate,
+        calibrate and clip them.
+
+        ``pred`` is only used if the fit is diverging.
+        """
         X_for_smoother = feature.update_factors(
             factors_link.copy(),
             uncertainties_link,
@@ -669,27 +721,84 @@ class CyclicBoostingBase(
         feature.factors_link = self.calibrate_to_weighted_mean(feature)
 
         self.visit_factors(feature, factors_link, X, y, pred)
-        feature_predictions = self._pred_feature(X, feature, is_fit=True)
-        pred.update_predictions(feature_predictions, feature)
 
-        return pred
+    def _update_feature_schedule(self, feature: Feature) -> None:
+        """Mark a feature as converged if its factors changed less than
+        ``minimal_feature_factor_change`` in its last visit and double the
+        number of iterations until its next visit, see
+        :meth:`_is_feature_skipped`."""
+        if self.minimal_feature_factor_change is None:
+            return
+        if self.aggregate:
+            # factors_link is the update of the aggregated factors
+            factor_change = np.mean(np.abs(feature.factors_link - self.neutral_factor_link))
+        else:
+            factor_change = np.mean(np.abs(feature.factors_link - feature.factors_link_old))
+        if factor_change < feature.minimal_factor_change:
+            feature.stop_iterations = True
+            feature.visit_interval = min(2 * feature.visit_interval, _MAXIMAL_FEATURE_VISIT_INTERVAL)
+        else:
+            feature.stop_iterations = False
+            feature.visit_interval = 1
+        feature.last_visit_iteration = self.iteration_
+
+    def _is_feature_skipped(self, feature: Feature, full_sweep: bool) -> bool:
+        return (
+            not full_sweep
+            and feature.stop_iterations
+            and self.iteration_ - feature.last_visit_iteration < feature.visit_interval
+        )
+
+    def _prepare_feature_update(
+        self,
+        i: int,
+        feature: Feature,
+        X: np.ndarray,
+        y: np.ndarray,
+        pred: Optional[CBLinkPredictionsFactors],
+        prefit_data,
+        full_sweep: bool,
+    ) -> bool:
+        """Bind the data to the ``i``-th feature if needed and initialize it
+        in the first iteration. Returns False if the feature is not updated in
+        this iteration."""
+        if self.iteration_ > 0 and self._is_feature_skipped(feature, full_sweep):
+            # converged feature: no update in this iteration
+            feature.factors_link_old = feature.factors_link.copy()
+            self.skipped_features_.append(feature.feature_group)
+            return False
+        if feature.lex_binned_data is None:
+            # X and the weights do not change during the fit
+            feature.bind_data(X, self.weights if feature.feature_type is None else self.weights_external)
+        if self.iteration_ == 0:
+            feature.factors_link = np.ones(feature.n_bins) * self.neutral_factor_link
+            if prefit_data is not None:
+                prefit_data[i] = self.precalc_parameters(feature, y, pred)
+        if (
+            self.hierarchical_feature_groups is not None
+            and self.iteration_ < self.training_iterations_hierarchical_features
+            and feature.feature_group not in self.hierarchical_features
+        ):
+            feature.factors_link_old = feature.factors_link.copy()
+            return False
+        return True
 
     def cb_features(
-        self, X: np.ndarray, y: np.ndarray, pred: CBLinkPredictionsFactors, prefit_data
+        self, X: np.ndarray, y: np.ndarray, pred: CBLinkPredictionsFactors, prefit_data, full_sweep: bool = True
     ) -> Tuple[int, Any, Any]:
         for i, feature in enumerate(self.features):
-            if feature.feature_type is None:
-                weights = self.weights
-            else:
-                weights = self.weights_external
-            if self.iteration_ == 0:
-                feature.bind_data(X, weights)
-                feature.factors_link = np.ones(feature.n_bins) * self.neutral_factor_link
-                if prefit_data is not None:
-                    prefit_data[i] = self.precalc_parameters(feature, y, pred)
-            else:
-                feature.bind_data(X, weights)
-            yield i, feature, prefit_data[i]
+            if self._prepare_feature_update(i, feature, X, y, pred, prefit_data, full_sweep):
+                yield i, feature, prefit_data[i]
+
+    def _feature_updated(self, i: int, feature: Feature, X: np.ndarray, y: np.ndarray, prediction: np.ndarray) -> None:
+        """Bookkeeping after the update of the ``i``-th feature."""
+        self._update_feature_schedule(feature)
+        self._call_observe_feature_iterations(self.iteration_, i, X, y, prediction)
+
+        if feature.factor_sum is None:
+            feature.factor_sum = [np.sum(np.abs(feature.fitted_aggregated))]
+        else:
+            feature.factor_sum.append(np.sum(np.abs(feature.fitted_aggregated)))
 
     def fit(
         self, X: Union[pd.DataFrame, np.ndarray], y: Optional[np.ndarray] = None
@@ -710,59 +819,64 @@ class CyclicBoostingBase(
         self._init_features()
         self._init_global_scale(X, y)
 
-    def _fit_main(self, X: np.ndarray, y: np.ndarray, pred: CBLinkPredictionsFactors) -> np.ndarray:
+    def _init_iterations(self, y: np.ndarray, prediction: np.ndarray) -> ConvergenceParameters:
+        """Reset the state of the iterations for the prior ``prediction``."""
         self.diverging = 0
         self.is_diverging = False
 
         _logger.info("Cyclic Boosting global scale {}".format(self.global_scale_))
 
-        prediction = self.unlink_func(pred.predict_link())
-
         self.insample_loss_ = self.loss(prediction, y, self.weights)
         self.initial_loss_ = self.insample_loss_
         self.initial_msd_ = self.insample_loss_
         self.iteration_ = 0
-        prefit_data = [None for _ in self.features]
-
-        convergence_parameters = ConvergenceParameters()
-
-        while (not self._check_stop_criteria(self.iteration_, convergence_parameters)) or self.is_diverging:
-            self._call_observe_iterations(self.iteration_, X, y, prediction, convergence_parameters.delta)
 
-            self._log_iteration_info(convergence_parameters)
-            for i, feature, pf_data in self.cb_features(X, y, pred, prefit_data):
-                if (
-                    self.hierarchical_feature_groups is not None
-                    and self.iteration_ < self.training_iterations_hierarchical_features
-                    and feature.feature_group not in self.hierarchical_features
-                ):
-                    feature.factors_link_old = feature.factors_link.copy()
-                    continue
-                pred = self.feature_iteration(X, y, feature, pred, pf_data)
-                self._call_observe_feature_iterations(self.iteration_, i, X, y, prediction)
-
-                if feature.factor_sum is None:
-                    feature.factor_sum = [np.sum(np.abs(feature.fitted_aggregated))]
-                else:
-                    feature.factor_sum.append(np.sum(np.abs(feature.fitted_aggregated)))
-
-            prediction = self.unlink_func(pred.predict_link())
-
-            updated_loss_change = self._update_loss(prediction, y)
-            convergence_parameters.set_loss_change(updated_loss_change=updated_loss_change)
-
-            updated_delta = _factors_deviation(self.features)
-            convergence_parameters.set_delta(updated_delta=updated_delta)
+        self.skipped_features_ = []
+        for feature in self.features:
+            feature.stop_iterations = False
+            feature.visit_interval = 1
+        return ConvergenceParameters()
+
+    def _continue_iterations(self, convergence_parameters: ConvergenceParameters) -> bool:
+        return (
+            (not self._check_stop_criteria(self.iteration_, convergence_parameters))
+            or self.is_diverging
+            or len(self.skipped_features_) > 0
+        )
 
-            if self.is_diverging:
-                self.remove_preds(pred, X)
+    def _start_iteration(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        prediction: np.ndarray,
+        convergence_parameters: ConvergenceParameters,
+        full_sweep: bool,
+    ) -> bool:
+        """Start an iteration and return if it has to visit all features."""
+        self._call_observe_iterations(self.iteration_, X, y, prediction, convergence_parameters.delta)
+
+        self._log_iteration_info(convergence_parameters)
+        self.skipped_features_ = []
+        # the stop criteria are only accepted after iterations visiting all features
+        return full_sweep or any(self.stop_criteria_) or self.iteration_ + 1 >= self._last_iteration()
+
+    def _update_convergence(
+        self, prediction: np.ndarray, y: np.ndarray, convergence_parameters: ConvergenceParameters
+    ) -> None:
+        """Update the loss and the convergence parameters after an iteration."""
+        updated_loss_change = self._update_loss(prediction, y)
+        convergence_parameters.set_loss_change(updated_loss_change=updated_loss_change)
 
-            self.iteration_ += 1
+        updated_delta = _factors_deviation(self.features)
+        convergence_parameters.set_delta(updated_delta=updated_delta)
 
+    def _finish_fit(
+        self, X: np.ndarray, y: np.ndarray, prediction: np.ndarray, convergence_parameters: ConvergenceParameters
+    ) -> None:
         # compute feature importances
         self.set_feature_importances()
 
-        if len(self.observers) > 0:
+        if any(getattr(observer, "requires_plot_data", True) for observer in self.observers):
             self.prepare_plots(X, y, prediction)
 
         self._call_observe_iterations(-1, X, y, prediction, convergence_parameters.delta)
@@ -773,6 +887,28 @@ class CyclicBoostingBase(
         for feature in self.features:
             feature.clear_feature_reference(observers=self.observers)
 
+    def _fit_main(self, X: np.ndarray, y: np.ndarray, pred: CBLinkPredictionsFactors) -> np.ndarray:
+        prediction = self.unlink_func(pred.predict_link())
+        convergence_parameters = self._init_iterations(y, prediction)
+        prefit_data = [None for _ in self.features]
+        full_sweep = False
+
+        while self._continue_iterations(convergence_parameters):
+            full_sweep = self._start_iteration(X, y, prediction, convergence_parameters, full_sweep)
+            for i, feature, pf_data in self.cb_features(X, y, pred, prefit_data, full_sweep):
+                pred = self.feature_iteration(X, y, feature, pred, pf_data)
+                self._feature_updated(i, feature, X, y, prediction)
+
+            prediction = self.unlink_func(pred.predict_link())
+            self._update_convergence(prediction, y, convergence_parameters)
+
+            if self.is_diverging:
+                self.remove_preds(pred, X)
+
+            self.iteration_ += 1
+
+        self._finish_fit(X, y, prediction, convergence_parameters)
+
         return prediction
 
     def prepare_plots(self, X: np.ndarray, y: np.ndarray, prediction: np.ndarray) -> None:
@@ -819,7 +955,7 @@ class CyclicBoostingBase(
 
         Iterate to calculate the factors and the global scale.
         """
-        y = np.asarray(y)
+        y = np.asarray(get_target(X, y))
         self._init_fit(X, y)
         pred = CBLinkPredictionsFactors(self._get_prior_predictions(X))
         prediction = self._fit_main(X, y, pred)
@@ -877,6 +1013,15 @@ class CyclicBoostingBase(
         X[self.output_column] = self.predict(X=X, y=y)
         return X
 
+    def _last_iteration(self) -> int:
+        """Number of iterations after which the fit stops: ``maximal_iterations``
+        or, if smaller, ``_iteration_cap``. As the learning rate only depends on
+        ``maximal_iterations``, a capped fit follows the first iterations of
+        the full fit."""
+        if self._iteration_cap is None:
+            return self.maximal_iterations
+        return min(self.maximal_iterations, self._iteration_cap)
+
     def _check_stop_criteria(self, iterations: int, convergence_parameters: ConvergenceParameters) -> bool:
         """
         Checks the stop criteria and returns True if at least one is satisfied.
@@ -894,10 +1039,10 @@ class CyclicBoostingBase(
         delta = convergence_parameters.delta
         loss_change = convergence_parameters.loss_change
 
-        if iterations >= self.maximal_iterations:
+        if iterations >= self._last_iteration():
             _logger.info(
                 "Cyclic Boosting stopped because the number of "
-                "iterations reached the maximum of {}.".format(self.maximal_iterations)
+                "iterations reached the maximum of {}.".format(self._last_iteration())
             )
             stop_iterations = True
 
@@ -6,12 +6,14 @@ from cyclic_boosting.binning._utils import (
     minimal_difference,
 )
 from cyclic_boosting.binning.bin_number_transformer import BinNumberTransformer
+from cyclic_boosting.binning.binned_dataset import BinnedDataset, binned_dataset_key
 from cyclic_boosting.binning.ecdf_transformer import (
     ECdfTransformer,
     get_feature_column_names_or_indices,
     get_weight_column,
     reduce_cdf_and_boundaries_to_nbins,
 )
+from cyclic_boosting.binning.quantile_sketch import WeightedQuantileSketch
 
 MISSING_VALUE_AS_BINNO = -1
 
@@ -25,4 +27,7 @@ __all__ = [
     "get_column_index",
     "minimal_difference",
     "get_bin_bounds",
+    "WeightedQuantileSketch",
+    "BinnedDataset",
+    "binned_dataset_key",
 ]
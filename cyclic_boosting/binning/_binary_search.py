@@ -82,7 +82,7 @@ def ge(z, z_searched, inclusive):
     return i_right
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True)
 def eq_multi(z, z_searched, u, epsilon, result):
     """
     Search the values of `z_searched` in z and return u[i_found] if
@@ -122,7 +122,7 @@ def eq_multi(z, z_searched, u, epsilon, result):
             result[i] = np.nan
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True)
 def ge_multi(z, z_searched, inclusive, result):
     """
     Binary search for the **first** elements **greater than or equal to**
@@ -206,7 +206,7 @@ def le_interp(z, z_searched, u, out_left, epsilon):
     return u0
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True)
 def le_interp_multi(z, z_searched, u, out_left, epsilon, result):
     """
     Interpolation of values between the position found by :func:`le` (i.e. the
@@ -1,11 +1,14 @@
 from __future__ import absolute_import, division, print_function
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 
 from cyclic_boosting import flags
+from cyclic_boosting.utils import is_arrow_table
 
 _logger = logging.getLogger(__name__)
 
@@ -72,6 +75,8 @@ def get_column_index(X, column_name_or_index):
     """
     if isinstance(X, pd.DataFrame):
         return list(X.columns).index(column_name_or_index)
+    elif is_arrow_table(X):
+        return X.schema.get_field_index(column_name_or_index)
     else:
         return column_name_or_index
 
@@ -100,13 +105,55 @@ def get_bin_bounds(binners, feat_group):
 
 
 def check_frame_empty(X):
-    """Check if a :class:`pd.DataFrame` or a :class:`numpy.ndarray`
-    is empty.
+    """Check if a :class:`pd.DataFrame`, a :class:`numpy.ndarray` or an
+    Arrow table is empty.
 
     :param X: input matrix
-    :type X: :class:`pd.DataFrame` or a :class:`numpy.ndarray`
+    :type X: :class:`pd.DataFrame`, :class:`numpy.ndarray` or
+        :class:`pyarrow.Table`
     """
     if isinstance(X, pd.DataFrame):
         return X.empty
+    elif is_arrow_table(X):
+        return X.num_rows == 0 or X.num_columns == 0
     else:
         return X.size == 0
+
+
+def _effective_n_jobs(n_jobs):
+    """Number of threads for ``n_jobs`` in the scikit-learn convention
+    (``None`` means 1, negative values count back from the number of CPUs)."""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    if n_jobs == 0:
+        raise ValueError("n_jobs == 0 has no meaning.")
+    return n_jobs
+
+
+def map_columns(func, columns, n_jobs=None):
+    """Apply ``func`` to each of the ``columns`` and return the results in the
+    same order.
+
+    With ``n_jobs`` different from 1, the columns are processed on a thread
+    pool. This pays off for work that releases the GIL, like the numba
+    binary searches or the sorting in numpy.
+
+    :param func: function called with a single column name or index
+    :type func: callable
+
+    :param columns: column names or indices
+    :type columns: list
+
+    :param n_jobs: number of threads, ``None`` or 1 for serial execution,
+        -1 for all CPUs
+    :type n_jobs: int or ``NoneType``
+
+    :rtype: list
+    """
+    n_threads = min(_effective_n_jobs(n_jobs), len(columns))
+    if n_threads <= 1:
+        return [func(col) for col in columns]
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        return list(executor.map(func, columns))
@@ -6,9 +6,17 @@ import numpy as np
 import pandas as pd
 
 from cyclic_boosting import flags
+from cyclic_boosting.utils import (
+    arrow_column_to_numpy,
+    arrow_values_and_validity,
+    get_arrow_column,
+    is_arrow_numeric,
+    is_arrow_table,
+    replace_arrow_columns,
+)
 
 from ._binary_search import eq_multi, ge_multi
-from ._utils import _read_feature_property, check_frame_empty
+from ._utils import _read_feature_property, check_frame_empty, map_columns
 from .ecdf_transformer import ECdfTransformer
 
 from typing import Union, Optional
@@ -87,6 +95,20 @@ class BinNumberTransformer(ECdfTransformer):
         required to have only 0.95% of the total bin weights instead of
         1.0%)
 
+    sketch_epsilon: float or None
+        If set, continuous features are binned approximately using a
+        :class:`~cyclic_boosting.binning.WeightedQuantileSketch` with this rank
+        error, see :class:`ECdfTransformer`. Default: None (exact binning)
+
+    sketch_chunk_size: int
+        Number of rows added to the sketch at once if ``sketch_epsilon`` is
+        set. Default: 2**20
+
+    n_jobs: int or None
+        Number of threads used to bin the feature columns in :meth:`fit` and
+        :meth:`transform` in parallel. ``None`` means 1, -1 means all CPUs.
+        Default: None
+
     Examples
     --------
 
@@ -127,6 +149,9 @@ class BinNumberTransformer(ECdfTransformer):
         epsilon=1e-9,
         tolerance=0.1,
         inplace=False,
+        sketch_epsilon=None,
+        sketch_chunk_size=2**20,
+        n_jobs=None,
     ):
         self.n_bins = n_bins
         self.feature_properties = feature_properties
@@ -142,10 +167,25 @@ class BinNumberTransformer(ECdfTransformer):
             weight_column=self.weight_column,
             epsilon=self.epsilon,
             tolerance=self.tolerance,
+            sketch_epsilon=sketch_epsilon,
+            sketch_chunk_size=sketch_chunk_size,
+            n_jobs=n_jobs,
         )
 
     def _transform_one_feature(self, X, feature_prop, col, epsilon, bins_and_cdfs):
-        xt = column_selector(X, col).astype(np.float64)
+        if bins_and_cdfs is not None and not flags.is_continuous_set(feature_prop):
+            xt = self._transform_one_discrete_feature_by_lookup(X, feature_prop, col, bins_and_cdfs)
+            if xt is not None:
+                return xt
+
+        valid = None
+        if is_arrow_table(X) and is_arrow_numeric(get_arrow_column(X, col)):
+            # mask missing values with the validity bitmap after the binning
+            # instead of creating a NaN-filled copy first
+            x, valid = arrow_values_and_validity(get_arrow_column(X, col))
+            xt = x.astype(np.float64)
+        else:
+            xt = column_selector(X, col).astype(np.float64)
 
         def is_finite(x):
             if flags.has_magic_missing_set(feature_prop):
@@ -172,22 +212,78 @@ class BinNumberTransformer(ECdfTransformer):
             # re_check for nans, which may have been brought in by the
             # binary search (values out of bounds)
             xt[~is_finite(xt)] = MISSING_VALUE_AS_BINNO
+            if valid is not None:
+                xt[~valid] = MISSING_VALUE_AS_BINNO
         else:
             xt = MISSING_VALUE_AS_BINNO
         return xt
 
+    def _transform_one_discrete_feature_by_lookup(self, X, feature_prop, col, bins_and_cdfs):
+        """Bin numbers of a discrete feature from a lookup array, without a
+        binary search on a float copy of the column. This works for
+        :class:`pandas.Categorical` columns (via the category codes), string
+        columns and integer columns. For all other columns, None is returned.
+        """
+        x = column_selector(X, col)
+        categories = getattr(self, "categories_", {}).get(col)
+        if categories is None:
+            categories = bins_and_cdfs[1:, 0]
+        magic_missing = flags.has_magic_missing_set(feature_prop)
+
+        if isinstance(x.dtype, pd.CategoricalDtype):
+            lookup = pd.Index(categories).get_indexer(x.categories)
+            if magic_missing:
+                lookup[x.categories.isin([-9, -999])] = -1
+            # the code of missing values is -1, which picks the last entry
+            lookup = np.r_[lookup, -1]
+            xt = lookup[x.codes]
+        elif x.dtype.kind in "OSU":
+            xt = pd.Index(categories).get_indexer(x)
+        elif pd.api.types.is_integer_dtype(x.dtype) and np.all(categories == np.round(categories)):
+            if isinstance(x.dtype, np.dtype):
+                missing = None
+                x = np.asarray(x)
+            else:
+                # nullable integers: the missing values go to the missing bin
+                missing = np.asarray(pd.isna(x))
+                x = np.asarray(x.to_numpy(dtype=np.int64, na_value=0))
+            categories = categories.astype(np.int64)
+            offset = categories[0]
+            n_lookup = categories[-1] - offset + 1
+            if n_lookup <= max(4 * len(categories), 2**16):
+                lookup = np.full(n_lookup, -1)
+                lookup[categories - offset] = np.arange(len(categories))
+                index = x.astype(np.int64) - offset
+                in_range = (index >= 0) & (index < n_lookup)
+                xt = np.full(len(x), -1)
+                xt[in_range] = lookup[index[in_range]]
+            else:
+                xt = pd.Index(categories).get_indexer(x)
+            if magic_missing:
+                xt[(x == -9) | (x == -999)] = -1
+            if missing is not None:
+                xt[missing] = -1
+        else:
+            return None
+
+        xt[xt < 0] = MISSING_VALUE_AS_BINNO
+        return xt
+
     def transform(
         self, X_orig: Union[pd.DataFrame, np.ndarray], y: Optional[np.ndarray] = None
     ) -> Union[pd.DataFrame, np.ndarray]:
         self._check_input_for_transform(X_orig)
 
-        if not self.inplace:
+        if not self.inplace and not is_arrow_table(X_orig):
             X = X_orig.copy()
         else:
+            # Arrow tables are immutable, a new table is returned
             X = X_orig
 
         if check_frame_empty(X):
-            if isinstance(X, pd.DataFrame):
+            if is_arrow_table(X):
+                return X
+            elif isinstance(X, pd.DataFrame):
                 X = X.astype({col: np.int8 for col, _, _ in self.bins_and_cdfs_})
             else:
                 return _as_int_array_of_minimum_dtype(X)
@@ -196,14 +292,34 @@ class BinNumberTransformer(ECdfTransformer):
 
         n_transformed_features = len(self.bins_and_cdfs_)
 
-        for col, epsilon, bins_and_cdfs in self.bins_and_cdfs_:
+        def transform_one_feature(col_epsilon_bins_and_cdfs):
+            col, epsilon, bins_and_cdfs = col_epsilon_bins_and_cdfs
             feature_prop = _read_feature_property(col, self.feature_properties)
 
             if feature_prop is None:
-                pass
+                return None
+
+            xt = self._transform_one_feature(X, feature_prop, col, epsilon, bins_and_cdfs)
+            if isinstance(X, pd.DataFrame) or is_arrow_table(X):
+                if np.ndim(xt) == 0:
+                    xt = np.full(len(X), xt)
+                return col, _as_int_array_of_minimum_dtype(xt)
             else:
-                xt = self._transform_one_feature(X, feature_prop, col, epsilon, bins_and_cdfs)
                 column_setter(X, col, xt)
+                return None
+
+        binned_columns = [
+            result
+            for result in map_columns(transform_one_feature, self.bins_and_cdfs_, self.n_jobs)
+            if result is not None
+        ]
+
+        if isinstance(X, pd.DataFrame) and len(binned_columns) > 0:
+            # insert all binned columns at once instead of one by one
+            binned = dict(binned_columns)
+            X[list(binned)] = pd.DataFrame(binned, index=X.index)
+        elif is_arrow_table(X):
+            return replace_arrow_columns(X, dict(binned_columns))
 
         if not isinstance(X, pd.DataFrame) and n_transformed_features == X.shape[1]:
             X = _as_int_array_of_minimum_dtype(X)
@@ -214,9 +330,11 @@ class BinNumberTransformer(ECdfTransformer):
 
 
 def column_selector(X, column):
-    """Dispatches to column selection via pandas or numpy, depending on the type of X"""
+    """Dispatches to column selection via pandas, Arrow or numpy, depending on the type of X"""
     if isinstance(X, pd.DataFrame):
         return X[column].values
+    elif is_arrow_table(X):
+        return arrow_column_to_numpy(get_arrow_column(X, column))
     else:
         return X[:, int(column)]
 
@@ -0,0 +1,283 @@
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import sklearn.base as sklearnb
+
+from cyclic_boosting.utils import get_X_column
+
+from .ecdf_transformer import get_feature_column_names_or_indices
+
+_logger = logging.getLogger(__name__)
+
+#: Version of the on-disk layout, part of the cache key
+BINNED_DATASET_FORMAT_VERSION = 1
+
+#: Parameters of the binning transformers that do not change the binning
+_PARAMS_NOT_IN_KEY = {"n_jobs", "inplace"}
+
+
+def _normalized_repr(value):
+    if isinstance(value, dict):
+        return (
+            "{" + ", ".join("{!r}: {}".format(k, _normalized_repr(v)) for k, v in sorted(value.items(), key=str)) + "}"
+        )
+    return repr(value)
+
+
+def _update_hash_with_array(h, x):
+    if isinstance(x, np.ndarray) and x.dtype.kind in "biufcmM":
+        h.update(str(x.dtype).encode())
+        h.update(np.ascontiguousarray(x).view(np.uint8).data)
+    else:
+        if not isinstance(x, pd.Categorical):
+            x = np.asarray(x, dtype=object)
+        h.update(b"object")
+        h.update(pd.util.hash_array(x).data)
+
+
+def binned_dataset_key(binner, X, y=None):
+    """Cache key of the binned dataset of ``X`` (and ``y``) for the binning
+    transformer ``binner``.
+
+    The key is a hash of the class and the parameters of ``binner`` (except
+    ``n_jobs`` and ``inplace``), the column names and the raw bytes of all
+    columns of ``X`` and of ``y``. The binner does not have to be fitted.
+
+    Parameters
+    ----------
+    binner: :class:`~cyclic_boosting.binning.BinNumberTransformer`
+        binning transformer
+    X: :class:`pandas.DataFrame`, :class:`numpy.ndarray` or Arrow table
+        unbinned feature matrix
+    y: :class:`numpy.ndarray` or None
+        target
+
+    Returns
+    -------
+    str
+        hexadecimal hash
+    """
+    h = hashlib.blake2b(digest_size=20)
+    params = {k: v for k, v in binner.get_params().items() if k not in _PARAMS_NOT_IN_KEY}
+    h.update(
+        "{} {}.{} {}".format(
+            BINNED_DATASET_FORMAT_VERSION,
+            type(binner).__module__,
+            type(binner).__name__,
+            _normalized_repr(params),
+        ).encode()
+    )
+    for col in get_feature_column_names_or_indices(X):
+        h.update(repr(col).encode())
+        _update_hash_with_array(h, get_X_column(X, col))
+    if y is not None:
+        h.update(b"y")
+        _update_hash_with_array(h, np.asarray(y))
+    return h.hexdigest()
+
+
+class BinnedDataset(object):
+    """Binned feature matrix cached on disk in a memory-mappable columnar
+    layout.
+
+    Each column of the output of
+    :class:`~cyclic_boosting.binning.BinNumberTransformer` is stored in its
+    own ``.npy`` file with the minimal integer type of the bin numbers
+    (``int8``/``int16``). Columns that are not binned, like the weight column
+    or a prior prediction column, are stored as they are, if they are
+    numeric. The target and the fitted binner (with its bin boundaries) are
+    stored next to them.
+
+    Loading maps the files read-only into memory, so it takes almost no time
+    and memory independent of the size of the data. Instances can be passed
+    as ``X`` to the Cyclic Boosting estimators (``fit`` uses the stored
+    target if ``y`` is None) and to their ``predict`` method. The columns are
+    never copied into a :class:`pandas.DataFrame`.
+
+    Use :meth:`from_data` to bin data or to load the dataset from the cache
+    if the same data has already been binned with the same binner
+    configuration. New data for the prediction with a model fitted on the
+    dataset has to be transformed with :attr:`binner`.
+
+    Parameters
+    ----------
+    path: str
+        directory of a dataset written by :meth:`from_data`
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from cyclic_boosting.binning import BinNumberTransformer, BinnedDataset
+    >>> X = pd.DataFrame({"a": [0.1, 0.5, 0.2, 0.7], "b": [1, 2, 2, 1]})
+    >>> cache_dir = tempfile.mkdtemp()
+    >>> ds = BinnedDataset.from_data(
+    ...     cache_dir, BinNumberTransformer(n_bins=2), X, y=np.array([1.0, 2.0, 3.0, 4.0]))
+    >>> len(ds), ds.columns
+    (4, ['a', 'b'])
+    >>> ds["a"]
+    array([0, 1, 0, 1], dtype=int8)
+    >>> BinnedDataset.from_data(cache_dir, BinNumberTransformer(n_bins=2), X, y=ds.y).path == ds.path
+    True
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["format_version"] != BINNED_DATASET_FORMAT_VERSION:
+            raise ValueError(
+                "Binned dataset {} has format version {}, expected {}".format(
+                    path, meta["format_version"], BINNED_DATASET_FORMAT_VERSION
+                )
+            )
+        self.key = meta["key"]
+        self.columns = meta["columns"]
+        self.weight_column = meta["weight_column"]
+        self.n_rows = meta["n_rows"]
+        self._arrays = {
+            col: np.load(os.path.join(path, "column_{}.npy".format(i)), mmap_mode="r")
+            for i, col in enumerate(self.columns)
+        }
+        y_path = os.path.join(path, "y.npy")
+        self.y = np.asarray(np.load(y_path, mmap_mode="r")) if os.path.exists(y_path) else None
+        self._binner = None
+
+    @classmethod
+    def from_data(cls, cache_dir, binner, X, y=None):
+        """Load the binned dataset of ``X`` and ``y`` from ``cache_dir`` or
+        create it there.
+
+        The dataset is identified by :func:`binned_dataset_key`. If it is not
+        in the cache, a clone of ``binner`` is fitted on ``X`` and the result
+        of its ``transform`` is written to a new subdirectory of
+        ``cache_dir``. The directory is renamed into place only when it is
+        complete, so concurrent processes never read partially written
+        datasets.
+
+        Parameters
+        ----------
+        cache_dir: str
+            directory containing the cached datasets
+        binner: :class:`~cyclic_boosting.binning.BinNumberTransformer`
+            binning transformer, not modified
+        X: :class:`pandas.DataFrame`, :class:`numpy.ndarray` or Arrow table
+            unbinned feature matrix
+        y: :class:`numpy.ndarray` or None
+            target
+
+        Returns
+        -------
+        BinnedDataset
+        """
+        key = binned_dataset_key(binner, X, y)
+        path = os.path.join(cache_dir, key)
+        if os.path.exists(os.path.join(path, "meta.json")):
+            _logger.info("Loading binned dataset {}".format(path))
+            return cls(path)
+
+        binner = sklearnb.clone(binner).fit(X)
+        cls._write(cache_dir, key, binner, binner.transform(X), y)
+        return cls(path)
+
+    @staticmethod
+    def _write(cache_dir, key, binner, Xt, y):
+        """Write the binned feature matrix ``Xt`` as dataset ``key``."""
+        path = os.path.join(cache_dir, key)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".tmp_" + key, dir=cache_dir)
+        try:
+            columns = []
+            for col in get_feature_column_names_or_indices(Xt):
+                x = np.asarray(get_X_column(Xt, col))
+                if x.dtype.kind not in "biuf":
+                    _logger.warning("Column {} of dtype {} is not stored in the binned dataset".format(col, x.dtype))
+                    continue
+                np.save(os.path.join(tmp_path, "column_{}.npy".format(len(columns))), x)
+                columns.append(col.item() if isinstance(col, np.integer) else col)
+            if y is not None:
+                np.save(os.path.join(tmp_path, "y.npy"), np.asarray(y))
+            with open(os.path.join(tmp_path, "binner.pkl"), "wb") as f:
+                pickle.dump(binner, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+                json.dump(
+                    {
+                        "format_version": BINNED_DATASET_FORMAT_VERSION,
+                        "key": key,
+                        "columns": columns,
+                        "weight_column": binner.weight_column,
+                        "n_rows": len(Xt),
+                    },
+                    f,
+                )
+            os.rename(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, "meta.json")):
+                raise
+            # another process has written the same dataset in the meantime
+
+    def transform(self, X, y=None, cache_dir=None):
+        """Bin new data ``X`` (and ``y``), e.g., a validation set, with the
+        fitted :attr:`binner` of this dataset and load it from or store it in
+        the cache like :meth:`from_data`.
+
+        Parameters
+        ----------
+        X: :class:`pandas.DataFrame`, :class:`numpy.ndarray` or Arrow table
+            unbinned feature matrix
+        y: :class:`numpy.ndarray` or None
+            target
+        cache_dir: str or None
+            directory containing the cached datasets, by default the one of
+            this dataset
+
+        Returns
+        -------
+        BinnedDataset
+        """
+        if cache_dir is None:
+            cache_dir = os.path.dirname(self.path)
+        # the binning depends on the data this dataset was binned from
+        h = hashlib.blake2b(self.key.encode(), digest_size=20)
+        h.update(binned_dataset_key(self.binner, X, y).encode())
+        key = h.hexdigest()
+        path = os.path.join(cache_dir, key)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            self._write(cache_dir, key, self.binner, self.binner.transform(X), y)
+        return BinnedDataset(path)
+
+    @property
+    def binner(self):
+        """The fitted binning transformer used to create the dataset."""
+        if self._binner is None:
+            with open(os.path.join(self.path, "binner.pkl"), "rb") as f:
+                self._binner = pickle.load(f)
+        return self._binner
+
+    @property
+    def weights(self):
+        """The sample weights of the binner's weight column or None."""
+        if self.weight_column is None:
+            return None
+        return self[self.weight_column]
+
+    def __len__(self):
+        return self.n_rows
+
+    def __getitem__(self, column):
+        try:
+            return np.asarray(self._arrays[column])
+        except KeyError:
+            raise KeyError("Column {} not found in the binned dataset {}".format(column, self.path))
+
+
+__all__ = ["BinnedDataset", "binned_dataset_key"]
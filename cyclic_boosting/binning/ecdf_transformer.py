@@ -9,17 +9,30 @@ import pandas as pd
 import sklearn.base as sklearnb
 
 from cyclic_boosting import flags
+from cyclic_boosting.utils import (
+    arrow_column_to_numpy,
+    get_arrow_column,
+    is_arrow_table,
+    is_binned_dataset,
+    replace_arrow_columns,
+)
 
 from ._binary_search import eq_multi, ge_lim, le_interp_multi
 from ._utils import (
     _read_feature_property,
     check_frame_empty,
     get_column_index,
+    map_columns,
     minimal_difference,
 )
+from .quantile_sketch import WeightedQuantileSketch
 
 _logger = logging.getLogger(__name__)
 
+#: Number of points per bin representing the old samples in
+#: :meth:`ECdfTransformer.partial_fit` if no sketch is available
+N_POINTS_PER_OLD_BIN = 32
+
 
 class ConstFunction(object):
     def __init__(self, val):
@@ -95,6 +108,22 @@ class ECdfTransformer(sklearnb.BaseEstimator, sklearnb.TransformerMixin):
         required to have only 0.95% of the total bin weights instead of
         1.0%)
 
+    sketch_epsilon: float or None
+        If set, the CDFs of continuous features are estimated approximately
+        with a :class:`~cyclic_boosting.binning.WeightedQuantileSketch` with
+        this rank error, built chunk by chunk, instead of sorting the whole
+        column. The sketches are kept in ``sketches_``. Features with discrete
+        preprocessing are always treated exactly. Default: None (exact CDFs)
+
+    sketch_chunk_size: int
+        Number of rows added to the sketch at once if ``sketch_epsilon`` is
+        set. Default: 2**20
+
+    n_jobs: int or None
+        Number of threads used to process the feature columns in :meth:`fit`
+        and :meth:`transform` in parallel. ``None`` means 1, -1 means all
+        CPUs. Default: None
+
 
     **Guarantees for continuous features**
     (cyclic_boosting.flags.IS_CONTINUOUS set for feature)
@@ -189,12 +218,18 @@ class ECdfTransformer(sklearnb.BaseEstimator, sklearnb.TransformerMixin):
         weight_column=None,
         epsilon=1e-9,
         tolerance=0.1,
+        sketch_epsilon=None,
+        sketch_chunk_size=2**20,
+        n_jobs=None,
     ):
         self.n_bins = n_bins
         self.feature_properties = feature_properties
         self.weight_column = weight_column
         self.epsilon = epsilon
         self.tolerance = tolerance
+        self.sketch_epsilon = sketch_epsilon
+        self.sketch_chunk_size = sketch_chunk_size
+        self.n_jobs = n_jobs
         self.bins_and_cdfs_ = None
 
     @staticmethod
@@ -207,6 +242,8 @@ class ECdfTransformer(sklearnb.BaseEstimator, sklearnb.TransformerMixin):
     def fit(self, X, y=None):
         self._nbins_per_feature = self._normalize_bins(self.n_bins)
         self.bins_and_cdfs_ = []
+        self.sketches_ = {}
+        self.categories_ = {}
 
         if check_frame_empty(X):
             raise ValueError("Your input matrix for the binning is empty.")
@@ -214,43 +251,287 @@ class ECdfTransformer(sklearnb.BaseEstimator, sklearnb.TransformerMixin):
         feature_columns = get_feature_column_names_or_indices(X, exclude_columns=[self.weight_column])
         weights = get_weight_column(X, self.weight_column)
 
-        for col in feature_columns:
+        def fit_one_feature(col):
             _logger.info("{0} column: {1}".format(self.__class__.__name__, col))
-            x_col = get_X_column(X, col)
-
             feature_prop = _read_feature_property(col, self.feature_properties)
 
             if feature_prop is None:
-                continue
+                return None
 
-            bins_x, cdf_x, _wsum, _n_nan = calculate_cdf_from_weighted_data(x_col.astype(float), weights)
+            return self._fit_one_feature(col, feature_prop, get_X_column(X, col), weights)
 
-            if len(bins_x) == 0 or len(cdf_x) == 0:
-                self.bins_and_cdfs_.append((col, self.epsilon, None))
+        self.weight_sums_ = {}
+        for result in map_columns(fit_one_feature, feature_columns, self.n_jobs):
+            if result is None:
                 continue
+            bins_and_cdfs, sketch, categories, wsum = result
+            col = bins_and_cdfs[0]
+            self.bins_and_cdfs_.append(bins_and_cdfs)
+            self.weight_sums_[col] = wsum
+            if sketch is not None:
+                self.sketches_[col] = sketch
+            if categories is not None:
+                self.categories_[col] = categories
+        return self
 
-            if flags.is_ordered_set(feature_prop) or flags.is_unordered_set(feature_prop):
-                bin_boundaries = np.r_[bins_x[0], bins_x]
-                cdf = np.r_[0.0, cdf_x]
+    def _fit_one_feature(self, col, feature_prop, x_col, weights, sketch=None):
+        categories = None
+        if not flags.is_continuous_set(feature_prop) and has_non_numeric_values(x_col):
+            categories, cdf_x, wsum, _n_nan = calculate_cdf_from_weighted_categories(x_col, weights)
+            bins_x = np.arange(len(categories), dtype=np.float64)
+        elif flags.is_continuous_set(feature_prop) and (self.sketch_epsilon is not None or sketch is not None):
+            if sketch is None:
+                sketch = WeightedQuantileSketch(self.sketch_epsilon)
+            for start in range(0, len(x_col), self.sketch_chunk_size):
+                stop = start + self.sketch_chunk_size
+                sketch.update(x_col[start:stop].astype(float), weights[start:stop])
+            bins_x, cdf_x = sketch.cdf()
+            wsum = sketch.total_weight
+        else:
+            bins_x, cdf_x, wsum, _n_nan = calculate_cdf_from_weighted_data(x_col.astype(float), weights)
+
+        return self._bins_and_cdfs_from_cdf(col, feature_prop, bins_x, cdf_x), sketch, categories, wsum
+
+    def _cdf_at_boundaries(self, col, feature_prop, x_col, weights, epsilon, bins_and_cdfs):
+        """Weighted CDF of the new data ``x_col`` at the stored bin boundaries
+        and the total weight of its valid values."""
+        boundaries = bins_and_cdfs[:, 0]
+        below_minimum = 0.0
+        if flags.is_continuous_set(feature_prop):
+            x = x_col.astype(float)
+            valid = np.isfinite(x)
+            bin_index = np.searchsorted(boundaries, x[valid] - epsilon, side="left")
+            counts = np.bincount(bin_index, weights=weights[valid], minlength=len(boundaries) + 1)
+            counts = counts[: len(boundaries)]
+            # like in the fit, the CDF at the lowest boundary (the fitted
+            # minimum) does not contain the values at the boundary itself
+            below_minimum = weights[valid][x[valid] < boundaries[0] - epsilon].sum()
+        else:
+            categories = self.categories_.get(col)
+            if categories is None:
+                x = x_col.astype(float)
+                valid = np.isfinite(x)
+                codes = pd.Index(boundaries[1:]).get_indexer(x[valid])
             else:
-                bin_boundaries, cdf = reduce_cdf_and_boundaries_to_nbins(
-                    bins_x,
-                    cdf_x,
-                    self._nbins_per_feature[col],
-                    self.epsilon,
-                    self.tolerance,
-                )
+                valid = ~pd.isna(x_col)
+                codes = pd.Index(categories).get_indexer(np.asarray(x_col)[valid])
+            seen = codes >= 0
+            counts = np.r_[0.0, np.bincount(codes[seen], weights=weights[valid][seen], minlength=len(boundaries) - 1)]
+
+        wsum = weights[valid].sum()
+        if wsum == 0:
+            return bins_and_cdfs[:, 1], 0.0
+        cdf = np.cumsum(counts)
+        cdf[0] = below_minimum
+        return cdf / wsum, wsum
+
+    def drift(self, X):
+        """Distribution drift of the features in ``X`` with respect to the
+        fitted data.
+
+        The drift of a feature is the Kolmogorov-Smirnov distance between the
+        fitted CDF and the weighted CDF of the feature values in ``X``,
+        evaluated at the fitted bin boundaries, i.e. the largest change of
+        the cumulative share of a bin. For discrete features, the share of
+        unseen categories is included. It only needs one binary search per
+        value and no sorting of ``X``.
+
+        Parameters
+        ----------
+        X: :class:`pandas.DataFrame` or :class:`numpy.ndarray`
+            new samples with the same feature columns as in the fit
+
+        Returns
+        -------
+        dict
+            drift per feature column
+        """
+        self._check_input_for_transform(X)
+        weights = get_weight_column(X, self.weight_column)
 
-            n = len(cdf)
-            bins_and_cdfs = np.empty((n, 2))
-            bins_and_cdfs[:, 0] = bin_boundaries
-            bins_and_cdfs[:, 1] = cdf
+        def drift_one_feature(col_epsilon_bins_and_cdfs):
+            col, epsilon, bins_and_cdfs = col_epsilon_bins_and_cdfs
+            feature_prop = _read_feature_property(col, self.feature_properties)
+            if bins_and_cdfs is None:
+                return col, 0.0 if np.all(pd.isna(get_X_column(X, col))) else 1.0
+            cdf_new, _ = self._cdf_at_boundaries(
+                col, feature_prop, get_X_column(X, col), weights, epsilon, bins_and_cdfs
+            )
+            return col, np.max(np.abs(cdf_new - bins_and_cdfs[:, 1]))
+
+        return dict(map_columns(drift_one_feature, self.bins_and_cdfs_, self.n_jobs))
+
+    def partial_fit(self, X, y=None, max_drift=0.05):
+        """Update the fitted CDFs with new samples.
+
+        For each feature, the CDF of the new samples is evaluated at the
+        stored bin boundaries (see :meth:`drift`). If the drift is at most
+        ``max_drift``, the bin boundaries are kept and only the stored CDF
+        values are updated to the combined old and new samples, so that bin
+        numbers assigned in :meth:`transform` stay the same. Otherwise, the
+        bin boundaries of the feature are estimated anew from the combined
+        samples. The old samples are represented by the stored
+        :class:`~cyclic_boosting.binning.WeightedQuantileSketch` if the
+        transformer was fitted with ``sketch_epsilon``, by their categories
+        for discrete features, and by their weight per bin (spread uniformly
+        over the bin, like in the interpolation of :meth:`transform`)
+        otherwise. The latter is coarse in the tails of the distribution, so
+        use ``sketch_epsilon`` for transformers that are refitted regularly.
+
+        If the transformer has not been fitted yet, this is the same as
+        :meth:`fit`.
+
+        The drift per feature is stored in ``drift_`` and the features with
+        new bin boundaries in ``rebinned_``. Models trained on the binned
+        features only have to be refitted if ``rebinned_`` is not empty.
+
+        Parameters
+        ----------
+        X: :class:`pandas.DataFrame` or :class:`numpy.ndarray`
+            new samples with the same feature columns as in the fit
+
+        max_drift: float
+            largest drift for which the bin boundaries are kept
+
+        Returns
+        -------
+        self
+        """
+        if self.bins_and_cdfs_ is None:
+            self.fit(X, y)
+            self.drift_ = {col: 0.0 for col, _, _ in self.bins_and_cdfs_}
+            self.rebinned_ = []
+            return self
 
-            epsilon = self.epsilon * minimal_difference(bin_boundaries)
+        self._check_input_for_transform(X)
+        weights = get_weight_column(X, self.weight_column)
 
-            self.bins_and_cdfs_.append((col, epsilon, bins_and_cdfs))
+        def update_one_feature(col_epsilon_bins_and_cdfs):
+            col, epsilon, bins_and_cdfs = col_epsilon_bins_and_cdfs
+            feature_prop = _read_feature_property(col, self.feature_properties)
+            x_col = get_X_column(X, col)
+            wsum_old = self.weight_sums_.get(col, 0.0)
+
+            if bins_and_cdfs is None:
+                result = self._fit_one_feature(col, feature_prop, x_col, weights)
+                return result + (1.0 if result[0][2] is not None else 0.0, result[0][2] is not None)
+
+            cdf_new, wsum_new = self._cdf_at_boundaries(col, feature_prop, x_col, weights, epsilon, bins_and_cdfs)
+            drift = np.max(np.abs(cdf_new - bins_and_cdfs[:, 1]))
+            sketch = self.sketches_.get(col)
+            categories = self.categories_.get(col)
+
+            if drift <= max_drift:
+                if sketch is not None:
+                    sketch.update(x_col.astype(float), weights)
+                updated = bins_and_cdfs.copy()
+                updated[:, 1] = (wsum_old * bins_and_cdfs[:, 1] + wsum_new * cdf_new) / (wsum_old + wsum_new)
+                return (col, epsilon, updated), sketch, categories, wsum_old + wsum_new, drift, False
+
+            old_weights = np.diff(bins_and_cdfs[:, 1]) * wsum_old
+            if not flags.is_continuous_set(feature_prop):
+                old_values = categories if categories is not None else bins_and_cdfs[1:, 0]
+                x_all = np.concatenate([old_values, np.asarray(x_col, dtype=old_values.dtype)])
+                result = self._fit_one_feature(col, feature_prop, x_all, np.r_[old_weights, weights])
+            else:
+                if sketch is None:
+                    # spread the old weight of each bin uniformly over the bin
+                    lower, upper = bins_and_cdfs[:-1, 0], bins_and_cdfs[1:, 0]
+                    steps = np.linspace(0.0, 1.0, N_POINTS_PER_OLD_BIN)
+                    sketch = WeightedQuantileSketch(self.sketch_epsilon or 1e-3)
+                    sketch.update(
+                        (lower[:, None] + (upper - lower)[:, None] * steps[None, :]).ravel(),
+                        np.repeat(old_weights / N_POINTS_PER_OLD_BIN, N_POINTS_PER_OLD_BIN),
+                    )
+                result = self._fit_one_feature(col, feature_prop, x_col, weights, sketch=sketch)
+            return result + (drift, True)
+
+        bins_and_cdfs_ = []
+        self.drift_ = {}
+        self.rebinned_ = []
+        for bins_and_cdfs, sketch, categories, wsum, drift, rebinned in map_columns(
+            update_one_feature, self.bins_and_cdfs_, self.n_jobs
+        ):
+            col = bins_and_cdfs[0]
+            bins_and_cdfs_.append(bins_and_cdfs)
+            self.weight_sums_[col] = wsum
+            self.drift_[col] = drift
+            if rebinned:
+                self.rebinned_.append(col)
+            if sketch is not None:
+                self.sketches_[col] = sketch
+            if categories is not None:
+                self.categories_[col] = categories
+        self.bins_and_cdfs_ = bins_and_cdfs_
         return self
 
+    def fit_from_sketches(self, sketches):
+        """Fit the bin boundaries from precomputed sketches, e.g. built and
+        merged over chunks or partitions of data that never fits into memory
+        at once.
+
+        Parameters
+        ----------
+        sketches: dict
+            :class:`~cyclic_boosting.binning.WeightedQuantileSketch` per
+            feature column name or index. The columns are taken in the order
+            of the dict. For features with discrete preprocessing, the sketch
+            has to be exact (see
+            :attr:`~cyclic_boosting.binning.WeightedQuantileSketch.is_exact`).
+
+        Returns
+        -------
+        self
+        """
+        self._nbins_per_feature = self._normalize_bins(self.n_bins)
+        self.bins_and_cdfs_ = []
+        self.sketches_ = {}
+        self.categories_ = {}
+        self.weight_sums_ = {}
+
+        for col, sketch in sketches.items():
+            feature_prop = _read_feature_property(col, self.feature_properties)
+
+            if feature_prop is None:
+                continue
+
+            if not flags.is_continuous_set(feature_prop) and not sketch.is_exact:
+                raise ValueError(
+                    "The sketch of the discrete feature {} is not exact. Increase its number of stored values by "
+                    "choosing a smaller epsilon.".format(col)
+                )
+
+            self.sketches_[col] = sketch
+            self.weight_sums_[col] = sketch.total_weight
+            bins_x, cdf_x = sketch.cdf()
+            self.bins_and_cdfs_.append(self._bins_and_cdfs_from_cdf(col, feature_prop, bins_x, cdf_x))
+        return self
+
+    def _bins_and_cdfs_from_cdf(self, col, feature_prop, bins_x, cdf_x):
+        if len(bins_x) == 0 or len(cdf_x) == 0:
+            return col, self.epsilon, None
+
+        if flags.is_ordered_set(feature_prop) or flags.is_unordered_set(feature_prop):
+            bin_boundaries = np.r_[bins_x[0], bins_x]
+            cdf = np.r_[0.0, cdf_x]
+        else:
+            bin_boundaries, cdf = reduce_cdf_and_boundaries_to_nbins(
+                bins_x,
+                cdf_x,
+                self._nbins_per_feature[col],
+                self.epsilon,
+                self.tolerance,
+            )
+
+        n = len(cdf)
+        bins_and_cdfs = np.empty((n, 2))
+        bins_and_cdfs[:, 0] = bin_boundaries
+        bins_and_cdfs[:, 1] = cdf
+
+        epsilon = self.epsilon * minimal_difference(bin_boundaries)
+
+        return col, epsilon, bins_and_cdfs
+
     def _check_input_for_transform(self, X):
         if self.bins_and_cdfs_ is None:
             raise RuntimeError("Fit was not called before.")
@@ -266,21 +547,44 @@ class ECdfTransformer(sklearnb.BaseEstimator, sklearnb.TransformerMixin):
                 "the matrix in the fit (%s)." % (n_cols, len(self.bins_and_cdfs_))
             )
 
+    @staticmethod
+    def _float_column(X, col, categories):
+        """Column ``col`` of ``X`` as floats, with the values of a feature
+        fitted on non-numeric categories replaced by their category index
+        (missing and unseen categories as nan)."""
+        x = get_X_column(X, col)
+        if categories is None:
+            return np.asarray(x, dtype=float)
+        codes = pd.Index(categories).get_indexer(np.asarray(x)).astype(float)
+        codes[codes < 0] = np.nan
+        return codes
+
     def transform(self, X, y=None):
         self._check_input_for_transform(X)
 
         if check_frame_empty(X):
             return X
 
-        Xnp = np.asarray(X, dtype=float)
+        if is_arrow_table(X):
+            columns = X.schema.names
+        elif isinstance(X, pd.DataFrame):
+            columns = X.columns
+        else:
+            columns = range(X.shape[1])
+        categories = getattr(self, "categories_", {})
+        if is_arrow_table(X) or any(col in categories for col in columns):
+            Xnp = np.column_stack([self._float_column(X, col, categories.get(col)) for col in columns])
+        else:
+            Xnp = np.asarray(X, dtype=float)
         Xt = Xnp
 
-        for col, epsilon, bins_and_cdfs in self.bins_and_cdfs_:
+        def transform_one_feature(col_epsilon_bins_and_cdfs):
+            col, epsilon, bins_and_cdfs = col_epsilon_bins_and_cdfs
             j = get_column_index(X, col)
             feature_property = _read_feature_property(col, self.feature_properties)
 
             if feature_property is None:
-                continue
+                return
 
             if bins_and_cdfs is not None:
                 if flags.is_continuous_set(feature_property):
@@ -304,8 +608,12 @@ class ECdfTransformer(sklearnb.BaseEstimator, sklearnb.TransformerMixin):
             elif bins_and_cdfs is None:
                 Xnp[:, j] = np.nan
 
+        map_columns(transform_one_feature, self.bins_and_cdfs_, self.n_jobs)
+
         if isinstance(X, pd.DataFrame):
             return pd.DataFrame(Xt, columns=X.columns)
+        elif is_arrow_table(X):
+            return replace_arrow_columns(X, {col: Xt[:, get_column_index(X, col)] for col, _, _ in self.bins_and_cdfs_})
         else:
             return Xt
 
@@ -348,11 +656,15 @@ def get_feature_column_names_or_indices(
     """
     if isinstance(X, pd.DataFrame):
         columns = list(X.columns)
+    elif is_arrow_table(X):
+        columns = list(X.schema.names)
+    elif is_binned_dataset(X):
+        columns = list(X.columns)
     elif isinstance(X, np.ndarray):
         assert X.ndim == 2, "X must be a 2D matrix"
         columns = list(range(0, X.shape[1]))
     else:
-        raise ValueError("X must be a pandas.DataFrame or a numpy.ndarray")
+        raise ValueError("X must be a pandas.DataFrame, a numpy.ndarray or a pyarrow.Table")
 
     if exclude_columns is not None:
         exclude_columns = set(exclude_columns)
@@ -398,13 +710,18 @@ def get_weight_column(X, weight_column=None):
                 return np.asarray(X[weight_column])
             except:
                 raise ValueError("Weight column {} not found in X.".format(str(weight_column)))
+        elif is_arrow_table(X):
+            try:
+                return arrow_column_to_numpy(get_arrow_column(X, weight_column))
+            except KeyError:
+                raise ValueError("Weight column {} not found in X.".format(str(weight_column)))
         else:
             try:
                 return X[:, weight_column]
             except:
                 raise ValueError("Index {} defining weight column not found in X.".format(str(weight_column)))
     else:
-        return np.ones(X.shape[0], dtype=np.float64)
+        return np.ones(len(X), dtype=np.float64)
 
 
 def reduce_cdf_and_boundaries_to_nbins(bins_x, cdf_x, n_bins, epsilon, tolerance):
@@ -488,17 +805,18 @@ def reduce_cdf_and_boundaries_to_nbins(bins_x, cdf_x, n_bins, epsilon, tolerance
 
 def get_X_column(X, column, array_for_1_dim=True):
     """
-    Picks columns from :class:`pandas.DataFrame` or :class:`numpy.ndarray`.
+    Picks columns from :class:`pandas.DataFrame`, :class:`numpy.ndarray` or
+    Arrow :class:`pyarrow.Table`/:class:`pyarrow.RecordBatch`.
 
     Parameters
     ----------
-    X: :class:`pandas.DataFrame` or :class:`numpy.ndarray`
+    X: :class:`pandas.DataFrame`, :class:`numpy.ndarray` or Arrow table
         Data Source from which columns are picked.
     column:
-        The format depends on the type of X. For :class:`pandas.DataFrame` you
-        can give a string or a list/tuple of strings naming the columns. For
-        :class:`numpy.ndarray` an integer or a list/tuple of integers indexing
-        the columns.
+        The format depends on the type of X. For :class:`pandas.DataFrame`
+        and Arrow tables you can give a string or a list/tuple of strings
+        naming the columns. For :class:`numpy.ndarray` an integer or a
+        list/tuple of integers indexing the columns.
     array_for_1_dim: bool
         In default mode (set to True) the return type for a one dimensional
         access is a np.ndarray with shape (n, ). If set to False it is a
@@ -514,6 +832,14 @@ def get_X_column(X, column, array_for_1_dim=True):
             column = column[0]
     if isinstance(X, pd.DataFrame):
         return X[column].values
+    elif is_arrow_table(X):
+        if isinstance(column, list):
+            return np.column_stack([arrow_column_to_numpy(get_arrow_column(X, col)) for col in column])
+        return arrow_column_to_numpy(get_arrow_column(X, column))
+    elif is_binned_dataset(X):
+        if isinstance(column, list):
+            return np.column_stack([X[col] for col in column])
+        return X[column]
     else:
         return X[:, column]
 
@@ -569,3 +895,71 @@ def calculate_cdf_from_weighted_data(z, w):
     cdf = np.nancumsum(uniques["w"]) / wsum
 
     return z_unique, cdf, wsum, n_nan
+
+
+def has_non_numeric_values(x):
+    """Check if a feature column contains strings or other non-numeric
+    objects, or if it is a :class:`pandas.Categorical` with non-numeric
+    categories.
+
+    >>> from cyclic_boosting.binning.ecdf_transformer import has_non_numeric_values
+    >>> has_non_numeric_values(np.array(["a", "b"], dtype=object))
+    True
+    >>> has_non_numeric_values(pd.Categorical([1, 2]))
+    False
+    """
+    if isinstance(x.dtype, pd.CategoricalDtype):
+        return not pd.api.types.is_numeric_dtype(x.categories.dtype)
+    return x.dtype.kind in "OSU"
+
+
+def calculate_cdf_from_weighted_categories(x, w):
+    """
+    Calculate the cdf value for each category of `x` weighted with the
+    sample weights in `w`, without converting the values to float.
+    Missing values and categories with weight zero are ignored.
+
+    The categories are ordered as in a :class:`pandas.Categorical` `x`,
+    otherwise in sorted order.
+
+    Parameters
+    ----------
+    x: :class:`pandas.Categorical` or numpy.ndarray
+        input array, e.g. of strings
+
+    w: numpy.ndarray
+        sample weights
+
+    Returns
+    -------
+    tuple of two :class:`numpy.ndarray`, a double and an int
+        Tuple consisting of an array containing the categories with nonzero
+        weight, an array containing the corresponding cdf values, the total
+        weight sum and the number of missing values in `x`.
+
+    Examples
+    --------
+    >>> x = np.array(["b", "a", "c", None, "a", "d"], dtype=object)
+    >>> w = np.array([2., 1., 1., 1., 1., 0.])
+    >>> categories, cdfs, wsum, n_nan = calculate_cdf_from_weighted_categories(x, w)
+    >>> categories
+    array(['a', 'b', 'c'], dtype=object)
+    >>> cdfs
+    array([0.4, 0.8, 1. ])
+    >>> wsum, n_nan
+    (5.0, 1)
+    """
+    if len(x) != w.shape[0]:
+        raise ValueError("input vectors must be of same shape")
+
+    if isinstance(x.dtype, pd.CategoricalDtype):
+        codes, categories = np.asarray(x.codes), x.categories
+    else:
+        codes, categories = pd.factorize(x, sort=True)
+
+    valid = codes >= 0
+    weights = np.bincount(codes[valid], weights=w[valid], minlength=len(categories))
+    seen = weights != 0
+    wsum = weights.sum()
+
+    return np.asarray(categories[seen], dtype=object), np.cumsum(weights[seen]) / wsum, wsum, np.count_nonzero(~valid)
@@ -0,0 +1,230 @@
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+
+class _Summary(object):
+    """Sorted weighted quantile summary.
+
+    For each stored value ``x`` the summary keeps lower and upper bounds on
+    the total weight of the data **less than** ``x`` (``rmin``) and **less
+    than or equal to** ``x`` (``rmax``), as well as the weight of ``x``
+    itself (``w``). A summary built from raw data is exact, i.e.
+    ``rmax = rmin + w``.
+    """
+
+    def __init__(self, values, rmin, rmax, w, total):
+        self.values = values
+        self.rmin = rmin
+        self.rmax = rmax
+        self.w = w
+        self.total = total
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def from_data(cls, x, w):
+        order = np.argsort(x, kind="mergesort")
+        x = x[order]
+        w = w[order]
+        starts = np.flatnonzero(np.r_[True, x[1:] != x[:-1]])
+        values = x[starts]
+        weights = np.add.reduceat(w, starts)
+        rmax = np.cumsum(weights)
+        rmin = rmax - weights
+        return cls(values, rmin, rmax, weights, rmax[-1])
+
+    def rank_bounds(self, y):
+        """Bounds of :math:`W(X < y)` and :math:`W(X \\leq y)` and the weight
+        of ``y`` for each element of the sorted array ``y``."""
+        n = len(self.values)
+        idx = np.searchsorted(self.values, y, side="left")
+        idx_clipped = np.minimum(idx, n - 1)
+        present = (idx < n) & (self.values[idx_clipped] == y)
+
+        prev = np.maximum(idx - 1, 0)
+        rmin = np.where(idx > 0, self.rmin[prev] + self.w[prev], 0.0)
+        rmax = np.where(idx < n, self.rmax[idx_clipped] - self.w[idx_clipped], self.total)
+        w = np.zeros(len(y))
+
+        rmin[present] = self.rmin[idx[present]]
+        rmax[present] = self.rmax[idx[present]]
+        w[present] = self.w[idx[present]]
+        return rmin, rmax, w
+
+    def merge(self, other):
+        values = np.union1d(self.values, other.values)
+        rmin_a, rmax_a, w_a = self.rank_bounds(values)
+        rmin_b, rmax_b, w_b = other.rank_bounds(values)
+        return _Summary(values, rmin_a + rmin_b, rmax_a + rmax_b, w_a + w_b, self.total + other.total)
+
+    def prune(self, size):
+        """Keep at most ``size`` entries, approximately equidistant in rank.
+
+        The minimum and the maximum are always kept, so that they stay exact.
+        """
+        n = len(self.values)
+        if n <= size:
+            return self
+        centers = 0.5 * (self.rmin + self.rmax)
+        targets = np.arange(1, size - 1) * (self.total / (size - 1))
+        idx = np.clip(np.searchsorted(centers, targets), 1, n - 1)
+        closer_left = (targets - centers[idx - 1]) < (centers[idx] - targets)
+        idx = np.unique(np.r_[0, np.where(closer_left, idx - 1, idx), n - 1])
+        return _Summary(self.values[idx], self.rmin[idx], self.rmax[idx], self.w[idx], self.total)
+
+    def max_rank_uncertainty(self):
+        """Largest width of the possible range of :math:`W(X \\leq y)` over all ``y``."""
+        in_entries = self.rmax - self.rmin - self.w
+        between_entries = (self.rmax[1:] - self.w[1:]) - (self.rmin[:-1] + self.w[:-1])
+        return max(in_entries.max(), between_entries.max() if len(between_entries) > 0 else 0.0)
+
+
+class WeightedQuantileSketch(object):
+    r"""Mergeable sketch of the weighted empirical CDF of a feature.
+
+    The sketch can be filled chunk by chunk with :meth:`update` and sketches
+    of different partitions of the data can be combined with :meth:`merge`,
+    so that bin boundaries can be determined in streaming and parallel
+    settings without sorting a whole column at once. Not finite values and
+    samples with zero weight are ignored, like in
+    :func:`~cyclic_boosting.binning.ecdf_transformer.calculate_cdf_from_weighted_data`.
+
+    Each chunk is summarised exactly and then pruned to about
+    :math:`4 / \epsilon` values. Summaries are merged in a binary tree
+    (summaries of the same level are merged and pruned into the next level),
+    so each pruning adds a rank error of at most about :math:`\epsilon / 8` of the
+    total weight and the error grows only logarithmically with the number of
+    chunks. As long as nothing was pruned the sketch is exact. The realised
+    error bound is available as :attr:`rank_error`.
+
+    Parameters
+    ----------
+    epsilon: float
+        Targeted rank error as fraction of the total weight. It determines
+        the number of values kept per summary. Default: 1e-3
+
+    Examples
+    --------
+    >>> from cyclic_boosting.binning import WeightedQuantileSketch
+    >>> sketch = WeightedQuantileSketch(epsilon=0.01)
+    >>> x = np.arange(10000, dtype=np.float64)
+    >>> for chunk in np.array_split(x, 10):
+    ...     sketch = sketch.update(chunk)
+    >>> sketch.rank_error <= 0.01
+    True
+    >>> values, cdf = sketch.cdf()
+    >>> values[0], values[-1], cdf[-1]
+    (0.0, 9999.0, 1.0)
+    """
+
+    def __init__(self, epsilon=1e-3):
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon has to be in the open interval (0, 1), got {}".format(epsilon))
+        self.epsilon = epsilon
+        self._levels = []
+
+    @property
+    def summary_size(self):
+        return int(np.ceil(4.0 / self.epsilon)) + 1
+
+    def _push(self, summary, level):
+        while True:
+            while len(self._levels) <= level:
+                self._levels.append(None)
+            if self._levels[level] is None:
+                self._levels[level] = summary
+                return
+            summary = self._levels[level].merge(summary).prune(self.summary_size)
+            self._levels[level] = None
+            level += 1
+
+    def update(self, x, w=None):
+        """Add a chunk of feature values ``x`` with optional sample weights
+        ``w`` to the sketch.
+
+        Returns
+        -------
+        WeightedQuantileSketch
+            the sketch itself
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if w is None:
+            w = np.ones(len(x), dtype=np.float64)
+        else:
+            w = np.asarray(w, dtype=np.float64)
+            if w.shape != x.shape:
+                raise ValueError("input vectors must be of same shape")
+            if np.any(w < 0):
+                raise ValueError("The sample weights must not be negative.")
+        valid = np.isfinite(x) & (w != 0)
+        if np.any(valid):
+            self._push(_Summary.from_data(x[valid], w[valid]).prune(self.summary_size), 0)
+        return self
+
+    def merge(self, other):
+        """Merge the sketch ``other``, e.g. built on another partition of the
+        data, into this sketch.
+
+        Returns
+        -------
+        WeightedQuantileSketch
+            the sketch itself
+        """
+        for level, summary in enumerate(other._levels):
+            if summary is not None:
+                self._push(summary, level)
+        return self
+
+    def _summary(self):
+        summaries = [s for s in self._levels if s is not None]
+        if len(summaries) == 0:
+            return None
+        summary = summaries[0]
+        for s in summaries[1:]:
+            summary = summary.merge(s)
+        return summary
+
+    @property
+    def total_weight(self):
+        return sum(s.total for s in self._levels if s is not None)
+
+    @property
+    def rank_error(self):
+        """Upper bound of the error of :meth:`cdf` as fraction of the total
+        weight."""
+        summary = self._summary()
+        if summary is None:
+            return 0.0
+        return 0.5 * summary.max_rank_uncertainty() / summary.total
+
+    @property
+    def is_exact(self):
+        """True if no values have been pruned so far."""
+        summary = self._summary()
+        return summary is None or summary.max_rank_uncertainty() == 0
+
+    def cdf(self):
+        """Estimated empirical CDF at the values stored in the sketch.
+
+        Returns
+        -------
+        tuple of two :class:`numpy.ndarray`
+            The increasing stored feature values and the corresponding
+            estimates of :math:`P\\left(X \\leq x\\right)` in the same format as
+            the first two return values of
+            :func:`~cyclic_boosting.binning.ecdf_transformer.calculate_cdf_from_weighted_data`,
+            so they can be passed to
+            :func:`~cyclic_boosting.binning.reduce_cdf_and_boundaries_to_nbins`.
+        """
+        summary = self._summary()
+        if summary is None:
+            return np.array([], dtype=np.float64), np.array([], dtype=np.float64)
+        cdf = 0.5 * (summary.rmin + summary.w + summary.rmax) / summary.total
+        cdf = np.minimum(np.maximum.accumulate(cdf), 1.0)
+        cdf[-1] = 1.0
+        return summary.values.copy(), cdf
+
+
+__all__ = ["WeightedQuantileSketch"]
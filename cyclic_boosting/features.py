@@ -85,6 +85,9 @@ class Feature(object):
 
         self.minimal_factor_change = minimal_factor_change
         self.stop_iterations = False
+        # schedule of converged features, see CyclicBoostingBase.minimal_feature_factor_change
+        self.visit_interval = 1
+        self.last_visit_iteration = None
 
         self.feature_type = feature_id.feature_type
         self.factor_sum = None
@@ -30,6 +30,11 @@ class CBGenericLoss(CyclicBoostingBase):
     minimization itself is performed via ``scipy.optimize.minimize`` (instead
     of an analytical solution like, e.g., in ``CBPoissonRegressor``,
     ``CBNBinomRegressor``, or ``CBLocationRegressor``).
+
+    If the subclass provides per-sample ``gradient`` and ``hessian`` of the
+    costs, all bins are instead minimized simultaneously via Newton steps (see
+    :meth:`newton_optimization`), and ``scipy.optimize.minimize`` is only used
+    for bins in which the Newton iteration does not converge.
     """
 
     def precalc_parameters(self, feature: Feature, y: np.ndarray, pred: CBLinkPredictionsFactors) -> None:
@@ -70,7 +75,8 @@ class CBGenericLoss(CyclicBoostingBase):
         bins, split_indices = np.unique(sorted_bins, return_index=True)
         split_indices = split_indices[1:]
 
-        y_pred = np.hstack((y[..., np.newaxis], self.unlink_func(pred.predict_link())[..., np.newaxis]))
+        yhat_others = self.unlink_func(pred.predict_link())
+        y_pred = np.hstack((y[..., np.newaxis], yhat_others[..., np.newaxis]))
         y_pred = np.hstack((y_pred, self.weights[..., np.newaxis]))
         y_pred_bins = np.split(y_pred[sorting], split_indices)
 
@@ -84,10 +90,21 @@ class CBGenericLoss(CyclicBoostingBase):
         parameters = np.zeros(n_bins)
         uncertainties = np.zeros(n_bins)
 
-        for bin in range(n_bins):
-            parameters[bin], uncertainties[bin] = self.optimization(
-                y_pred_bins[bin][:, 0], y_pred_bins[bin][:, 1], y_pred_bins[bin][:, 2]
+        if self.has_derivatives():
+            parameters, converged = self.newton_optimization(
+                feature.lex_binned_data, y, yhat_others, self.weights, n_bins
             )
+            converged[empty_bins] = True
+        else:
+            converged = np.zeros(n_bins, dtype=bool)
+
+        for bin in range(n_bins):
+            if converged[bin]:
+                uncertainties[bin] = self.uncertainty(y_pred_bins[bin][:, 0], y_pred_bins[bin][:, 2])
+            else:
+                parameters[bin], uncertainties[bin] = self.optimization(
+                    y_pred_bins[bin][:, 0], y_pred_bins[bin][:, 1], y_pred_bins[bin][:, 2]
+                )
 
         neutral_factor = self.unlink_func(np.array(self.neutral_factor_link))
         if neutral_factor != 0:
@@ -97,6 +114,91 @@ class CBGenericLoss(CyclicBoostingBase):
 
         return parameters, uncertainties
 
+    def has_derivatives(self) -> bool:
+        """
+        Whether per-sample gradient and Hessian of the costs are available,
+        enabling :meth:`newton_optimization` instead of the derivative-free
+        minimization in :meth:`optimization`.
+        """
+        return getattr(self, "gradient", None) is not None and getattr(self, "hessian", None) is not None
+
+    def newton_optimization(
+        self,
+        binnumbers: np.ndarray,
+        y: np.ndarray,
+        yhat_others: np.ndarray,
+        weights: np.ndarray,
+        n_bins: int,
+        max_iterations: int = 20,
+        tolerance: float = 1e-8,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simultaneous Newton minimization of the costs for all bins of a
+        feature. The per-sample gradient and Hessian of the costs with respect
+        to the prediction are chained to the bin parameter via
+        :meth:`model_derivative` and aggregated per bin (via `bincount`), so
+        that each Newton step needs only one pass over the data.
+
+        Parameters
+        ----------
+        binnumbers : np.ndarray
+            bin numbers of the feature at hand for each observation
+        y : np.ndarray
+            target variable, containing data with `float` type (potentially
+            discrete)
+        yhat_others : np.ndarray
+            (in-sample) predictions from all other features (excluding the one
+            at hand), containing data with `float` type
+        weights : np.ndarray
+            optional (otherwise set to 1) sample weights, containing data with
+            `float` type
+        n_bins : int
+            number of bins of the feature at hand
+        max_iterations : int
+            maximal number of Newton steps
+        tolerance : float
+            bins with absolute parameter changes below this value are
+            considered converged
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            estimated parameters and a boolean mask of the bins for which the
+            Newton iteration converged (with a positive aggregated Hessian)
+        """
+        neutral_factor = self.unlink_func(np.array(self.neutral_factor_link))
+        parameters = np.full(n_bins, neutral_factor, dtype=np.float64)
+        converged = np.zeros(n_bins, dtype=bool)
+        valid = np.ones(n_bins, dtype=bool)
+
+        for _ in range(max_iterations):
+            param = parameters[binnumbers]
+            prediction = self.model(param, yhat_others)
+            derivative = self.model_derivative(param, yhat_others)
+
+            gradient = np.asarray(self.gradient(prediction, y, weights)) * derivative
+            hessian = np.asarray(self.hessian(prediction, y, weights)) * derivative**2
+
+            sum_gradient = np.bincount(binnumbers, weights=gradient, minlength=n_bins)
+            sum_hessian = np.bincount(binnumbers, weights=hessian, minlength=n_bins)
+
+            valid &= np.isfinite(sum_gradient) & (sum_hessian > 0)
+            active = valid & ~converged
+            if not active.any():
+                break
+
+            step = np.zeros(n_bins)
+            step[active] = sum_gradient[active] / sum_hessian[active]
+            new_parameters = parameters - step
+            if neutral_factor != 0:
+                # keep multiplicative parameters positive
+                new_parameters = np.where(new_parameters > 0, new_parameters, 0.5 * parameters)
+
+            converged |= active & (np.abs(new_parameters - parameters) < tolerance)
+            parameters = new_parameters
+
+        return parameters, converged & valid
+
     def optimization(self, y: np.ndarray, yhat_others: np.ndarray, weights: np.ndarray) -> Tuple[float, float]:
         """
         Minimization of the costs (potentially including sample weights) for
@@ -158,6 +260,13 @@ class CBGenericLoss(CyclicBoostingBase):
     def model(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
         raise NotImplementedError("implement in subclass")
 
+    def model_derivative(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
+        """
+        Derivative of the model prediction with respect to the bin parameter,
+        only needed if :meth:`has_derivatives` is true.
+        """
+        raise NotImplementedError("implement model_derivative in subclass to use gradient and hessian")
+
     @abc.abstractmethod
     def uncertainty(self, y: np.ndarray, weights: np.ndarray) -> float:
         """
@@ -210,6 +319,7 @@ class CBQuantileRegressor(CBGenericLoss, sklearn.base.RegressorMixin):
         learn_rate=None,
         quantile=None,
         aggregate=True,
+        minimal_feature_factor_change=None,
     ):
         CyclicBoostingBase.__init__(
             self,
@@ -225,6 +335,7 @@ class CBQuantileRegressor(CBGenericLoss, sklearn.base.RegressorMixin):
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
         )
 
@@ -439,6 +550,7 @@ class CBMultiplicativeQuantileRegressor(CBQuantileRegressor, LogLinkMixin):
         learn_rate=None,
         quantile=None,
         aggregate=True,
+        minimal_feature_factor_change=None,
     ):
         CBQuantileRegressor.__init__(
             self,
@@ -454,6 +566,7 @@ class CBMultiplicativeQuantileRegressor(CBQuantileRegressor, LogLinkMixin):
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             quantile=quantile,
             aggregate=aggregate,
         )
@@ -464,6 +577,9 @@ class CBMultiplicativeQuantileRegressor(CBQuantileRegressor, LogLinkMixin):
     def model(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
         return model_multiplicative(param, yhat_others)
 
+    def model_derivative(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
+        return model_multiplicative_derivative(param, yhat_others)
+
     def uncertainty(self, y: np.ndarray, weights: np.ndarray) -> float:
         return uncertainty_gamma(y, weights)
 
@@ -500,6 +616,7 @@ class CBAdditiveQuantileRegressor(CBQuantileRegressor, IdentityLinkMixin):
         learn_rate=None,
         quantile=None,
         aggregate=True,
+        minimal_feature_factor_change=None,
     ):
         CBQuantileRegressor.__init__(
             self,
@@ -515,6 +632,7 @@ class CBAdditiveQuantileRegressor(CBQuantileRegressor, IdentityLinkMixin):
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             quantile=quantile,
             aggregate=aggregate,
         )
@@ -525,6 +643,9 @@ class CBAdditiveQuantileRegressor(CBQuantileRegressor, IdentityLinkMixin):
     def model(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
         return model_additive(param, yhat_others)
 
+    def model_derivative(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
+        return model_additive_derivative(param, yhat_others)
+
     def uncertainty(self, y: np.ndarray, weights: np.ndarray) -> float:
         return uncertainty_gaussian(y, weights)
 
@@ -537,6 +658,14 @@ def model_additive(param: float, yhat_others: np.ndarray) -> np.ndarray:
     return param + yhat_others
 
 
+def model_multiplicative_derivative(param: float, yhat_others: np.ndarray) -> np.ndarray:
+    return yhat_others
+
+
+def model_additive_derivative(param: float, yhat_others: np.ndarray) -> np.ndarray:
+    return np.ones_like(yhat_others)
+
+
 def uncertainty_gamma(y: np.ndarray, weights: np.ndarray) -> float:
     # use moment-matching of a Gamma posterior with a log-normal
     # distribution as approximation
@@ -619,6 +748,14 @@ class CBMultiplicativeGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMix
     ----------
     costs : function
         loss (to be exact, cost) function to be minimized
+    gradient : function or None
+        optional per-sample first derivative of the costs with respect to the
+        prediction, with the same signature as ``costs``
+    hessian : function or None
+        optional per-sample second derivative of the costs with respect to the
+        prediction, with the same signature as ``costs``. If both ``gradient``
+        and ``hessian`` are given, the bin parameters are estimated via Newton
+        steps instead of ``scipy.optimize.minimize``.
     See :class:`cyclic_boosting.base` for all other parameters.
     """
 
@@ -638,6 +775,9 @@ class CBMultiplicativeGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMix
         learn_rate=None,
         aggregate=True,
         costs=None,
+        gradient=None,
+        hessian=None,
+        minimal_feature_factor_change=None,
     ):
         CyclicBoostingBase.__init__(
             self,
@@ -653,10 +793,13 @@ class CBMultiplicativeGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMix
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
         )
 
         self.costs = costs
+        self.gradient = gradient
+        self.hessian = hessian
 
     def loss(self, prediction: np.ndarray, y: np.ndarray, weights: np.ndarray) -> float:
         return self.costs(prediction, y, weights)
@@ -670,6 +813,9 @@ class CBMultiplicativeGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMix
     def model(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
         return model_multiplicative(param, yhat_others)
 
+    def model_derivative(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
+        return model_multiplicative_derivative(param, yhat_others)
+
     def uncertainty(self, y: np.ndarray, weights: np.ndarray) -> float:
         return uncertainty_gamma(y, weights)
 
@@ -684,6 +830,14 @@ class CBAdditiveGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMixin, Id
     ----------
     costs : function
         loss (to be exact, cost) function to be minimized
+    gradient : function or None
+        optional per-sample first derivative of the costs with respect to the
+        prediction, with the same signature as ``costs``
+    hessian : function or None
+        optional per-sample second derivative of the costs with respect to the
+        prediction, with the same signature as ``costs``. If both ``gradient``
+        and ``hessian`` are given, the bin parameters are estimated via Newton
+        steps instead of ``scipy.optimize.minimize``.
     See :class:`cyclic_boosting.base` for all other parameters.
     """
 
@@ -703,6 +857,9 @@ class CBAdditiveGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMixin, Id
         learn_rate=None,
         aggregate=True,
         costs=None,
+        gradient=None,
+        hessian=None,
+        minimal_feature_factor_change=None,
     ):
         CyclicBoostingBase.__init__(
             self,
@@ -718,10 +875,13 @@ class CBAdditiveGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMixin, Id
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
         )
 
         self.costs = costs
+        self.gradient = gradient
+        self.hessian = hessian
 
     def loss(self, prediction: np.ndarray, y: np.ndarray, weights: np.ndarray) -> float:
         return self.costs(prediction, y, weights)
@@ -735,6 +895,9 @@ class CBAdditiveGenericCRegressor(CBGenericLoss, sklearn.base.RegressorMixin, Id
     def model(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
         return model_additive(param, yhat_others)
 
+    def model_derivative(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
+        return model_additive_derivative(param, yhat_others)
+
     def uncertainty(self, y: np.ndarray, weights: np.ndarray) -> float:
         return uncertainty_gaussian(y, weights)
 
@@ -748,6 +911,14 @@ class CBGenericClassifier(CBGenericLoss, sklearn.base.ClassifierMixin, LogitLink
     ----------
     costs : function
         loss (to be exact, cost) function to be minimized
+    gradient : function or None
+        optional per-sample first derivative of the costs with respect to the
+        prediction, with the same signature as ``costs``
+    hessian : function or None
+        optional per-sample second derivative of the costs with respect to the
+        prediction, with the same signature as ``costs``. If both ``gradient``
+        and ``hessian`` are given, the bin parameters are estimated via Newton
+        steps instead of ``scipy.optimize.minimize``.
     See :class:`cyclic_boosting.base` for all other parameters.
     """
 
@@ -767,6 +938,9 @@ class CBGenericClassifier(CBGenericLoss, sklearn.base.ClassifierMixin, LogitLink
         learn_rate=None,
         aggregate=True,
         costs=None,
+        gradient=None,
+        hessian=None,
+        minimal_feature_factor_change=None,
     ):
         CyclicBoostingBase.__init__(
             self,
@@ -782,10 +956,13 @@ class CBGenericClassifier(CBGenericLoss, sklearn.base.ClassifierMixin, LogitLink
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
         )
 
         self.costs = costs
+        self.gradient = gradient
+        self.hessian = hessian
 
     def loss(self, prediction: np.ndarray, y: np.ndarray, weights: np.ndarray) -> float:
         return self.costs(prediction, y, weights)
@@ -799,6 +976,9 @@ class CBGenericClassifier(CBGenericLoss, sklearn.base.ClassifierMixin, LogitLink
     def model(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
         return model_multiplicative(param, yhat_others)
 
+    def model_derivative(self, param: float, yhat_others: np.ndarray) -> np.ndarray:
+        return model_multiplicative_derivative(param, yhat_others)
+
     def uncertainty(self, y: np.ndarray, weights: np.ndarray) -> float:
         return uncertainty_beta(y, weights, self.link_func)
 
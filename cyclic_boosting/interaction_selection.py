@@ -1,13 +1,22 @@
-from itertools import combinations
+import heapq
+from itertools import chain, combinations, islice
 
+import numba as nb
 import numpy as np
 import pandas as pd
-from sklearn.feature_selection import SelectKBest, f_regression, f_classif
+from scipy.special import xlogy
+from sklearn.base import BaseEstimator
+from sklearn.pipeline import Pipeline
 
 from cyclic_boosting.binning import BinNumberTransformer
+from cyclic_boosting.binning._utils import _effective_n_jobs, map_columns
+from cyclic_boosting.link import LogLinkMixin
 from cyclic_boosting.utils import multidim_binnos_to_lexicographic_binnos
 
-from typing import List, Tuple, Dict, Optional
+from typing import Iterator, List, Tuple, Dict, Optional
+
+#: Number of interaction terms evaluated together (on the thread pool)
+_CHUNK_SIZE = 256
 
 
 def create_interactions(features1D: List[str], dim: int) -> List[Tuple]:
@@ -25,10 +34,11 @@ def create_interactions(features1D: List[str], dim: int) -> List[Tuple]:
     -------
         list of tuples of strings (feature names) representing all dim-dimensional feature combinations
     """
-    interactions = []
-    for n in range(2, dim + 1):
-        interactions += list(combinations(features1D, n))
-    return interactions
+    return list(_iter_interactions(features1D, dim))
+
+
+def _iter_interactions(features1D: List, dim: int) -> Iterator[Tuple]:
+    return chain.from_iterable(combinations(features1D, n) for n in range(2, dim + 1))
 
 
 def build_binned_interaction_features(
@@ -70,6 +80,99 @@ def build_binned_interaction_features(
     return features_multidim
 
 
+@nb.njit(nogil=True)
+def _lexicographic_codes(binned: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Same as :func:`~cyclic_boosting.utils.multidim_binnos_to_lexicographic_binnos`
+    for the ``columns`` of the 1D bin numbers ``binned`` (negative for
+    missing values)."""
+    n_samples = binned.shape[0]
+    n_dims = len(columns)
+    n_bins = np.zeros(n_dims, dtype=np.int64)
+    any_valid = False
+    for i in range(n_samples):
+        valid = True
+        for j in range(n_dims):
+            if binned[i, columns[j]] < 0:
+                valid = False
+        if valid:
+            any_valid = True
+            for j in range(n_dims):
+                n_bins[j] = max(n_bins[j], binned[i, columns[j]] + 1)
+
+    steps = np.ones(n_dims, dtype=np.int64)
+    for j in range(n_dims - 2, -1, -1):
+        steps[j] = steps[j + 1] * n_bins[j + 1]
+    missing = steps[0] * n_bins[0] if any_valid else 0
+
+    codes = np.empty(n_samples, dtype=np.int64)
+    for i in range(n_samples):
+        code = 0
+        for j in range(n_dims):
+            b = binned[i, columns[j]]
+            if b < 0:
+                code = missing
+                break
+            code += b * steps[j]
+        codes[i] = code
+    return codes
+
+
+@nb.njit(nogil=True)
+def _regression_sums(codes: np.ndarray, y_centered: np.ndarray) -> Tuple[float, float]:
+    """Sums of squares of the centered codes and of their products with
+    the centered target."""
+    mean = 0.0
+    for i in range(len(codes)):
+        mean += codes[i]
+    mean /= len(codes)
+
+    sxx = 0.0
+    sxy = 0.0
+    for i in range(len(codes)):
+        x = codes[i] - mean
+        sxx += x * x
+        sxy += x * y_centered[i]
+    return sxx, sxy
+
+
+@nb.njit(nogil=True)
+def _classification_sums(codes: np.ndarray, classes: np.ndarray, n_classes: int) -> Tuple[float, np.ndarray]:
+    """Sum of squares of the centered codes and their sums per class."""
+    mean = 0.0
+    for i in range(len(codes)):
+        mean += codes[i]
+    mean /= len(codes)
+
+    sxx = 0.0
+    class_sums = np.zeros(n_classes)
+    for i in range(len(codes)):
+        x = codes[i] - mean
+        sxx += x * x
+        class_sums[classes[i]] += x
+    return sxx, class_sums
+
+
+def _f_regression_score(sxx: float, sxy: float, syy: float, n_samples: int) -> float:
+    # same as sklearn.feature_selection.f_regression with force_finite=True
+    if sxx <= 0 or syy <= 0:
+        return 0.0
+    corr_squared = sxy * sxy / (sxx * syy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = np.float64(corr_squared) / (1 - corr_squared) * (n_samples - 2)
+    if np.isinf(f):
+        return np.finfo(np.float64).max
+    return 0.0 if np.isnan(f) else f
+
+
+def _f_classif_score(sxx: float, class_sums: np.ndarray, class_counts: np.ndarray) -> float:
+    # same as sklearn.feature_selection.f_classif, for centered values
+    n_samples = class_counts.sum()
+    n_classes = len(class_counts)
+    ssbn = np.sum(class_sums**2 / class_counts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (ssbn / (n_classes - 1)) / ((sxx - ssbn) / (n_samples - n_classes))
+
+
 def select_interaction_terms_anova(
     X: pd.DataFrame,
     y: np.ndarray,
@@ -77,10 +180,20 @@ def select_interaction_terms_anova(
     interaction_dim: int,
     k_best: int,
     classification: Optional[bool] = False,
+    n_jobs: Optional[int] = None,
 ) -> List[str]:
     """
     ANOVA selection of interaction terms for a given data set by means of binning.
 
+    The interaction terms are scored like with
+    :class:`sklearn.feature_selection.SelectKBest` and ``f_regression``
+    (``f_classif`` for classification) on the flattened (binned)
+    multi-dimensional features of :func:`build_binned_interaction_features`.
+    But the features are never materialized together: The candidates are
+    streamed, the F-statistic of each one is computed on the fly from the
+    one-dimensional bin numbers, and only the ``k_best`` best candidates are
+    kept in a heap.
+
     Parameters
     ----------
     X : pd.DataFrame
@@ -93,18 +206,211 @@ def select_interaction_terms_anova(
         maximal dimensionality of interactions terms to be considered
     k_best : int
         number of interaction terms to be selected
+    classification : bool
+        use the ANOVA F-statistic of the classes in ``y`` instead of the
+        F-statistic of the linear regression on ``y``
+    n_jobs : int or None
+        number of threads evaluating the candidates, ``None`` or 1 for
+        serial execution, -1 for all CPUs
 
     Returns
     -------
         list of the names of the selected interaction terms
     """
-    interaction_terms = create_interactions(list(feature_properties.keys()), interaction_dim)
-
-    interaction_term_features = build_binned_interaction_features(X, interaction_terms, feature_properties)
+    features = list(feature_properties.keys())
+    binner = BinNumberTransformer(n_bins=100, feature_properties=feature_properties, inplace=False)
+    binned_1D = binner.fit_transform(X)
+    binned = np.asfortranarray(np.column_stack([np.asarray(binned_1D[feature]) for feature in features]))
+    n_samples = len(binned)
 
     if classification:
-        anova_est = SelectKBest(f_classif, k=k_best)
+        classes, class_indices = np.unique(y, return_inverse=True)
+        class_counts = np.bincount(class_indices).astype(np.float64)
+
+        def score(columns):
+            codes = _lexicographic_codes(binned, columns)
+            sxx, class_sums = _classification_sums(codes, class_indices, len(classes))
+            return _f_classif_score(sxx, class_sums, class_counts)
+
+    else:
+        y_centered = np.asarray(y, dtype=np.float64) - np.mean(y)
+        syy = np.dot(y_centered, y_centered)
+
+        def score(columns):
+            codes = _lexicographic_codes(binned, columns)
+            sxx, sxy = _regression_sums(codes, y_centered)
+            return _f_regression_score(sxx, sxy, syy, n_samples)
+
+    # min-heap of the best (score, index, term), ties are resolved in favor
+    # of later candidates like in SelectKBest
+    best = []
+    candidates = enumerate(_iter_interactions(list(range(len(features))), interaction_dim))
+    while True:
+        chunk = list(islice(candidates, _CHUNK_SIZE))
+        if not chunk:
+            break
+        scores = map_columns(lambda candidate: score(np.array(candidate[1])), chunk, n_jobs)
+        for (index, term), f in zip(chunk, scores):
+            if np.isnan(f):
+                f = np.finfo(np.float64).min
+            if len(best) < k_best:
+                heapq.heappush(best, (f, index, term))
+            elif (f, index) > best[0][:2]:
+                heapq.heapreplace(best, (f, index, term))
+
+    return [tuple(features[i] for i in term) for _, _, term in sorted(best, key=lambda entry: entry[1])]
+
+
+def _residual_gain(
+    codes: np.ndarray, y: np.ndarray, yhat: np.ndarray, multiplicative: bool, dispersion: float
+) -> float:
+    """Improvement of the AIC by one correction (factor or summand) of the
+    predictions ``yhat`` per group of ``codes`` (compact group indices)."""
+    counts = np.bincount(codes)
+    sum_y = np.bincount(codes, weights=y)
+    sum_yhat = np.bincount(codes, weights=yhat)
+    if multiplicative:
+        # reduction of the Poisson deviance
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviance = 2 * np.sum(xlogy(sum_y, sum_y / sum_yhat) - (sum_y - sum_yhat))
+    else:
+        # reduction of the sum of squared residuals
+        deviance = np.sum((sum_y - sum_yhat) ** 2 / counts)
+    return deviance / dispersion - 2 * (np.count_nonzero(counts) - 1)
+
+
+def select_interaction_terms_hierarchical(
+    X: pd.DataFrame,
+    y: np.ndarray,
+    feature_properties: Dict[str, object],
+    estimator: BaseEstimator,
+    interaction_dim: int,
+    k_best: int,
+    min_gain: Optional[float] = 0.0,
+    max_stage_size: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+) -> List[Tuple]:
+    """
+    Staged search of interaction terms, ranked by their gain with respect to
+    the residuals of a fitted model.
+
+    In stage ``d`` (starting with 2), a ``d``-dimensional interaction term is
+    only evaluated if all its ``(d - 1)``-dimensional sub-interactions have
+    passed the previous stage, i.e., reached a gain of at least
+    ``min_gain`` (and are among the ``max_stage_size`` best terms of their
+    stage). The one-dimensional features are binned once, and the group
+    indices of the terms that passed a stage are cached and extended by one
+    feature in the next stage.
+
+    The gain is measured against the residuals of ``estimator``: The
+    predictions are corrected by one factor (for estimators with log link,
+    assuming Poisson deviance) or summand (otherwise, squared errors) per bin
+    of the interaction term, and the improvement of the Akaike information
+    criterion (AIC) is calculated, with the deviance scaled by the Pearson
+    estimate of the dispersion of the residuals and a cost of 2 for each
+    additional non-empty bin. The gain of an interaction term is its
+    improvement beyond the best of its sub-interactions (or 0). So, it is
+    positive if the interaction term explains more of the residuals than
+    expected by chance for its number of bins.
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        design matrix
+    y : np.ndarray
+        target
+    feature_properties : dict
+        names and pre-processing flags of all one-dimensional features
+    estimator : BaseEstimator
+        fitted estimator, e.g., a Cyclic Boosting pipeline with the
+        one-dimensional features, predicting the mean of ``y`` from ``X``
+    interaction_dim
+        maximal dimensionality of interactions terms to be considered
+    k_best : int
+        number of interaction terms to be selected
+    min_gain : float
+        minimal gain of an interaction term to be selected or to be expanded
+        in the next stage
+    max_stage_size : int or None
+        maximal number of interaction terms passing a stage (the ones with the
+        highest gain), also limiting the memory of the cached group indices
+        (one array with one entry per sample for each term) while the stage
+        is evaluated, no limit if None
+    n_jobs : int or None
+        number of threads evaluating the candidates, ``None`` or 1 for
+        serial execution, -1 for all CPUs
+
+    Returns
+    -------
+        list of the names of the selected interaction terms, in descending
+        order of their gain
+    """
+    features = list(feature_properties.keys())
+    binner = BinNumberTransformer(n_bins=100, feature_properties=feature_properties, inplace=False)
+    binned_1D = binner.fit_transform(X)
+
+    # one-dimensional group indices, with missing values in an extra bin
+    codes_1D = []
+    for feature in features:
+        binnos = np.asarray(binned_1D[feature], dtype=np.int64)
+        n_bins = binnos.max(initial=-1) + 1
+        codes_1D.append((np.where(binnos < 0, n_bins, binnos), n_bins + 1))
+    passed = {(i,): codes for i, (codes, _) in enumerate(codes_1D)}
+
+    y = np.asarray(y, dtype=np.float64)
+    yhat = np.asarray(estimator.predict(X), dtype=np.float64)
+    final_estimator = estimator.steps[-1][1] if isinstance(estimator, Pipeline) else estimator
+    multiplicative = isinstance(final_estimator, LogLinkMixin)
+    if multiplicative:
+        dispersion = np.mean((y - yhat) ** 2 / yhat)
     else:
-        anova_est = SelectKBest(f_regression, k=k_best)
-    anova_est.fit(interaction_term_features, y)
-    return list(anova_est.get_feature_names_out(input_features=interaction_term_features.columns))
+        dispersion = np.mean((y - yhat) ** 2)
+
+    gains = {(i,): _residual_gain(codes, y, yhat, multiplicative, dispersion) for (i,), codes in passed.items()}
+
+    def evaluate(candidate):
+        feature_codes, n_bins = codes_1D[candidate[-1]]
+        codes = passed[candidate[:-1]] * n_bins + feature_codes
+        _, codes = np.unique(codes, return_inverse=True)
+        return _residual_gain(codes, y, yhat, multiplicative, dispersion), codes
+
+    chunk_size = 4 * _effective_n_jobs(n_jobs)
+    selected = []
+    for dim in range(2, interaction_dim + 1):
+        candidates = (
+            parent + (i,)
+            for parent in sorted(passed)
+            for i in range(parent[-1] + 1, len(features))
+            if all(sub in passed for sub in combinations(parent + (i,), dim - 1))
+        )
+        # min-heap of the best (gain, -index, candidate, codes), ties are
+        # resolved in favor of earlier candidates, the group indices of
+        # evicted candidates are dropped right away
+        stage = []
+        index = 0
+        while True:
+            chunk = list(islice(candidates, chunk_size))
+            if not chunk:
+                break
+            for candidate, (gain, codes) in zip(chunk, map_columns(evaluate, chunk, n_jobs)):
+                index += 1
+                gains[candidate] = gain
+                # gain beyond the best sub-interaction
+                gain -= max(0.0, max(gains[sub] for sub in combinations(candidate, dim - 1)))
+                if gain < min_gain:
+                    continue
+                # the group indices are only needed for the next stage
+                entry = (gain, -index, candidate, codes if dim < interaction_dim else None)
+                if max_stage_size is None or len(stage) < max_stage_size:
+                    heapq.heappush(stage, entry)
+                elif entry[:2] > stage[0][:2]:
+                    heapq.heapreplace(stage, entry)
+
+        stage.sort(key=lambda entry: entry[:2], reverse=True)
+        selected += [(gain, candidate) for gain, _, candidate, _ in stage]
+        passed = {candidate: codes for _, _, candidate, codes in stage}
+        if not passed:
+            break
+
+    selected.sort(key=lambda entry: entry[0], reverse=True)
+    return [tuple(features[i] for i in candidate) for _, candidate in selected[:k_best]]
@@ -0,0 +1,522 @@
+"""
+Model selection for Cyclic Boosting estimators on shared binned data
+"""
+from __future__ import absolute_import, division, print_function
+
+import logging
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numba as nb
+import numpy as np
+import pandas as pd
+import scipy.stats
+import sklearn.base as sklearnb
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, check_cv
+from sklearn.pipeline import Pipeline
+
+from cyclic_boosting.base import CBLinkPredictionsFactors
+from cyclic_boosting.binning import BinNumberTransformer, BinnedDataset
+from cyclic_boosting.binning._utils import _effective_n_jobs
+from cyclic_boosting.regression import CBPoissonRegressor, _calc_factors_and_uncertainties
+from cyclic_boosting.utils import is_arrow_table, is_binned_dataset
+
+_logger = logging.getLogger(__name__)
+
+
+def _take_rows(X, indices):
+    if isinstance(X, (pd.DataFrame, pd.Series)):
+        return X.iloc[indices]
+    if is_arrow_table(X):
+        return X.take(indices)
+    return X[indices]
+
+
+def _negative_loss(estimator, X, y):
+    """Default score: the negative loss of the estimator."""
+    weights = X.weights if is_binned_dataset(X) else None
+    if weights is None:
+        weights = np.ones(len(y))
+    return -estimator._score_loss(X, np.asarray(y), np.asarray(weights, dtype=np.float64))
+
+
+def _split_estimator(estimator, binner):
+    """Binning transformer, Cyclic Boosting estimator and the prefix of its
+    parameter names of an estimator or pipeline."""
+    if isinstance(estimator, Pipeline):
+        name, cb_estimator = estimator.steps[-1]
+        return estimator.steps[0][1], cb_estimator, name + "__"
+    if binner is None:
+        binner = BinNumberTransformer(n_bins=100, feature_properties=estimator.feature_properties)
+    return binner, estimator, ""
+
+
+def _fit_and_score(estimator, params, train_path, test_path, scorer, iteration_cap=None):
+    """Fit a clone of ``estimator`` with ``params`` on the binned training
+    dataset, stopped after ``iteration_cap`` iterations if given, and score it
+    on the binned test dataset (if ``test_path`` is not None). Runs in the
+    worker processes, which map the datasets into memory.
+
+    Returns the in-sample loss and the score.
+    """
+    est = sklearnb.clone(estimator).set_params(**params)
+    est._iteration_cap = iteration_cap
+    est.fit(BinnedDataset(train_path))
+    if test_path is None:
+        return est.insample_loss_, np.nan
+    test = BinnedDataset(test_path)
+    return est.insample_loss_, scorer(est, test, test.y)
+
+
+class CBSearchCV(sklearnb.BaseEstimator):
+    """
+    Exhaustive search over parameter values of a Cyclic Boosting estimator
+    with cross-validation, like :class:`sklearn.model_selection.GridSearchCV`,
+    but binning the data of each fold only once.
+
+    The training data of each fold is binned with a clone of ``binner`` and
+    the test data with the fitted binner. Both are stored as
+    :class:`~cyclic_boosting.binning.BinnedDataset`, which all candidates read
+    from memory-mapped files, so that the worker processes share the binned
+    arrays through the page cache instead of copying them.
+
+    With ``prune_iterations``, the fits of all candidates are first stopped
+    after that many iterations, with the learning rate of the full fit.
+    Candidates whose in-sample loss, averaged over the folds, exceeds the
+    best one by more than the fraction ``prune_tolerance`` of its absolute
+    value are not fitted any further and get no test score.
+
+    Parameters
+    ----------
+    estimator: Cyclic Boosting estimator or :class:`sklearn.pipeline.Pipeline`
+        Unfitted estimator, e.g., :class:`~cyclic_boosting.CBPoissonRegressor`,
+        or a pipeline of a binning transformer and a Cyclic Boosting estimator
+        as returned by :func:`~cyclic_boosting.pipelines.pipeline_CB`. Then,
+        the binning transformer of the pipeline is used as ``binner``.
+    param_grid: dict or list of dicts
+        Parameter values of the estimator, see
+        :class:`sklearn.model_selection.ParameterGrid`. For a pipeline, the
+        names are prefixed by the name of its last step, e.g.,
+        ``CB__learn_rate``. Parameters of the binning cannot be searched.
+    binner: :class:`~cyclic_boosting.binning.BinNumberTransformer` or None
+        Binning transformer, by default one with 100 bins and the feature
+        properties of the estimator.
+    cv: int or cross-validation generator
+        See :func:`sklearn.model_selection.check_cv`.
+    scoring: str, callable or None
+        Scorer name or callable ``scoring(estimator, X, y)``. By default,
+        the negative loss (as used for ``insample_loss_``) on the test data.
+    n_jobs: int or None
+        Number of worker processes, ``None`` or 1 for fitting in the calling
+        process, -1 for all CPUs.
+    cache_dir: str or None
+        Directory for the binned datasets. If given, the datasets are kept
+        and reused by later searches on the same data. By default, a
+        temporary directory is used and removed after the search.
+    prune_iterations: int or None
+        Number of iterations after which losing candidates are pruned, no
+        pruning if None.
+    prune_tolerance: float
+        In-sample loss difference to the best candidate, relative to the
+        absolute value of its loss, above which candidates are pruned.
+    refit: bool
+        Refit the best candidate on the whole data as ``best_estimator_``.
+
+    Attributes
+    ----------
+    cv_results_: dict
+        ``params``, the test scores of each split (``split<i>_test_score``),
+        ``mean_test_score``, ``std_test_score``, ``rank_test_score``,
+        ``pruned`` and ``mean_pruning_loss`` (the in-sample loss after
+        ``prune_iterations``) of all candidates
+    best_index_, best_params_, best_score_:
+        index, parameters and mean test score of the best candidate
+    best_estimator_: :class:`sklearn.pipeline.Pipeline`
+        pipeline of the binning and the best estimator refitted on the whole
+        data, only with ``refit``
+    """
+
+    def __init__(
+        self,
+        estimator,
+        param_grid,
+        binner=None,
+        cv=3,
+        scoring=None,
+        n_jobs=None,
+        cache_dir=None,
+        prune_iterations=None,
+        prune_tolerance=0.05,
+        refit=True,
+    ):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.binner = binner
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.prune_iterations = prune_iterations
+        self.prune_tolerance = prune_tolerance
+        self.refit = refit
+
+    def _candidates(self, prefix):
+        candidates = []
+        for params in ParameterGrid(self.param_grid):
+            for name in params:
+                if not name.startswith(prefix) or "__" in name[len(prefix) :]:
+                    raise ValueError(
+                        "Only parameters of the Cyclic Boosting estimator can be searched, got {!r}".format(name)
+                    )
+            candidates.append({name[len(prefix) :]: value for name, value in params.items()})
+        return candidates
+
+    def _bin_folds(self, X, y, binner, cache_dir):
+        folds = []
+        for train, test in check_cv(self.cv).split(X, y):
+            train_ds = BinnedDataset.from_data(cache_dir, binner, _take_rows(X, train), y[train])
+            test_ds = train_ds.transform(_take_rows(X, test), y[test])
+            folds.append((train_ds.path, test_ds.path))
+        return folds
+
+    def fit(self, X, y):
+        """Run the search.
+
+        Parameters
+        ----------
+        X: :class:`pandas.DataFrame`, :class:`numpy.ndarray` or Arrow table
+            unbinned feature matrix
+        y: :class:`numpy.ndarray`
+            target
+
+        Returns
+        -------
+        self
+        """
+        if is_binned_dataset(X):
+            raise ValueError("CBSearchCV bins the data of each fold itself, pass the unbinned data.")
+        y = np.asarray(y)
+        binner, estimator, prefix = _split_estimator(self.estimator, self.binner)
+        candidates = self._candidates(prefix)
+        scorer = _negative_loss if self.scoring is None else get_scorer(self.scoring)
+
+        cache_dir = self.cache_dir if self.cache_dir is not None else tempfile.mkdtemp(prefix="cb_search_")
+        try:
+            folds = self._bin_folds(X, y, binner, cache_dir)
+            n_folds = len(folds)
+            scores = np.full((len(candidates), n_folds), np.nan)
+            pruning_losses = np.full((len(candidates), n_folds), np.nan)
+            done = np.zeros(len(candidates), dtype=bool)
+
+            n_processes = _effective_n_jobs(self.n_jobs)
+            executor = None
+            if n_processes > 1:
+                # forking a process with running numba or thread pool threads can deadlock
+                executor = ProcessPoolExecutor(max_workers=n_processes, mp_context=multiprocessing.get_context("spawn"))
+
+            def run(tasks):
+                """Evaluate ``(candidate, fold, iteration_cap, with_test)``
+                tasks."""
+                args = [
+                    (estimator, candidates[i], folds[k][0], folds[k][1] if with_test else None, scorer, iteration_cap)
+                    for i, k, iteration_cap, with_test in tasks
+                ]
+                if executor is None:
+                    return [_fit_and_score(*a) for a in args]
+                futures = [executor.submit(_fit_and_score, *a) for a in args]
+                return [future.result() for future in futures]
+
+            try:
+                if self.prune_iterations is not None:
+                    tasks = []
+                    for i, params in enumerate(candidates):
+                        iterations = params.get("maximal_iterations", estimator.maximal_iterations)
+                        # candidates with few iterations are complete after the first stage
+                        done[i] = iterations <= self.prune_iterations
+                        for k in range(n_folds):
+                            tasks.append((i, k, self.prune_iterations, done[i]))
+                    for (i, k, _, _), (loss, score) in zip(tasks, run(tasks)):
+                        pruning_losses[i, k] = loss
+                        scores[i, k] = score
+                    mean_losses = pruning_losses.mean(axis=1)
+                    best_loss = np.min(mean_losses)
+                    pruned = mean_losses - best_loss > self.prune_tolerance * np.abs(best_loss)
+                    _logger.info("Pruned {} of {} candidates".format(np.sum(pruned), len(candidates)))
+                else:
+                    pruned = np.zeros(len(candidates), dtype=bool)
+
+                tasks = [(i, k, None, True) for i in np.flatnonzero(~pruned & ~done) for k in range(n_folds)]
+                for (i, k, _, _), (_, score) in zip(tasks, run(tasks)):
+                    scores[i, k] = score
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+        finally:
+            if self.cache_dir is None:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+        scores[pruned] = np.nan
+        mean_scores = scores.mean(axis=1)
+        self.cv_results_ = {"params": [{prefix + k: v for k, v in params.items()} for params in candidates]}
+        for k in range(n_folds):
+            self.cv_results_["split{}_test_score".format(k)] = scores[:, k]
+        self.cv_results_["mean_test_score"] = mean_scores
+        self.cv_results_["std_test_score"] = scores.std(axis=1)
+        self.cv_results_["rank_test_score"] = scipy.stats.rankdata(
+            -np.nan_to_num(mean_scores, nan=-np.inf), method="min"
+        ).astype(np.int32)
+        self.cv_results_["pruned"] = pruned
+        self.cv_results_["mean_pruning_loss"] = pruning_losses.mean(axis=1)
+
+        self.best_index_ = int(np.nanargmax(mean_scores))
+        self.best_params_ = self.cv_results_["params"][self.best_index_]
+        self.best_score_ = mean_scores[self.best_index_]
+        if self.refit:
+            if isinstance(self.estimator, Pipeline):
+                best = sklearnb.clone(self.estimator).set_params(**self.best_params_)
+            else:
+                best = Pipeline(
+                    [
+                        ("binning", sklearnb.clone(binner)),
+                        ("CB", sklearnb.clone(estimator).set_params(**self.best_params_)),
+                    ]
+                )
+            self.best_estimator_ = best.fit(X, y)
+        return self
+
+    def predict(self, X):
+        """Predict with ``best_estimator_``."""
+        return self.best_estimator_.predict(X)
+
+
+@nb.njit(nogil=True)
+def _fold_prediction_sums(lex_binned_data, folds, weights, prediction, n_bins):
+    """Weighted sums of the predictions of all fold models per bin over their
+    training samples, i.e., the samples not in their fold, in a single pass.
+
+    ``prediction`` has one column per fold model.
+    """
+    n_folds = prediction.shape[1]
+    sums = np.zeros((n_folds, n_bins))
+    for i in range(len(lex_binned_data)):
+        b = lex_binned_data[i]
+        for k in range(n_folds):
+            if k != folds[i]:
+                sums[k, b] += weights[i] * prediction[i, k]
+    return sums
+
+
+@nb.njit(nogil=True)
+def _multiply_fold_factors(prediction, lex_binned_data, factors):
+    """Multiply the predictions of all fold models by their factors (one row
+    per fold model) of the bins of the samples in place."""
+    n_folds = prediction.shape[1]
+    for i in range(len(lex_binned_data)):
+        b = lex_binned_data[i]
+        for k in range(n_folds):
+            prediction[i, k] *= factors[k, b]
+
+
+def _fold_numbers(cv, X, y):
+    """Number of the test fold of each sample."""
+    folds = np.full(len(y), -1, dtype=np.int64)
+    for k, (train, test) in enumerate(check_cv(cv).split(X, y)):
+        if np.any(folds[test] >= 0) or len(train) + len(test) != len(y):
+            raise ValueError("The test sets of the cross-validation have to partition the samples, e.g., KFold.")
+        folds[test] = k
+    if np.any(folds < 0):
+        raise ValueError("The test sets of the cross-validation have to partition the samples, e.g., KFold.")
+    return folds, k + 1
+
+
+def _fit_folds_lockstep(estimators, X, y, folds):
+    """Fit one clone of a :class:`~cyclic_boosting.CBPoissonRegressor` per
+    fold on the samples of all other folds, following ``_fit_main`` of the
+    estimator with the fold models in lock-step.
+
+    The binned data of a feature is bound only once for all fold models. The
+    weight and target sums per bin of each fold model are the totals minus
+    those of its fold, and the prediction sums of all fold models are
+    accumulated in a single pass per feature step.
+    """
+    n_folds = len(estimators)
+    weights = None
+    for k, est in enumerate(estimators):
+        est._init_fit(X, y)
+        weights = np.asarray(est.weights, dtype=np.float64)
+        est.weights = np.where(folds != k, weights, 0.0)
+        est._init_global_scale(X, y)
+
+    # FeatureList is indexed by feature group
+    features = [list(est.features) for est in estimators]
+
+    # bind the data once and share the lexicographic bin numbers
+    lex_binned_data, alpha = [], []
+    for j, feature in enumerate(features[0]):
+        feature.bind_data(X, weights)
+        n_bins = feature.n_bins
+        fold_bins = feature.lex_binned_data + folds * n_bins
+        sums = []
+        for w in [weights, weights * y]:
+            held_out = np.bincount(fold_bins, weights=w, minlength=n_folds * n_bins).reshape(n_folds, n_bins)
+            sums.append(held_out.sum(axis=0) - held_out)
+        for k in range(n_folds):
+            features[k][j].lex_binned_data = feature.lex_binned_data
+            features[k][j].n_multi_bins_finite = feature.n_multi_bins_finite
+            features[k][j].bin_weightsums = sums[0][k]
+        lex_binned_data.append(feature.lex_binned_data)
+        alpha.append(sums[1])
+
+    prediction = np.empty((len(y), n_folds))
+    convergence_parameters = []
+    for k, est in enumerate(estimators):
+        prediction[:, k] = est.unlink_func(est._get_prior_predictions(X))
+        convergence_parameters.append(est._init_iterations(y, prediction[:, k]))
+    full_sweep = [False] * n_folds
+
+    running = [k for k in range(n_folds) if estimators[k]._continue_iterations(convergence_parameters[k])]
+    while running:
+        for k in running:
+            full_sweep[k] = estimators[k]._start_iteration(
+                X, y, prediction[:, k], convergence_parameters[k], full_sweep[k]
+            )
+
+        for j, lex in enumerate(lex_binned_data):
+            updated = [
+                k
+                for k in running
+                if estimators[k]._prepare_feature_update(j, features[k][j], X, y, None, None, full_sweep[k])
+            ]
+            if not updated:
+                continue
+
+            n_bins = len(alpha[j][0])
+            factors = np.ones((n_folds, n_bins))
+            if not estimators[updated[0]].aggregate:
+                for k in updated:
+                    factors[k] = estimators[k].unlink_func(-features[k][j].factors_link)
+                _multiply_fold_factors(prediction, lex, factors)
+            beta = _fold_prediction_sums(lex, folds, weights, prediction, n_bins)
+
+            for k in updated:
+                est = estimators[k]
+                feature = features[k][j]
+                factors_link, uncertainties_link = _calc_factors_and_uncertainties(
+                    alpha=alpha[j][k], beta=beta[k], link_func=est.link_func
+                )
+                pred = None
+                if est.is_diverging:
+                    pred = CBLinkPredictionsFactors(est.link_func(prediction[:, k]))
+                est.update_feature_factors(feature, factors_link, uncertainties_link, X, y, pred)
+                factors[k] = est.unlink_func(feature.factors_link)
+            _multiply_fold_factors(prediction, lex, factors)
+
+            for k in updated:
+                estimators[k]._feature_updated(j, features[k][j], X, y, prediction[:, k])
+
+        for k in running:
+            est = estimators[k]
+            est._update_convergence(prediction[:, k], y, convergence_parameters[k])
+            if est.is_diverging:
+                pred = CBLinkPredictionsFactors(est.link_func(prediction[:, k]))
+                est.remove_preds(pred, X)
+                prediction[:, k] = est.unlink_func(pred.predict_link())
+                for feature, lex in zip(features[k], lex_binned_data):
+                    feature.lex_binned_data = lex
+            est.iteration_ += 1
+        running = [k for k in running if estimators[k]._continue_iterations(convergence_parameters[k])]
+
+    for k, est in enumerate(estimators):
+        est._finish_fit(X, y, prediction[:, k], convergence_parameters[k])
+        del est.weights
+    return prediction
+
+
+def cross_validate_cb(estimator, X, y, binner=None, cv=5, scoring=None, return_estimator=False):
+    """
+    Cross-validation of a :class:`~cyclic_boosting.CBPoissonRegressor`, fitting
+    the models of all folds together.
+
+    As the training sets of the folds overlap heavily, the fold models are
+    not fitted independently but advance in lock-step over the features. The
+    data is binned and bound to the features only once, the target and weight
+    sums per bin of each fold model are computed as the totals minus those of
+    its test fold, and the prediction sums per bin of all fold models are
+    accumulated in one pass over the data per feature step, instead of one
+    pass per fold model.
+
+    Each fold model is identical to an independent fit on the binned data
+    with zero weights for its test fold. Note that the binning is fitted on
+    all samples, including the test folds, so that the test scores can be
+    optimistic compared to :class:`CBSearchCV`, which bins the training
+    samples of each fold separately.
+
+    Parameters
+    ----------
+    estimator: :class:`~cyclic_boosting.CBPoissonRegressor` or :class:`sklearn.pipeline.Pipeline`
+        Unfitted estimator, or a pipeline of a binning transformer and the
+        estimator as returned by
+        :func:`~cyclic_boosting.pipelines.pipeline_CBPoissonRegressor`. Then,
+        the binning transformer of the pipeline is used as ``binner``.
+    X: :class:`pandas.DataFrame` or :class:`numpy.ndarray`
+        unbinned feature matrix
+    y: :class:`numpy.ndarray`
+        target
+    binner: :class:`~cyclic_boosting.binning.BinNumberTransformer` or None
+        Binning transformer, by default one with 100 bins and the feature
+        properties of the estimator.
+    cv: int or cross-validation generator
+        See :func:`sklearn.model_selection.check_cv`. The test sets have to
+        partition the samples.
+    scoring: str, callable or None
+        Scorer name or callable ``scoring(estimator, X, y)``, called with the
+        fold model and the binned test data. By default, the negative loss
+        (as used for ``insample_loss_``) on the test data.
+    return_estimator: bool
+        Return the fold models as pipelines of the fitted binning and the
+        estimator.
+
+    Returns
+    -------
+    dict
+        ``test_score`` and ``insample_loss`` of each fold model,
+        ``binning_includes_test_folds`` (always True, as the binning is
+        fitted on all samples) and, with ``return_estimator``, the fold models
+        as ``estimator``
+    """
+    if is_binned_dataset(X):
+        raise ValueError("cross_validate_cb bins the data itself, pass the unbinned data.")
+    binner, estimator, _ = _split_estimator(estimator, binner)
+    if not isinstance(estimator, CBPoissonRegressor) or any(
+        getattr(type(estimator), method) is not getattr(CBPoissonRegressor, method)
+        for method in ["calc_parameters", "precalc_parameters"]
+    ):
+        raise ValueError("cross_validate_cb supports only the bin statistics of CBPoissonRegressor.")
+    y = np.asarray(y, dtype=np.float64)
+    folds, n_folds = _fold_numbers(cv, X, y)
+
+    binner = sklearnb.clone(binner).fit(X, y)
+    X_binned = binner.transform(X)
+    estimators = [sklearnb.clone(estimator) for _ in range(n_folds)]
+    _fit_folds_lockstep(estimators, X_binned, y, folds)
+
+    scorer = _negative_loss if scoring is None else get_scorer(scoring)
+    results = {
+        "test_score": np.empty(n_folds),
+        "insample_loss": np.empty(n_folds),
+        # the binning is shared by all fold models and thus fitted on their test folds, too
+        "binning_includes_test_folds": True,
+    }
+    for k, est in enumerate(estimators):
+        test = np.flatnonzero(folds == k)
+        results["test_score"][k] = scorer(est, _take_rows(X_binned, test), y[test])
+        results["insample_loss"][k] = est.insample_loss_
+    if return_estimator:
+        results["estimator"] = [Pipeline([("binning", binner), ("CB", est)]) for est in estimators]
+    return results
+
+
+__all__ = ["CBSearchCV", "cross_validate_cb"]
@@ -10,11 +10,13 @@ from math import lgamma
 import numba as nb
 import numpy as np
 import sklearn.base
+from scipy.special import gammaln
+from scipy.stats import truncnorm
 
 from cyclic_boosting.base import CyclicBoostingBase
 from cyclic_boosting.learning_rate import constant_learn_rate_one
 from cyclic_boosting.link import LogitLinkMixin
-from cyclic_boosting.utils import get_X_column
+from cyclic_boosting.utils import get_target, get_X_column
 
 _logger = logging.getLogger(__name__)
 
@@ -58,6 +60,19 @@ class CBNBinomC(CyclicBoostingBase, sklearn.base.RegressorMixin, LogitLinkMixin)
     bayes: bool
         use expectation of the posterior instead of maximum likelihood in each cyclic boosting step
 
+    n_steps: int
+        number of candidates of the grid search in the first iteration (only
+        used for ``solver="grid"``)
+
+    solver: str
+        ``"grid"`` (default) picks the best c_link update per bin from a
+        fixed grid of candidates (see :func:`get_new_c_link_for_iteration`).
+        ``"newton"`` optimizes the c_link update of each bin continuously
+        from the binned gradient and Hessian of the negative binomial
+        log-likelihood (see :func:`newton_parameters_nbinom_c`), within the
+        same range as the grid. In this case, ``bayes`` uses a Laplace
+        approximation of the posterior.
+
     The rest of the parameters are documented in CyclicBoostingBase.
     """
 
@@ -78,6 +93,8 @@ class CBNBinomC(CyclicBoostingBase, sklearn.base.RegressorMixin, LogitLinkMixin)
         gamma=0.0,
         bayes=False,
         n_steps=15,
+        solver="grid",
+        minimal_feature_factor_change=None,
     ):
         CyclicBoostingBase.__init__(
             self,
@@ -92,11 +109,15 @@ class CBNBinomC(CyclicBoostingBase, sklearn.base.RegressorMixin, LogitLinkMixin)
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
         )
         self.mean_prediction_column = mean_prediction_column
         self.gamma = gamma
         self.bayes = bayes
         self.n_steps = n_steps
+        if solver not in ("grid", "newton"):
+            raise ValueError("solver must be either 'grid' or 'newton', got {}".format(solver))
+        self.solver = solver
 
     def _check_y(self, y):
         """Check that y has no negative values."""
@@ -112,18 +133,34 @@ class CBNBinomC(CyclicBoostingBase, sklearn.base.RegressorMixin, LogitLinkMixin)
         c_link = pred.predict_link()
         binnumbers = feature.lex_binned_data
         minlength = feature.n_bins
-        new_c_link = get_new_c_link_for_iteration(self.iteration_ + 1, self.n_steps)
         # TODO: use weights
-        c_link_estimate = calc_parameters_nbinom_c(
-            y,
-            self.mu,
-            c_link,
-            binnumbers,
-            minlength,
-            self.gamma,
-            int(self.bayes),
-            new_c_link,
-        )
+        if self.solver == "newton":
+            bound = 10.0 ** (1.0 / (self.iteration_ + 1))
+            c_link_estimate = newton_parameters_nbinom_c(
+                y,
+                self.mu,
+                c_link,
+                binnumbers,
+                minlength,
+                self.gamma,
+                self.bayes,
+                -bound,
+                bound,
+                lgamma_y1=self.lgamma_y1,
+            )
+        else:
+            new_c_link = get_new_c_link_for_iteration(self.iteration_ + 1, self.n_steps)
+            c_link_estimate = calc_parameters_nbinom_c(
+                y,
+                self.mu,
+                c_link,
+                binnumbers,
+                minlength,
+                self.gamma,
+                int(self.bayes),
+                new_c_link,
+                lgamma_y1=self.lgamma_y1,
+            )
 
         bincounts = np.bincount(binnumbers, minlength=minlength)
         bincounts[bincounts < 1] = 1.0
@@ -131,20 +168,31 @@ class CBNBinomC(CyclicBoostingBase, sklearn.base.RegressorMixin, LogitLinkMixin)
 
     def loss(self, c, y, weights):
         # TODO: use weights
-        return loss_nbinom_c(y.astype(np.float64), self.mu, c, self.gamma)
+        return loss_nbinom_c(y.astype(np.float64), self.mu, c, self.gamma, self.lgamma_y1)
+
+    def _score_loss(self, X, y, weights):
+        self.mu = get_X_column(X, self.mean_prediction_column)
+        self.lgamma_y1 = lgamma_y_plus_one(np.asarray(y, dtype=np.float64))
+        try:
+            return CyclicBoostingBase._score_loss(self, X, y, weights)
+        finally:
+            del self.mu
+            del self.lgamma_y1
 
     def fit(self, X, y=None):
-        self.mu = X[self.mean_prediction_column].values
+        y = get_target(X, y)
+        self.mu = get_X_column(X, self.mean_prediction_column)
+        self.lgamma_y1 = lgamma_y_plus_one(np.asarray(y, dtype=np.float64))
         _ = self._fit_predict(X, y)
         del self.mu
+        del self.lgamma_y1
         return self
 
     def _get_prior_predictions(self, X):
         if self.prior_prediction_column is None:
-            prior_prediction_link = np.repeat(self.neutral_factor_link, X.shape[0])
+            prior_prediction_link = np.repeat(self.neutral_factor_link, len(X))
         else:
-            prior_pred = get_X_column(X, self.prior_prediction_column)
-            np.clip(prior_pred, 0, 1, prior_pred)
+            prior_pred = np.clip(get_X_column(X, self.prior_prediction_column), 0, 1)
             prior_prediction_link = self.link_func(prior_pred)
             finite = np.isfinite(prior_prediction_link)
             prior_prediction_link[~finite] = self.neutral_factor_link
@@ -176,11 +224,54 @@ def nbinom_log_pmf(x: nb.float64, n: nb.float64, p: nb.float64) -> nb.float64:
     return coeff + n * np.log(p) + x * np.log(1 - p)
 
 
+#: Integer targets below this value use recurrences instead of the
+#: (di-/tri-)gamma functions in the negative binomial kernels.
+MAX_Y_RECURRENCE = 8
+
+
+def lgamma_y_plus_one(y: np.ndarray) -> np.ndarray:
+    """
+    Per-sample ``lgamma(y + 1)``, to be computed once per fit and passed to the
+    negative binomial kernels. For integer-valued targets, the values are
+    looked up in a table of cumulative ``log(k)`` sums.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) > 0 and np.all(y >= 0) and np.all(y == np.floor(y)) and y.max() < 2**20:
+        table = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, int(y.max()) + 1)))))
+        return table[y.astype(np.int64)]
+    return gammaln(y + 1)
+
+
+@nb.njit(nogil=True)
+def _log_rising_factorial(n: nb.float64, x: nb.float64) -> nb.float64:
+    """
+    ``lgamma(n + x) - lgamma(n)``, via the recurrence ``log(n (n + 1) ...
+    (n + x - 1))`` for small integer ``x``.
+    """
+    if x < MAX_Y_RECURRENCE and x == np.floor(x):
+        prod = 1.0
+        for k in range(int(x)):
+            prod *= n + k
+        return np.log(prod)
+    return lgamma(n + x) - lgamma(n)
+
+
+@nb.njit(nogil=True)
+def nbinom_log_pmf_precomputed(x: nb.float64, lgamma_x1: nb.float64, n: nb.float64, p: nb.float64) -> nb.float64:
+    """
+    Negative binomial log PMF with precomputed ``lgamma(x + 1)``.
+    """
+    coeff = _log_rising_factorial(n, x) - lgamma_x1
+    return coeff + n * np.log(p) + x * np.log(1 - p)
+
+
 @_try_compile_parallel_func(
     nogil=True,
     nopython=True,
 )
-def loss_nbinom_c(y: nb.float64[:], mu: nb.float64[:], c: nb.float64[:], gamma: nb.float64) -> nb.float64:
+def loss_nbinom_c(
+    y: nb.float64[:], mu: nb.float64[:], c: nb.float64[:], gamma: nb.float64, lgamma_y1: nb.float64[:]
+) -> nb.float64:
     n_samples = len(y)
 
     p = np.minimum(1.0 / (1 + c * mu), 1.0 - 1e-8)
@@ -188,7 +279,7 @@ def loss_nbinom_c(y: nb.float64[:], mu: nb.float64[:], c: nb.float64[:], gamma:
 
     loss = np.zeros(n_samples)
     for i in nb.prange(n_samples):
-        loss[i] = -nbinom_log_pmf(y[i], n[i], p[i])
+        loss[i] = -nbinom_log_pmf_precomputed(y[i], lgamma_y1[i], n[i], p[i])
 
     loss[~np.isfinite(loss)] = 400
     loss += gamma * np.fabs(c)
@@ -236,14 +327,39 @@ def compute_2d_loss(
     minlength: nb.int64,
     gamma: nb.float64,
     new_c_link: nb.float64[:],
+    lgamma_y1: nb.float64[:],
 ) -> nb.float64[:, :]:
+    """
+    Binned loss for all candidates in ``new_c_link`` in a single pass over
+    the samples: The samples are split into one contiguous chunk per thread,
+    each accumulating into its own ``(n_new_c, minlength)`` buffer, and the
+    buffers are summed up at the end. ``lgamma_y1`` are the precomputed
+    values of ``lgamma(y + 1)`` (see :func:`lgamma_y_plus_one`).
+    """
+    n_samples = len(y)
     n_new_c = len(new_c_link)
-    loss = np.empty((n_new_c, minlength), dtype=np.float64)
-
-    for i in nb.prange(n_new_c):
-        loss[i] = binned_loss_nbinom_c(y.astype(np.float64), mu, c_link, binnumbers, minlength, gamma, new_c_link[i])
-
-    return loss
+    n_chunks = max(min(nb.get_num_threads(), n_samples), 1)
+    chunk_size = (n_samples + n_chunks - 1) // n_chunks
+
+    partial_loss = np.zeros((n_chunks, n_new_c, minlength), dtype=np.float64)
+
+    for k in nb.prange(n_chunks):
+        loss = partial_loss[k]
+        for i in range(k * chunk_size, min((k + 1) * chunk_size, n_samples)):
+            ibin = binnumbers[i]
+            y_i = np.float64(y[i])
+            lgamma_y1_i = lgamma_y1[i]
+            mu_i = mu[i]
+            for j in range(n_new_c):
+                c = 1.0 / (1.0 + np.exp(-(new_c_link[j] + c_link[i])))
+                p = min(1.0 / (1.0 + c * mu_i), 1.0 - 1e-8)
+                n = mu_i * p / (1 - p)
+                loss_i = -nbinom_log_pmf_precomputed(y_i, lgamma_y1_i, n, p)
+                if not np.isfinite(loss_i):
+                    loss_i = 400
+                loss[j, ibin] += loss_i + gamma * np.fabs(c)
+
+    return partial_loss.sum(axis=0)
 
 
 @nb.njit(nogil=True)
@@ -261,8 +377,10 @@ def bayes_result(loss: nb.float64[:, :], minlength: nb.int64, new_c_link: nb.flo
     return result
 
 
-def calc_parameters_nbinom_c(y, mu, c_link, binnumbers, minlength, gamma, bayes, new_c_link):
-    loss = compute_2d_loss(y, mu, c_link, binnumbers, minlength, gamma, new_c_link)
+def calc_parameters_nbinom_c(y, mu, c_link, binnumbers, minlength, gamma, bayes, new_c_link, lgamma_y1=None):
+    if lgamma_y1 is None:
+        lgamma_y1 = lgamma_y_plus_one(y)
+    loss = compute_2d_loss(y, mu, c_link, binnumbers, minlength, gamma, new_c_link, lgamma_y1)
 
     if bayes:
         result = bayes_result(loss, minlength, new_c_link)
@@ -271,3 +389,183 @@ def calc_parameters_nbinom_c(y, mu, c_link, binnumbers, minlength, gamma, bayes,
         result = new_c_link[np.argmin(loss, axis=0)]
 
     return result
+
+
+@nb.njit(nogil=True)
+def _digamma(x: nb.float64) -> nb.float64:
+    """
+    Digamma function for positive arguments via recurrence and asymptotic
+    expansion.
+    """
+    result = 0.0
+    while x < 6.0:
+        result -= 1.0 / x
+        x += 1.0
+    f = 1.0 / (x * x)
+    return result + np.log(x) - 0.5 / x - f * (1.0 / 12 - f * (1.0 / 120 - f * (1.0 / 252 - f * (1.0 / 240 - f / 132))))
+
+
+@nb.njit(nogil=True)
+def _trigamma(x: nb.float64) -> nb.float64:
+    """
+    Trigamma function for positive arguments via recurrence and asymptotic
+    expansion.
+    """
+    result = 0.0
+    while x < 6.0:
+        result += 1.0 / (x * x)
+        x += 1.0
+    f = 1.0 / (x * x)
+    return result + 1.0 / x + 0.5 * f + f / x * (1.0 / 6 - f * (1.0 / 30 - f * (1.0 / 42 - f / 30)))
+
+
+@_try_compile_parallel_func(
+    nogil=True,
+    nopython=True,
+)
+def binned_derivatives_nbinom_c(
+    y: nb.float64[:],
+    mu: nb.float64[:],
+    c_link: nb.float64[:],
+    binnumbers: nb.int64[:],
+    minlength: nb.int64,
+    gamma: nb.float64,
+    delta_c_link: nb.float64[:],
+    lgamma_y1: nb.float64[:],
+) -> nb.float64[:, :]:
+    r"""
+    Binned loss and its first and second derivative with respect to the
+    c_link update ``delta_c_link`` of each bin, in a single pass over the
+    samples.
+
+    With :math:`r = 1 / c` and :math:`c = \text{expit}(z)`, where
+    :math:`z` is the sum of ``c_link`` and the update of the sample's bin,
+    the derivatives of the negative binomial log-likelihood are
+
+    .. math::
+        \frac{\partial \log L}{\partial r} = \psi(y + r) - \psi(r)
+        + \log \frac{r}{r + \mu} + \frac{\mu - y}{r + \mu}
+
+        \frac{\partial^2 \log L}{\partial r^2} = \psi_1(y + r)
+        - \psi_1(r) + \frac{1}{r} - \frac{1}{r + \mu}
+        - \frac{\mu - y}{(r + \mu)^2}
+
+    which are chained to :math:`z` via :math:`dr/dz = -(1 - c) / c` and
+    :math:`d^2r/dz^2 = (1 - c) / c`. For small integer :math:`y`, the
+    differences of the (di-/tri-)gamma functions are evaluated as finite
+    sums, e.g., :math:`\psi(y + r) - \psi(r) = \sum_{k=0}^{y-1} 1 / (r + k)`.
+
+    Returns
+    -------
+    np.ndarray
+        array of shape ``(3, minlength)`` containing the binned loss,
+        gradient and Hessian
+    """
+    n_samples = len(y)
+    n_chunks = max(min(nb.get_num_threads(), n_samples), 1)
+    chunk_size = (n_samples + n_chunks - 1) // n_chunks
+
+    partial_result = np.zeros((n_chunks, 3, minlength), dtype=np.float64)
+
+    for k in nb.prange(n_chunks):
+        result = partial_result[k]
+        for i in range(k * chunk_size, min((k + 1) * chunk_size, n_samples)):
+            ibin = binnumbers[i]
+            y_i = np.float64(y[i])
+            mu_i = mu[i]
+
+            c = 1.0 / (1.0 + np.exp(-(delta_c_link[ibin] + c_link[i])))
+            p = min(1.0 / (1.0 + c * mu_i), 1.0 - 1e-8)
+            n = mu_i * p / (1 - p)
+            loss_i = -nbinom_log_pmf_precomputed(y_i, lgamma_y1[i], n, p)
+            if not np.isfinite(loss_i):
+                loss_i = 400
+            result[0, ibin] += loss_i + gamma * np.fabs(c)
+
+            r = 1.0 / c
+            if y_i < MAX_Y_RECURRENCE and y_i == np.floor(y_i):
+                digamma_diff = 0.0
+                trigamma_diff = 0.0
+                for m in range(int(y_i)):
+                    inv = 1.0 / (r + m)
+                    digamma_diff += inv
+                    trigamma_diff -= inv * inv
+            else:
+                digamma_diff = _digamma(y_i + r) - _digamma(r)
+                trigamma_diff = _trigamma(y_i + r) - _trigamma(r)
+            d_log_l = digamma_diff + np.log(r / (r + mu_i)) + (mu_i - y_i) / (r + mu_i)
+            d2_log_l = trigamma_diff + 1.0 / r - 1.0 / (r + mu_i) - (mu_i - y_i) / (r + mu_i) ** 2
+            dr_dz = -(1.0 - c) / c
+            dc_dz = c * (1.0 - c)
+
+            gradient_i = -d_log_l * dr_dz + gamma * dc_dz
+            hessian_i = -(d2_log_l * dr_dz * dr_dz - d_log_l * dr_dz) + gamma * dc_dz * (1.0 - 2.0 * c)
+            if np.isfinite(gradient_i) and np.isfinite(hessian_i):
+                result[1, ibin] += gradient_i
+                result[2, ibin] += hessian_i
+
+    return partial_result.sum(axis=0)
+
+
+def newton_parameters_nbinom_c(
+    y,
+    mu,
+    c_link,
+    binnumbers,
+    minlength,
+    gamma,
+    bayes,
+    lower,
+    upper,
+    lgamma_y1=None,
+    max_iterations=20,
+    tolerance=1e-4,
+    max_backtracking=10,
+):
+    """
+    Continuous minimization of the binned negative binomial loss with respect
+    to the c_link update of each bin, simultaneously for all bins. Each
+    iteration takes a Newton step per bin (a bounded gradient step for bins
+    with non-positive Hessian), restricted to ``[lower, upper]``, and halves
+    the step of bins in which the loss increased.
+
+    If ``bayes`` is set, the posterior mean under a flat prior on
+    ``[lower, upper]`` is estimated by the Laplace approximation, i.e., the
+    mean of a Gaussian around the maximum-likelihood update with variance
+    given by the inverse Hessian, truncated to ``[lower, upper]``.
+    """
+    if lgamma_y1 is None:
+        lgamma_y1 = lgamma_y_plus_one(y)
+    max_step = 0.5 * (upper - lower)
+    delta = np.zeros(minlength)
+    loss, gradient, hessian = binned_derivatives_nbinom_c(y, mu, c_link, binnumbers, minlength, gamma, delta, lgamma_y1)
+
+    for _ in range(max_iterations):
+        step = np.where(hessian > 0, -gradient / np.where(hessian > 0, hessian, 1.0), -np.sign(gradient) * max_step)
+        step = np.clip(delta + np.clip(step, -max_step, max_step), lower, upper) - delta
+        if np.all(np.abs(step) < tolerance):
+            delta += step
+            break
+
+        for _ in range(max_backtracking):
+            new_loss, new_gradient, new_hessian = binned_derivatives_nbinom_c(
+                y, mu, c_link, binnumbers, minlength, gamma, delta + step, lgamma_y1
+            )
+            worse = new_loss > loss + 1e-12 * np.abs(loss)
+            if not worse.any():
+                break
+            step[worse] *= 0.5
+
+        accepted = ~worse
+        delta[accepted] += step[accepted]
+        loss[accepted] = new_loss[accepted]
+        gradient[accepted] = new_gradient[accepted]
+        hessian[accepted] = new_hessian[accepted]
+
+    if bayes:
+        has_curvature = hessian > 0
+        sigma = 1.0 / np.sqrt(np.where(has_curvature, hessian, 1.0))
+        posterior_mean = truncnorm.mean((lower - delta) / sigma, (upper - delta) / sigma, loc=delta, scale=sigma)
+        delta = np.where(has_curvature & np.isfinite(posterior_mean), posterior_mean, 0.5 * (lower + upper))
+
+    return delta
@@ -1,11 +1,20 @@
 from __future__ import absolute_import, division, print_function
 
 import copy
+import time
 
 import numpy as np
+import pandas as pd
 
 from cyclic_boosting import utils
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 
 class BaseObserver(object):
     """
@@ -14,8 +23,14 @@ class BaseObserver(object):
     Observers are used to extract information from cyclic boosting estimators
     that might be of further interest, but are not needed by the estimator in
     order to make predictions.
+
+    Observers setting ``requires_plot_data`` to False do not need the binned
+    target and prediction means the estimator computes for the analysis plots
+    after the fit, which saves a pass over the training data per feature.
     """
 
+    requires_plot_data = True
+
     def observe_iterations(self, iteration, X, y, prediction, weights, estimator_state):
         """
         Called after each iteration of the algorithm.
@@ -190,6 +205,224 @@ class PlottingObserver(BaseObserver):
             raise ValueError("Observer not filled.")
 
 
+_ITERATION_DTYPE = np.dtype(
+    [
+        ("iteration", np.int64),
+        ("loss", np.float64),
+        ("factor_change", np.float64),
+        ("prediction_mean", np.float64),
+        ("n_features_updated", np.int64),
+        ("seconds", np.float64),
+    ]
+)
+
+_FEATURE_DTYPE = np.dtype(
+    [
+        ("iteration", np.int64),
+        ("feature_i", np.int64),
+        ("factor_change", np.float64),
+        ("factor_min", np.float64),
+        ("factor_max", np.float64),
+        ("n_bins", np.int64),
+        ("seconds", np.float64),
+    ]
+)
+
+
+class _MetricsWriter(object):
+    """Append records to a JSON Lines file or, if ``path`` ends with
+    ``.parquet``, to a Parquet file (requires :mod:`pyarrow`)."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.parquet = self.path.endswith(".parquet")
+        if self.parquet and pa is None:
+            raise ImportError("Writing metrics to Parquet requires pyarrow.")
+        self._writer = None
+
+    def open(self):
+        self.close()
+        if not self.parquet:
+            # truncate the output of previous fits
+            open(self.path, "w").close()
+
+    def write(self, records: pd.DataFrame):
+        if len(records) == 0:
+            return
+        if self.parquet:
+            table = pa.Table.from_pandas(records, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            with open(self.path, "a") as f:
+                f.write(records.to_json(orient="records", lines=True))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class MetricsObserver(BaseObserver):
+    """
+    Observer recording training metrics of a cyclic boosting fit with low
+    overhead, e.g., for monitoring production trainings.
+
+    Per iteration, the in-sample loss, the mean absolute factor change
+    (as used for the convergence criterion), the mean prediction, the number
+    of updated features and the wall time are recorded. Per feature update,
+    the wall time, the mean absolute factor change and the range of the
+    factors in link space are recorded. The records are kept in preallocated
+    arrays, which grow by doubling, and neither the data nor the features are
+    copied.
+
+    Parameters
+    ----------
+    path : str or None
+        If given, the iteration metrics are appended to this file after each
+        iteration, as JSON Lines or, for a ``.parquet`` suffix, as Parquet
+        (requires :mod:`pyarrow`). The file is overwritten at the beginning of
+        each fit.
+
+    feature_path : str or None
+        Like ``path`` for the per-feature metrics.
+
+    capacity : int
+        Number of iterations to preallocate the record arrays for.
+
+    Notes
+    -----
+    The record of iteration ``i`` describes the state after ``i`` completed
+    iterations, i.e., ``iteration`` 0 holds the loss of the prior predictions
+    and ``seconds`` the duration of the ``i``-th iteration. The per-feature
+    records use the zero-based index of the iteration in which the feature was
+    updated.
+    """
+
+    requires_plot_data = False
+
+    def __init__(self, path=None, feature_path=None, capacity=32):
+        self.path = path
+        self.feature_path = feature_path
+        self.capacity = capacity
+
+        self._writers = [_MetricsWriter(p) if p is not None else None for p in (path, feature_path)]
+        self._reset([])
+
+    def _reset(self, features):
+        self._feature_list = list(features)
+        self.feature_groups = [feature.feature_group for feature in self._feature_list]
+        self._iterations = np.zeros(self.capacity, dtype=_ITERATION_DTYPE)
+        self._features = np.zeros(self.capacity * max(len(self._feature_list), 1), dtype=_FEATURE_DTYPE)
+        self._n_iterations = 0
+        self._n_features = 0
+        self._n_flushed = [0, 0]
+        self._n_updated = 0
+        self._iteration_start = time.perf_counter()
+        self._feature_start = self._iteration_start
+
+    @staticmethod
+    def _append(records, n, row):
+        if n == len(records):
+            records = np.resize(records, 2 * len(records))
+        records[n] = row
+        return records
+
+    def observe_iterations(self, iteration, X, y, prediction, weights, estimator_state, delta=None, quantile=None):
+        """Record the metrics of the last iteration and flush them. This
+        function is called at the beginning of each iteration and once in the
+        end of the fit. See :meth:`BaseObserver.observe_iterations` for the
+        parameters."""
+        now = time.perf_counter()
+        final = iteration == -1
+        if iteration == 0:
+            self._reset(estimator_state["link_function"].features)
+            now = self._iteration_start
+            for writer in self._writers:
+                if writer is not None:
+                    writer.open()
+            delta = np.nan
+        elif final:
+            iteration = self._iterations["iteration"][self._n_iterations - 1] + 1
+
+        self._iterations = self._append(
+            self._iterations,
+            self._n_iterations,
+            (
+                iteration,
+                estimator_state["insample_loss"],
+                delta if delta is not None else np.nan,
+                np.mean(prediction),
+                self._n_updated,
+                now - self._iteration_start,
+            ),
+        )
+        self._n_iterations += 1
+        self._n_updated = 0
+        self.flush()
+        if final:
+            self.close()
+        self._iteration_start = time.perf_counter()
+        self._feature_start = self._iteration_start
+
+    def observe_feature_iterations(self, iteration, feature_i, X, y, prediction, weights, estimator_state):
+        """Record the metrics of the feature update. See
+        :meth:`BaseObserver.observe_feature_iterations` for the parameters."""
+        now = time.perf_counter()
+        feature = self._feature_list[feature_i]
+        factors = feature.factors_link
+        self._features = self._append(
+            self._features,
+            self._n_features,
+            (
+                iteration,
+                feature_i,
+                np.mean(np.abs(factors - feature.factors_link_old)),
+                factors.min(),
+                factors.max(),
+                len(factors),
+                now - self._feature_start,
+            ),
+        )
+        self._n_features += 1
+        self._n_updated += 1
+        self._feature_start = time.perf_counter()
+
+    @property
+    def iteration_metrics(self) -> pd.DataFrame:
+        """Metrics per iteration as :class:`pandas.DataFrame`."""
+        return pd.DataFrame(self._iterations[: self._n_iterations])
+
+    @property
+    def feature_metrics(self) -> pd.DataFrame:
+        """Metrics per feature update as :class:`pandas.DataFrame`, with the
+        feature groups in the column ``feature``."""
+        return self._feature_frame(0, self._n_features)
+
+    def _feature_frame(self, start, stop):
+        df = pd.DataFrame(self._features[start:stop])
+        df.insert(2, "feature", [str(self.feature_groups[i]) for i in df["feature_i"]])
+        return df
+
+    def flush(self):
+        """Write the records not written yet to ``path`` and
+        ``feature_path``."""
+        iteration_writer, feature_writer = self._writers
+        if iteration_writer is not None:
+            iteration_writer.write(self.iteration_metrics.iloc[self._n_flushed[0] :])
+        if feature_writer is not None:
+            feature_writer.write(self._feature_frame(self._n_flushed[1], self._n_features))
+        self._n_flushed = [self._n_iterations, self._n_features]
+
+    def close(self):
+        """Close the Parquet writers. Called automatically at the end of the
+        fit."""
+        for writer in self._writers:
+            if writer is not None:
+                writer.close()
+
+
 def calc_in_sample_histograms(y, pred, weights, quantile=None):
     """
     Calculates histograms for use with diagonal plot.
@@ -230,4 +463,4 @@ def calc_in_sample_histograms(y, pred, weights, quantile=None):
         return means, bin_centers, errors, counts
 
 
-__all__ = ["PlottingObserver", "BaseObserver", "calc_in_sample_histograms"]
+__all__ = ["PlottingObserver", "MetricsObserver", "BaseObserver", "calc_in_sample_histograms"]
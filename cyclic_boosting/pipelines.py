@@ -45,10 +45,14 @@ def pipeline_CB(
     gamma=0.0,
     bayes=False,
     n_steps=15,
+    solver="grid",
     regalpha=0.0,
     quantile=None,
     costs=None,
+    gradient=None,
+    hessian=None,
     inplace=False,
+    minimal_feature_factor_change=None,
 ):
     if estimator in [CBPoissonRegressor, CBLocPoissonRegressor, CBLocationRegressor, CBClassifier]:
         estimatorCB = estimator(
@@ -64,6 +68,7 @@ def pipeline_CB(
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
         )
     elif estimator == CBNBinomRegressor:
@@ -80,6 +85,7 @@ def pipeline_CB(
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
             a=a,
             c=c,
@@ -99,6 +105,7 @@ def pipeline_CB(
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             var_prior_exponent=var_prior_exponent,
             prior_exponent_colname=prior_exponent_colname,
         )
@@ -116,9 +123,11 @@ def pipeline_CB(
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             gamma=gamma,
             bayes=bayes,
             n_steps=n_steps,
+            solver=solver,
         )
     elif estimator == CBGBSRegressor:
         estimatorCB = estimator(
@@ -133,6 +142,7 @@ def pipeline_CB(
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
             regalpha=regalpha,
         )
@@ -150,6 +160,7 @@ def pipeline_CB(
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
             quantile=quantile,
         )
@@ -167,8 +178,11 @@ def pipeline_CB(
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
             costs=costs,
+            gradient=gradient,
+            hessian=hessian,
         )
     else:
         raise Exception("No valid CB estimator.")
@@ -4,6 +4,14 @@ Plots for the Cyclic Boosting family
 from __future__ import absolute_import, division, print_function
 
 import contextlib
+import copy
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -13,6 +21,7 @@ from matplotlib.backends.backend_pdf import PdfPages
 from cyclic_boosting.features import create_feature_id
 from cyclic_boosting.utils import get_bin_bounds
 from cyclic_boosting import CBNBinomC
+from cyclic_boosting.binning._utils import _effective_n_jobs
 
 from ._1dplots import plot_factor_1d
 from ._2dplots import plot_factor_2d
@@ -227,6 +236,185 @@ def plot_analysis(
     plt.close("all")
 
 
+def _compact_snapshot(plot_observer):
+    """Copy of the plotting observer without the features and with a
+    stateless instance of the estimator class as link function, which is
+    cheap to send to worker processes."""
+    snapshot = copy.copy(plot_observer)
+    snapshot.features = None
+    link_class = plot_observer.link_function.__class__
+    snapshot.link_function = link_class.__new__(link_class)
+    return snapshot
+
+
+def _compact_feature(feature):
+    """Copy of a feature with the attributes needed for its plot only."""
+    compact = copy.copy(feature)
+    compact.lex_binned_data = None
+    compact.smoother = None
+    compact.smootherb = None
+    return compact
+
+
+def _feature_page(snapshot, feature, bin_bounds):
+    bin_occupancies = None
+    if len(feature.feature_group) == 1 and len(feature.factors_link) <= 400:
+        bin_occupancies = np.bincount(feature.lex_binned_data)
+    return (
+        "feature",
+        snapshot.link_function,
+        snapshot.n_feature_bins.get(feature.feature_group),
+        _compact_feature(feature),
+        bin_bounds,
+        bin_occupancies,
+    )
+
+
+def _render_analysis_file(filepath, pages, figsize, dpi, use_tightlayout, plot_yp):
+    """Render the pages into a (multi-page) PDF or into a single image."""
+    extension = os.path.splitext(filepath)[1][1:]
+    with contextlib.ExitStack() as stack:
+        target = filepath
+        if extension == "pdf":
+            target = stack.enter_context(contextlib.closing(PdfPages(filepath)))
+        for page in pages:
+            plt.figure(figsize=figsize)
+            if page[0] == "diagonal":
+                plot_in_sample_diagonal_plot(page[1])
+            elif page[0] == "loss":
+                plot_loss(page[1])
+            else:
+                grid = gridspec.GridSpec(1, 1)
+                _plot_feature_group(*page[1:3], grid[0], *page[3:], use_tightlayout, plot_yp)
+            plt.savefig(target, format=extension, dpi=dpi)
+            plt.close("all")
+    return filepath
+
+
+def plot_analysis_parallel(
+    plot_observer,
+    dirname,
+    binners=None,
+    image_format="pdf",
+    features_per_file=20,
+    n_jobs=None,
+    figsize=(11.69, 8.27),
+    use_tightlayout=True,
+    plot_yp=True,
+):
+    """
+    Plot the same pages as :func:`plot_analysis` into several files of a
+    directory, rendered concurrently in a process pool and incrementally.
+
+    The in-sample diagonal and loss plots go to ``overview.<image_format>``.
+    For PDF output, the factor plots are written as multi-page PDFs with
+    ``features_per_file`` features each, for PNG output one image per page is
+    written. The worker processes only receive compact copies of the plotted
+    features (without the binned training data) and of the observer.
+
+    A digest of the plotted data of each file is stored in
+    ``analysis.json``. Files whose digest did not change since the last call
+    with the same ``dirname``, e.g., because the factors of their features did
+    not change between two trainings, are not rendered again.
+
+    Parameters
+    ----------
+    plot_observer: :class:`~cyclic_boosting.observers.PlottingObserver`
+        A fitted plotting observer.
+    dirname: str
+        Directory the plots are written to. It is created if necessary.
+    binners: list
+        A list of binners. If binners are given the labels of the x-axis of
+        factor plots are better interpretable.
+    image_format: str
+        ``"pdf"`` or ``"png"``.
+    features_per_file: int
+        Number of feature pages per PDF file.
+    n_jobs: int or None
+        Number of worker processes, ``None`` or 1 for rendering in the
+        calling process, -1 for all CPUs.
+    figsize: tuple
+        A tuple with length containing the width and height of the figures.
+    use_tightlayout: bool
+        If true the tightlayout option of matplotlib is used.
+
+    Returns
+    -------
+    list
+        Paths of the files rendered in this call.
+    """
+    if image_format not in ("pdf", "png"):
+        raise ValueError("image_format must be 'pdf' or 'png', got {!r}".format(image_format))
+    plot_observer.check_fitted()
+    os.makedirs(dirname, exist_ok=True)
+
+    snapshot = _compact_snapshot(plot_observer)
+    overview = []
+    # do not show for nbinom width mode
+    if snapshot.link_function.__class__ != CBNBinomC:
+        overview.append(("diagonal", snapshot))
+    overview.append(("loss", snapshot))
+
+    bin_bounds = {}
+    for binner in binners or []:
+        bin_bounds.update(binner.get_feature_bin_boundaries())
+    feature_pages = []
+    for feature in plot_observer.features:
+        bounds = None
+        if len(feature.feature_group) == 1 and bin_bounds.get(feature.feature_group[0]) is not None:
+            bounds = bin_bounds[feature.feature_group[0]][:, 0]
+        feature_pages.append((feature, _feature_page(snapshot, feature, bounds)))
+
+    files = []
+    if image_format == "pdf":
+        files.append(("overview.pdf", overview))
+        for i in range(0, len(feature_pages), features_per_file):
+            chunk = feature_pages[i : i + features_per_file]
+            files.append(("features_{:03d}.pdf".format(i // features_per_file), [page for _, page in chunk]))
+    else:
+        files.extend(("overview_{}.png".format(page[0]), [page]) for page in overview)
+        for i, (feature, page) in enumerate(feature_pages):
+            name = _format_groupname_with_type(feature.feature_group, feature.feature_type)
+            files.append(("{:03d}_{}.png".format(i, re.sub(r"[^\w.-]+", "_", name)), [page]))
+
+    manifest_path = os.path.join(dirname, "analysis.json")
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+
+    options = (figsize, use_tightlayout, plot_yp)
+    digests = {}
+    tasks = []
+    for filename, pages in files:
+        digests[filename] = hashlib.sha1(pickle.dumps((pages, options))).hexdigest()
+        filepath = os.path.join(dirname, filename)
+        if previous.get(filename) != digests[filename] or not os.path.exists(filepath):
+            tasks.append((filepath, pages))
+
+    for filename in set(previous) - set(digests):
+        if os.path.exists(os.path.join(dirname, filename)):
+            os.remove(os.path.join(dirname, filename))
+
+    dpi = 200
+    n_processes = min(_effective_n_jobs(n_jobs), len(tasks))
+    if n_processes <= 1:
+        rendered = [_render_analysis_file(filepath, pages, figsize, dpi, *options[1:]) for filepath, pages in tasks]
+    else:
+        # forking a process with running numba or thread pool threads can deadlock
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=n_processes, mp_context=context) as executor:
+            futures = [
+                executor.submit(_render_analysis_file, filepath, pages, figsize, dpi, *options[1:])
+                for filepath, pages in tasks
+            ]
+            rendered = [future.result() for future in futures]
+
+    with open(manifest_path, "w") as f:
+        json.dump(digests, f, indent=1)
+    return rendered
+
+
 @nbpy_style
 def plot_factors(
     plot_observer,
@@ -280,15 +468,36 @@ def _format_groupname_with_type(feature_group, feature_type):
 
 
 def _plot_one_feature_group(plot_observer, grid_item, feature, binners=None, use_tightlayout=True, plot_yp=True):
+    bin_bounds = None
+    bin_occupancies = None
     if len(feature.feature_group) == 1:
-        # treatment of one-dimensional features
+        bin_bounds = get_bin_bounds(binners, feature.feature_group[0])
         # no bin occupancy plot for too many bins
-        if len(feature.factors_link) > 400:
+        if len(feature.factors_link) <= 400:
+            bin_occupancies = np.bincount(feature.lex_binned_data)
+    _plot_feature_group(
+        plot_observer.link_function,
+        plot_observer.n_feature_bins.get(feature.feature_group),
+        grid_item,
+        feature,
+        bin_bounds,
+        bin_occupancies,
+        use_tightlayout,
+        plot_yp,
+    )
+
+
+def _plot_feature_group(
+    link_function, n_bins_finite, grid_item, feature, bin_bounds, bin_occupancies, use_tightlayout, plot_yp
+):
+    if len(feature.feature_group) == 1:
+        # treatment of one-dimensional features
+        if bin_occupancies is None:
             plt.subplot(grid_item)
             plot_factor_1d(
                 feature,
-                bin_bounds=get_bin_bounds(binners, feature.feature_group[0]),
-                link_function=plot_observer.link_function,
+                bin_bounds=bin_bounds,
+                link_function=link_function,
                 plot_yp=plot_yp,
             )
         else:
@@ -296,12 +505,11 @@ def _plot_one_feature_group(plot_observer, grid_item, feature, binners=None, use
             factor_plot = plt.subplot(gs[0, 0])
             plot_factor_1d(
                 feature,
-                bin_bounds=get_bin_bounds(binners, feature.feature_group[0]),
-                link_function=plot_observer.link_function,
+                bin_bounds=bin_bounds,
+                link_function=link_function,
                 plot_yp=plot_yp,
             )
             plt.subplot(gs[1, 0], sharex=factor_plot)
-            bin_occupancies = np.bincount(feature.lex_binned_data)
             plt.plot(range(len(bin_occupancies)), bin_occupancies)
             plt.xticks(size="xx-small", rotation="vertical")
         plt.grid(True, which="both")
@@ -309,7 +517,7 @@ def _plot_one_feature_group(plot_observer, grid_item, feature, binners=None, use
     elif len(feature.feature_group) == 2:
         # treatment of two-dimensional features
         plot_factor_2d(
-            n_bins_finite=plot_observer.n_feature_bins[feature.feature_group],
+            n_bins_finite=n_bins_finite,
             feature=feature,
             grid_item=grid_item,
         )
@@ -364,6 +572,7 @@ __all__ = [
     "plot_loss",
     "plot_in_sample_diagonal_plot",
     "plot_analysis",
+    "plot_analysis_parallel",
     "plot_factors",
     "plot_factor_1d",
     "plot_factor_2d",
@@ -6,6 +6,7 @@ from __future__ import absolute_import, division, print_function
 
 import logging
 
+import numba as nb
 import numpy as np
 import pandas as pd
 from numexpr import evaluate
@@ -14,8 +15,9 @@ from six.moves import range
 from cyclic_boosting import CBNBinomRegressor
 from cyclic_boosting.features import FeatureTypes, create_feature_id
 from cyclic_boosting.base import UpdateMixin
+from cyclic_boosting.nbinom import _try_compile_parallel_func
 from cyclic_boosting.regression import _calc_factors_and_uncertainties
-from cyclic_boosting.utils import get_X_column
+from cyclic_boosting.utils import get_target, get_X_column
 
 _logger = logging.getLogger(__name__)
 
@@ -121,8 +123,8 @@ def newton_bisect(
     maximal_iterations: int
        number of maximal iterations
     start_values: np.ndarray or None
-       Start values on the parameters. If None, the middle of
-       the first bisection interval is used.
+       Start values on the parameters. If None or outside of the first
+       bisection interval, the middle of the interval is used.
 
     Returns
     -------
@@ -133,10 +135,10 @@ def newton_bisect(
     x_r = _set_right_bound(x_r, args, valid)
     x_l_save, x_r_save = x_l.copy(), x_r.copy()
 
-    if start_values is None or np.any(start_values < x_l) or np.any(start_values > x_r):
-        l = (x_r + x_l) / 2.0
-    else:
-        l = start_values
+    l = (x_r + x_l) / 2.0
+    if start_values is not None:
+        in_bounds = (start_values >= x_l) & (start_values <= x_r)
+        l[in_bounds] = start_values[in_bounds]
 
     for i in range(maximal_iterations):
         l_new, jac, hess = newton_step(l, *args)
@@ -214,6 +216,114 @@ def newton_step(
     return lnew, jacobian, hessian
 
 
+@nb.njit(nogil=True)
+def _exponent_jacobian_hessian(l, y, p, log_x, k, prior, s, log_k_prior, var_l, start, stop):
+    """
+    Jacobian and hessian of :func:`newton_step` for the samples
+    ``start:stop`` of a single bin (in sorted order).
+    """
+    bin_count = stop - start
+    log_l = np.log(l)
+    jacobian = 0.0
+    hessian = 0.0
+    for i in range(start, stop):
+        w = k[i] * log_x[i]
+        mu = p[i] * np.exp(w * l)
+        jac_data = -(2 * w * mu * (y[i] - mu)) * s[i]
+        jac_prior = 2 * (k[i] * (k[i] * l - prior[i]) + l - 1 + (log_k_prior[i] + 2 * log_l) / l) / var_l / bin_count
+        hess_data = (2 * w * w * mu * mu) * s[i] + w * jac_data
+        hess_prior = 2 * (k[i] * k[i] + 1 + (2 - (log_k_prior[i] + 2 * log_l)) / l / l) / var_l / bin_count
+        jacobian += jac_data + jac_prior
+        hessian += hess_data + hess_prior
+    return jacobian, hessian
+
+
+@_try_compile_parallel_func(
+    nogil=True,
+    nopython=True,
+)
+def newton_bisect_exponent(
+    y,
+    p,
+    log_x,
+    k,
+    prior,
+    s,
+    log_k_prior,
+    var_l,
+    bin_offsets,
+    valid,
+    x_l,
+    x_r,
+    start_values,
+    epsilon,
+    maximal_iterations,
+    maximal_bound_doublings,
+):
+    """Compiled, bin-parallel version of :func:`newton_bisect` for the
+    exponent fits of :class:`CBExponential`, with the jacobian and hessian of
+    :func:`newton_step`.
+
+    The per-sample arrays have to be sorted by bin, with the samples of bin
+    ``j`` in ``bin_offsets[j]:bin_offsets[j + 1]``. Each bin is iterated
+    independently and stops as soon as it has converged, while
+    :func:`newton_bisect` keeps taking steps for all bins until all of them
+    have converged. The bracket arrays ``x_l`` and ``x_r`` are updated in
+    place.
+
+    Returns
+    -------
+    tuple
+        (fitted parameters, hessians)
+    """
+    n_bins = len(valid)
+    l = np.ones(n_bins)
+    hessian = np.ones(n_bins)
+
+    for j in nb.prange(n_bins):
+        if not valid[j]:
+            continue
+        start = bin_offsets[j]
+        stop = bin_offsets[j + 1]
+
+        for _ in range(maximal_bound_doublings):
+            jac, _hess = _exponent_jacobian_hessian(x_r[j], y, p, log_x, k, prior, s, log_k_prior, var_l, start, stop)
+            if jac < 0:
+                x_r[j] *= 2
+            else:
+                break
+
+        if x_l[j] <= start_values[j] <= x_r[j]:
+            l_j = start_values[j]
+        else:
+            l_j = (x_l[j] + x_r[j]) / 2.0
+        hess_j = 1.0
+
+        for _ in range(maximal_iterations):
+            jac, hess = _exponent_jacobian_hessian(l_j, y, p, log_x, k, prior, s, log_k_prior, var_l, start, stop)
+            if not (np.isfinite(jac) and np.isfinite(hess)) or hess == 0:
+                l_j = 1.0
+                hess_j = 1.0
+                break
+            hess_j = hess
+            if (np.abs(jac) < epsilon) or (np.abs(l_j - x_l[j]) < epsilon) or (np.abs(x_r[j] - l_j) < epsilon):
+                break
+
+            l_new = l_j - jac / hess
+            if jac < 0:
+                x_l[j] = l_j
+            else:
+                x_r[j] = l_j
+            if (l_new > x_r[j]) or (l_new < x_l[j]):
+                l_new = (x_l[j] + x_r[j]) / 2.0
+            l_j = l_new
+
+        l[j] = l_j
+        hessian[j] = hess_j
+
+    return l, hessian
+
+
 class CBExponential(CBNBinomRegressor):
     def __init__(
         self,
@@ -234,6 +344,7 @@ class CBExponential(CBNBinomRegressor):
         learn_rate=None,
         a=1.0,
         c=0.0,
+        minimal_feature_factor_change=None,
     ):
         self.standard_feature_groups = standard_feature_groups
         self.external_feature_groups = external_feature_groups
@@ -256,6 +367,7 @@ class CBExponential(CBNBinomRegressor):
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             a=a,
             c=c,
         )
@@ -265,6 +377,8 @@ class CBExponential(CBNBinomRegressor):
         self.var_prior_exponent = var_prior_exponent
         self.epsilon_jacobian = 0.01
         self.starting_bound_bisect = 2
+        self.maximal_iterations_bisect = 10
+        self.maximal_bound_doublings = 10
 
     def required_columns(self):
         required_columns = CBNBinomRegressor.required_columns(self)
@@ -360,14 +474,17 @@ class CBExponential(CBNBinomRegressor):
             ``exponents`` and ``uncertainties``.
         """
         lex_binnumbers = feature.lex_binned_data
+        n_bins = len(feature.bin_weightsums)
         pred_factors = self.unlink_func(pred.factors())
         pred_expos = pred.exponents()
         base = pred.base()
         prior_exponents = pred.prior_exponents()
 
-        bounds_l = np.zeros(feature.n_bins, dtype=np.float64)
-        feature.bounds_r = self.starting_bound_bisect * np.ones(feature.n_bins, dtype=np.float64)
-        start_values = np.ones(feature.n_bins, dtype=np.float64)
+        feature.bounds_l = np.zeros(n_bins, dtype=np.float64)
+        feature.bounds_r = self.starting_bound_bisect * np.ones(n_bins, dtype=np.float64)
+        # The exponents of the previous iterations are already contained in
+        # pred_expos, so the neutral update 1 is the warm start.
+        start_values = np.ones(n_bins, dtype=np.float64)
 
         p = self.unlink_func(pred.predict_link())
 
@@ -376,9 +493,11 @@ class CBExponential(CBNBinomRegressor):
         c = self.c
         variance = a * p + c * p * p
 
-        factors, variance_factors, feature.bounds_l, feature.bounds_r = newton_bisect(
-            newton_step,
-            (
+        sorting = np.argsort(lex_binnumbers, kind="stable")
+        bin_offsets = np.r_[0, np.cumsum(np.bincount(lex_binnumbers, minlength=n_bins))]
+        y_sorted, p_sorted, log_x_sorted, k_sorted, prior_sorted, s_sorted, log_k_prior_sorted = (
+            np.ascontiguousarray(arr[sorting], dtype=np.float64)
+            for arr in (
                 y,
                 pred_factors,
                 base,
@@ -386,16 +505,32 @@ class CBExponential(CBNBinomRegressor):
                 prior_exponents,
                 self.weights_external / variance,
                 log_k_prior,
-                self.var_prior_exponent,
-                lex_binnumbers,
-                len(feature.bin_weightsums),
-            ),
+            )
+        )
+        factors, hessian = newton_bisect_exponent(
+            y_sorted,
+            p_sorted,
+            log_x_sorted,
+            k_sorted,
+            prior_sorted,
+            s_sorted,
+            log_k_prior_sorted,
+            float(self.var_prior_exponent),
+            bin_offsets,
             feature.bin_weightsums > 0,
-            x_l=bounds_l,
-            x_r=feature.bounds_r,
-            epsilon=self.epsilon_jacobian,
-            start_values=start_values,
+            feature.bounds_l,
+            feature.bounds_r,
+            start_values,
+            float(self.epsilon_jacobian),
+            self.maximal_iterations_bisect,
+            self.maximal_bound_doublings,
         )
+
+        variance_factors = np.full_like(hessian, np.inf)
+        m_non_zero = hessian != 0
+        variance_factors[m_non_zero] = 1.0 / hessian[m_non_zero]
+        variance_factors[variance_factors <= 0] = 1.0
+
         return gamma_momemt_matching(factors, variance_factors, self.link_func)
 
     def predict(self, X, y=None):
@@ -415,6 +550,7 @@ class CBExponential(CBNBinomRegressor):
         return pred
 
     def fit(self, X, y=None):
+        y = get_target(X, y)
         self._init_fit(X, y)
         pred = CBLinkPredictions(
             self._get_prior_predictions(X),
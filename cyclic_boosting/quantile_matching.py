@@ -1,30 +1,149 @@
+import copy
+
 import numpy as np
 from numpy import exp, log, sinh, arcsinh, arccosh
 import pandas as pd
 from scipy.optimize import curve_fit, minimize_scalar
-from scipy.stats import norm, gamma, nbinom, logistic, mstats
-from scipy.interpolate import InterpolatedUnivariateSpline
+from scipy.special import expit, logit, ndtr, ndtri
+from scipy.stats import norm, gamma, nbinom, mstats
+from scipy.interpolate import InterpolatedUnivariateSpline, make_interp_spline
 from sklearn.base import BaseEstimator
 
 from typing import Optional, Union, Tuple
 
 
-class J_QPD_S:
+class _QPDArrayMixin:
+    """
+    Support for arrays of quantile-parameterized distributions. The
+    parameters listed in ``_row_parameters`` are scalars for a single
+    distribution or arrays with one entry per distribution (struct of
+    arrays). Indexing returns the distribution of a single row (or a subset
+    of rows).
+
+    In ``ppf``, ``cdf``, and ``pdf``, ``x`` is broadcast against the
+    parameters: for ``n`` distributions, a scalar or an array of shape
+    ``(n,)`` gives one value per distribution, and an array of shape
+    ``(n, m)`` or ``(1, m)`` (like ``quantiles[np.newaxis, :]``) gives a
+    ``(n, m)`` grid. ``rvs`` draws samples of all distributions at once.
+    """
+
+    _row_parameters = ()
+
+    def __len__(self) -> int:
+        return len(getattr(self, self._row_parameters[0]))
+
+    def __getitem__(self, index):
+        dist = copy.copy(self)
+        for name in self._row_parameters:
+            setattr(dist, name, getattr(self, name)[index])
+        return dist
+
+    def _expanded(self, x: Union[float, np.ndarray], *names: str) -> tuple:
+        """Parameters ``names`` with trailing axes for the additional
+        dimensions of ``x``."""
+        values = []
+        for name in names:
+            value = getattr(self, name)
+            n_new_axes = np.ndim(x) - np.ndim(value)
+            if np.ndim(value) > 0 and n_new_axes > 0:
+                value = np.reshape(value, np.shape(value) + (1,) * n_new_axes)
+            values.append(value)
+        return tuple(values)
+
+    def _base_dist(self):
+        return self.phi
+
+    def rvs(
+        self, size: Optional[Union[int, tuple]] = None, random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> Union[float, np.ndarray]:
+        """
+        Random samples drawn by transforming samples of the base distribution,
+        without evaluating its quantile function.
+
+        Parameters
+        ----------
+        size : int or tuple
+            number (or shape) of samples per distribution (default is one)
+        random_state : int or np.random.Generator
+            seed or random number generator
+
+        Returns
+        -------
+        float or np.ndarray
+            samples of shape ``(n,) + size`` for ``n`` distributions
+        """
+        shape = np.shape(getattr(self, self._row_parameters[0])) + np.shape(np.empty(size or ()))
+        return self._johnson(self._base_dist().rvs(size=shape, random_state=random_state))
+
+
+def _check_spt(qv_low: np.ndarray, qv_median: np.ndarray, qv_high: np.ndarray) -> None:
+    if np.any(qv_low > qv_median) or np.any(qv_high < qv_median):
+        raise ValueError("The SPT values need to be monotonically increasing.")
+
+
+class StandardNormal:
+    """
+    Standard normal distribution, evaluated directly by the ufuncs of
+    :mod:`scipy.special`. Same results as ``scipy.stats.norm()``, but without
+    the overhead of the generic scipy distribution methods (argument checks
+    and broadcasting), which dominates for scalars and small arrays.
+    """
+
+    def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return ndtri(x)
+
+    def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return ndtr(x)
+
+    def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return np.exp(-0.5 * np.square(x)) / np.sqrt(2 * np.pi)
+
+    def rvs(
+        self, size: Optional[Union[int, tuple]] = None, random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> Union[float, np.ndarray]:
+        return np.random.default_rng(random_state).standard_normal(size)
+
+
+class StandardLogistic:
+    """
+    Standard logistic distribution, evaluated directly by the ufuncs of
+    :mod:`scipy.special` (see :class:`StandardNormal`).
+    """
+
+    def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return logit(x)
+
+    def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return expit(x)
+
+    def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return expit(x) * expit(-x)
+
+    def rvs(
+        self, size: Optional[Union[int, tuple]] = None, random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> Union[float, np.ndarray]:
+        return np.random.default_rng(random_state).logistic(size=size)
+
+
+class J_QPD_S(_QPDArrayMixin):
     """
     Implementation of the semi-bounded mode of Johnson Quantile-Parameterized
     Distributions (J-QPD), see https://repositories.lib.utexas.edu/bitstream/handle/2152/63037/HADLOCK-DISSERTATION-2017.pdf
     (Due to the Python keyword, the parameter lambda from this reference is named kappa below.).
     A distribution is parameterized by a symmetric-percentile triplet (SPT).
 
+    The SPT values can also be arrays, describing one distribution per entry
+    (see :class:`_QPDArrayMixin`).
+
     Parameters
     ----------
     alpha : float
         lower quantile of SPT (upper is ``1 - alpha``)
-    qv_low : float
+    qv_low : float or np.ndarray
         quantile function value of ``alpha``
-    qv_median : float
+    qv_median : float or np.ndarray
         quantile function value of quantile 0.5
-    qv_high : float
+    qv_high : float or np.ndarray
         quantile function value of quantile ``1 - alpha``
     l : float
         lower bound of semi-bounded range (default is 0)
@@ -32,24 +151,26 @@ class J_QPD_S:
         options are ``normal`` (default) or ``logistic``
     """
 
+    _row_parameters = ("L", "H", "B", "n", "theta", "delta", "kappa")
+
     def __init__(
         self,
         alpha: float,
-        qv_low: float,
-        qv_median: float,
-        qv_high: float,
+        qv_low: Union[float, np.ndarray],
+        qv_median: Union[float, np.ndarray],
+        qv_high: Union[float, np.ndarray],
         l: Optional[float] = 0,
         version: Optional[str] = "normal",
     ):
         if version == "normal":
-            self.phi = norm()
+            self.phi = StandardNormal()
         elif version == "logistic":
-            self.phi = logistic()
+            self.phi = StandardLogistic()
         else:
             raise Exception("Invalid version.")
 
-        if (qv_low > qv_median) or (qv_high < qv_median):
-            raise ValueError("The SPT values need to be monotonically increasing.")
+        qv_low, qv_median, qv_high = (np.asarray(qv, dtype=np.float64) for qv in (qv_low, qv_median, qv_high))
+        _check_spt(qv_low, qv_median, qv_high)
 
         self.l = l
 
@@ -59,49 +180,54 @@ class J_QPD_S:
         self.H = log(qv_high - l)
         self.B = log(qv_median - l)
 
-        if self.L + self.H - 2 * self.B > 0:
-            self.n = 1
-            self.theta = qv_low - l
-        elif self.L + self.H - 2 * self.B < 0:
-            self.n = -1
-            self.theta = qv_high - l
-        else:
-            self.n = 0
-            self.theta = qv_median - l
+        self.n = np.sign(self.L + self.H - 2 * self.B)
+        self.theta = np.where(self.n > 0, qv_low - l, np.where(self.n < 0, qv_high - l, qv_median - l))[()]
 
-        self.delta = 1.0 / self.c * sinh(arccosh((self.H - self.L) / (2 * min(self.B - self.L, self.H - self.B))))
+        self.delta = (
+            1.0 / self.c * sinh(arccosh((self.H - self.L) / (2 * np.minimum(self.B - self.L, self.H - self.B))))
+        )
 
-        self.kappa = 1.0 / (self.delta * self.c) * min(self.H - self.B, self.B - self.L)
+        self.kappa = 1.0 / (self.delta * self.c) * np.minimum(self.H - self.B, self.B - self.L)
 
     def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
-        return self.l + self.theta * exp(
-            self.kappa * sinh(arcsinh(self.delta * self.phi.ppf(x)) + arcsinh(self.n * self.c * self.delta))
-        )
+        return self._johnson(self.phi.ppf(x))
+
+    def _johnson(self, base: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        n, theta, delta, kappa = self._expanded(base, "n", "theta", "delta", "kappa")
+        return self.l + theta * exp(kappa * sinh(arcsinh(delta * base) + arcsinh(n * self.c * delta)))
 
     def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        n, theta, delta, kappa = self._expanded(x, "n", "theta", "delta", "kappa")
         return self.phi.cdf(
-            1.0
-            / self.delta
-            * sinh(arcsinh(1.0 / self.kappa * log((x - self.l) / self.theta)) - arcsinh(self.n * self.c * self.delta))
+            1.0 / delta * sinh(arcsinh(1.0 / kappa * log((x - self.l) / theta)) - arcsinh(n * self.c * delta))
         )
 
+    def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        n, theta, delta, kappa = self._expanded(x, "n", "theta", "delta", "kappa")
+        w = 1.0 / kappa * log((x - self.l) / theta)
+        a = arcsinh(w) - arcsinh(n * self.c * delta)
+        return self.phi.pdf(1.0 / delta * sinh(a)) * np.cosh(a) / (delta * np.sqrt(w**2 + 1) * kappa * (x - self.l))
+
 
-class J_QPD_B:
+class J_QPD_B(_QPDArrayMixin):
     """
     Implementation of the bounded mode of Johnson Quantile-Parameterized
     Distributions (J-QPD), see https://repositories.lib.utexas.edu/bitstream/handle/2152/63037/HADLOCK-DISSERTATION-2017.pdf.
     (Due to the Python keyword, the parameter lambda from this reference is named kappa below.)
     A distribution is parameterized by a symmetric-percentile triplet (SPT).
 
+    The SPT values can also be arrays, describing one distribution per entry
+    (see :class:`_QPDArrayMixin`).
+
     Parameters
     ----------
     alpha : float
         lower quantile of SPT (upper is ``1 - alpha``)
-    qv_low : float
+    qv_low : float or np.ndarray
         quantile function value of ``alpha``
-    qv_median : float
+    qv_median : float or np.ndarray
         quantile function value of quantile 0.5
-    qv_high : float
+    qv_high : float or np.ndarray
         quantile function value of quantile ``1 - alpha``
     l : float
         lower bound of supported range
@@ -111,25 +237,27 @@ class J_QPD_B:
         options are ``normal`` (default) or ``logistic``
     """
 
+    _row_parameters = ("L", "H", "B", "n", "xi", "delta", "kappa")
+
     def __init__(
         self,
         alpha: float,
-        qv_low: float,
-        qv_median: float,
-        qv_high: float,
+        qv_low: Union[float, np.ndarray],
+        qv_median: Union[float, np.ndarray],
+        qv_high: Union[float, np.ndarray],
         l: float,
         u: float,
         version: Optional[str] = "normal",
     ):
         if version == "normal":
-            self.phi = norm()
+            self.phi = StandardNormal()
         elif version == "logistic":
-            self.phi = logistic()
+            self.phi = StandardLogistic()
         else:
             raise Exception("Invalid version.")
 
-        if (qv_low > qv_median) or (qv_high < qv_median):
-            raise ValueError("The SPT values need to be monotonically increasing.")
+        qv_low, qv_median, qv_high = (np.asarray(qv, dtype=np.float64) for qv in (qv_low, qv_median, qv_high))
+        _check_spt(qv_low, qv_median, qv_high)
 
         self.l = l
         self.u = u
@@ -140,29 +268,32 @@ class J_QPD_B:
         self.H = self.phi.ppf((qv_high - l) / (u - l))
         self.B = self.phi.ppf((qv_median - l) / (u - l))
 
-        if self.L + self.H - 2 * self.B > 0:
-            self.n = 1
-            self.xi = self.L
-        elif self.L + self.H - 2 * self.B < 0:
-            self.n = -1
-            self.xi = self.H
-        else:
-            self.n = 0
-            self.xi = self.B
+        self.n = np.sign(self.L + self.H - 2 * self.B)
+        self.xi = np.where(self.n > 0, self.L, np.where(self.n < 0, self.H, self.B))[()]
 
-        self.delta = 1.0 / self.c * arccosh((self.H - self.L) / (2 * min(self.B - self.L, self.H - self.B)))
+        self.delta = 1.0 / self.c * arccosh((self.H - self.L) / (2 * np.minimum(self.B - self.L, self.H - self.B)))
 
         self.kappa = (self.H - self.L) / sinh(2 * self.delta * self.c)
 
     def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
-        return self.l + (self.u - self.l) * self.phi.cdf(
-            self.xi + self.kappa * sinh(self.delta * (self.phi.ppf(x) + self.n * self.c))
-        )
+        return self._johnson(self.phi.ppf(x))
+
+    def _johnson(self, base: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        n, xi, delta, kappa = self._expanded(base, "n", "xi", "delta", "kappa")
+        return self.l + (self.u - self.l) * self.phi.cdf(xi + kappa * sinh(delta * (base + n * self.c)))
 
     def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        n, xi, delta, kappa = self._expanded(x, "n", "xi", "delta", "kappa")
         return self.phi.cdf(
-            1.0 / self.delta * arcsinh(1.0 / self.kappa * (self.phi.ppf((x - self.l) / (self.u - self.l)) - self.xi))
-            - self.n * self.c
+            1.0 / delta * arcsinh(1.0 / kappa * (self.phi.ppf((x - self.l) / (self.u - self.l)) - xi)) - n * self.c
+        )
+
+    def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        n, xi, delta, kappa = self._expanded(x, "n", "xi", "delta", "kappa")
+        s = self.phi.ppf((x - self.l) / (self.u - self.l))
+        w = 1.0 / kappa * (s - xi)
+        return self.phi.pdf(1.0 / delta * arcsinh(w) - n * self.c) / (
+            delta * np.sqrt(w**2 + 1) * kappa * self.phi.pdf(s) * (self.u - self.l)
         )
 
 
@@ -183,8 +314,14 @@ class SinhLogistic:
 
     def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         # ppf of natural logistic distribution
-        xlog = 0.25 * np.log(x / (1.0 - x))
+        return self._scaled(0.25 * logit(x))
+
+    def rvs(
+        self, size: Optional[Union[int, tuple]] = None, random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> Union[float, np.ndarray]:
+        return self._scaled(np.random.default_rng(random_state).logistic(scale=0.25, size=size))
 
+    def _scaled(self, xlog: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         # sinh or arcsinh scaling
         if self.shape > 0:
             x = np.arcsinh(self.shape * xlog) / self.shape
@@ -204,7 +341,7 @@ class SinhLogistic:
             xlog = x
 
         # natural logistic cdf
-        return 1.0 / (1 + np.exp(-4 * xlog))
+        return expit(4 * xlog)
 
     def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         if self.shape > 0:
@@ -238,43 +375,46 @@ class BaseDist:
     def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         return self.dist.pdf(x * self.width) * self.width
 
+    def rvs(
+        self, size: Optional[Union[int, tuple]] = None, random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> Union[float, np.ndarray]:
+        return self.dist.rvs(size=size, random_state=random_state) / self.width
+
 
-def unconstrained_calc(L: float, B: float, H: float) -> Tuple[float, float, float, float]:
+def unconstrained_calc(
+    L: Union[float, np.ndarray], B: Union[float, np.ndarray], H: Union[float, np.ndarray]
+) -> Tuple[float, float, float, float]:
+    L, B, H = (np.asarray(v, dtype=np.float64) for v in (L, B, H))
     gamma = -np.sign(L + H - 2 * B)
 
-    if gamma == 0:
-        xi = B
-        kappa = H - B
-        delta = 1
-    else:
-        if gamma < 0:
-            xi = L
-            theta = (B - L) / (H - L)
-        else:
-            xi = H
-            theta = (H - B) / (H - L)
-        delta = 1.0 / arccosh(1 / (2.0 * theta))
-        kappa = (H - L) / sinh(2.0 / delta)
+    theta = np.where(gamma < 0, (B - L) / (H - L), (H - B) / (H - L))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = np.where(gamma == 0, 1.0, 1.0 / arccosh(1 / (2.0 * theta)))
+        kappa = np.where(gamma == 0, H - B, (H - L) / sinh(2.0 / delta))
+    xi = np.where(gamma == 0, B, np.where(gamma < 0, L, H))
 
-    return gamma, xi, kappa, delta
+    return gamma[()], xi[()], kappa[()], delta[()]
 
 
-class J_QPD_extended_U:
+class J_QPD_extended_U(_QPDArrayMixin):
     """
     Unbounded version of J-QPDs (see bounded and semi-bounded versions above),
     including an additional shape parameter to enable flexible tail behavior.
     Again, a distribution is parameterized by a symmetric-percentile triplet
     (SPT).
 
+    The SPT values can also be arrays, describing one distribution per entry
+    (see :class:`_QPDArrayMixin`).
+
     Parameters
     ----------
     alpha : float
         lower quantile of SPT (upper is ``1 - alpha``)
-    qv_low : float
+    qv_low : float or np.ndarray
         quantile function value of ``alpha``
-    qv_median : float
+    qv_median : float or np.ndarray
         quantile function value of quantile 0.5
-    qv_high : float
+    qv_high : float or np.ndarray
         quantile function value of quantile ``1 - alpha``
     version: str
         options are ``normal`` (sinhlogistic), ``normal`, or ``logistic``
@@ -283,12 +423,14 @@ class J_QPD_extended_U:
         sinh/arcsinh-scaling (only active in sinhlogistic version)
     """
 
+    _row_parameters = ("gamma", "xi", "kappa", "delta")
+
     def __init__(
         self,
         alpha: float,
-        qv_low: float,
-        qv_median: float,
-        qv_high: float,
+        qv_low: Union[float, np.ndarray],
+        qv_median: Union[float, np.ndarray],
+        qv_high: Union[float, np.ndarray],
         version: Optional[str] = "sinhlogistic",
         shape: Optional[float] = 0,
     ):
@@ -296,51 +438,65 @@ class J_QPD_extended_U:
         self.alpha = alpha
 
         if version == "normal":
-            self.phi = norm()
+            self.phi = StandardNormal()
         elif version == "logistic":
-            self.phi = logistic()
+            self.phi = StandardLogistic()
         elif version == "sinhlogistic":
             self.phi = SinhLogistic(shape=self.shape)
         else:
             raise Exception("Invalid version.")
 
-        if (qv_low > qv_median) or (qv_high < qv_median):
-            raise ValueError("The SPT values need to be monotonically increasing.")
+        qv_low, qv_median, qv_high = (np.asarray(qv, dtype=np.float64) for qv in (qv_low, qv_median, qv_high))
+        _check_spt(qv_low, qv_median, qv_high)
 
         # identity transformation
         self.gamma, self.xi, self.kappa, self.delta = unconstrained_calc(qv_low, qv_median, qv_high)
 
     def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
-        basequantiles = BaseDist(self.phi, self.alpha).ppf(x)
+        return self._johnson(self._base_dist().ppf(x))
+
+    def _base_dist(self):
+        return BaseDist(self.phi, self.alpha)
 
+    def _johnson(self, basequantiles: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(basequantiles, "gamma", "xi", "kappa", "delta")
         # internal unconstrained quantiles from Johnson transform
         # back transformatiaon into physical space (identity here)
-        return self.xi + self.kappa * sinh((basequantiles - self.gamma) / self.delta)
+        return xi + kappa * sinh((basequantiles - gamma) / delta)
 
     def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(x, "gamma", "xi", "kappa", "delta")
         # transform from physical to internal space (identity here)
         # internal unconstrained quantiles from Johnson transform
-        basequantiles = self.gamma + self.delta * arcsinh((x - self.xi) / self.kappa)
+        basequantiles = gamma + delta * arcsinh((x - xi) / kappa)
 
         # cdf of base distribution
-        return BaseDist(self.phi, self.alpha).cdf(basequantiles)
+        return self._base_dist().cdf(basequantiles)
 
+    def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(x, "gamma", "xi", "kappa", "delta")
+        w = (x - xi) / kappa
+        return self._base_dist().pdf(gamma + delta * arcsinh(w)) * delta / (kappa * np.sqrt(w**2 + 1))
 
-class J_QPD_extended_S:
+
+class J_QPD_extended_S(_QPDArrayMixin):
     """
     Semi-bounded version of J-QPDs, extended by a shape parameter to enable
     flexible tail behavior. A distribution is parameterized by a
     symmetric-percentile triplet (SPT).
 
+    The SPT values can also be arrays, describing one distribution per entry
+    (see :class:`_QPDArrayMixin`).
+
     Parameters
     ----------
     alpha : float
         lower quantile of SPT (upper is ``1 - alpha``)
-    qv_low : float
+    qv_low : float or np.ndarray
         quantile function value of ``alpha``
-    qv_median : float
+    qv_median : float or np.ndarray
         quantile function value of quantile 0.5
-    qv_high : float
+    qv_high : float or np.ndarray
         quantile function value of quantile ``1 - alpha``
     l : float
         lower bound of semi-bounded range (default is 0)
@@ -351,12 +507,14 @@ class J_QPD_extended_S:
         sinh/arcsinh-scaling (only active in sinhlogistic version)
     """
 
+    _row_parameters = ("L", "H", "B", "gamma", "xi", "kappa", "delta")
+
     def __init__(
         self,
         alpha: float,
-        qv_low: float,
-        qv_median: float,
-        qv_high: float,
+        qv_low: Union[float, np.ndarray],
+        qv_median: Union[float, np.ndarray],
+        qv_high: Union[float, np.ndarray],
         l: Optional[float] = 0,
         version: Optional[str] = "sinhlogistic",
         shape: Optional[float] = 0,
@@ -365,16 +523,16 @@ class J_QPD_extended_S:
         self.alpha = alpha
 
         if version == "normal":
-            self.phi = norm()
+            self.phi = StandardNormal()
         elif version == "logistic":
-            self.phi = logistic()
+            self.phi = StandardLogistic()
         elif version == "sinhlogistic":
             self.phi = SinhLogistic(shape=self.shape)
         else:
             raise Exception("Invalid version.")
 
-        if (qv_low > qv_median) or (qv_high < qv_median):
-            raise ValueError("The SPT values need to be monotonically increasing.")
+        qv_low, qv_median, qv_high = (np.asarray(qv, dtype=np.float64) for qv in (qv_low, qv_median, qv_high))
+        _check_spt(qv_low, qv_median, qv_high)
 
         self.l = l
 
@@ -387,39 +545,54 @@ class J_QPD_extended_S:
         self.gamma, self.xi, self.kappa, self.delta = unconstrained_calc(self.L, self.B, self.H)
 
     def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
-        basequantiles = BaseDist(self.phi, self.alpha).ppf(x)
+        return self._johnson(self._base_dist().ppf(x))
+
+    def _base_dist(self):
+        return BaseDist(self.phi, self.alpha)
 
+    def _johnson(self, basequantiles: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(basequantiles, "gamma", "xi", "kappa", "delta")
         # internal unconstrained quantiles from Johnson transform
-        z = self.xi + self.kappa * sinh((basequantiles - self.gamma) / self.delta)
+        z = xi + kappa * sinh((basequantiles - gamma) / delta)
 
         # back transformation into physical space
         return back_transform_in_semibound_lower(z, self.l)
 
     def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(x, "gamma", "xi", "kappa", "delta")
         # transform from physical to internal space
         z = transform_from_semibound_lower(x, self.l)
 
         # internal unconstrained quantiles from Johnson transform
-        basequantiles = self.gamma + self.delta * arcsinh((z - self.xi) / self.kappa)
+        basequantiles = gamma + delta * arcsinh((z - xi) / kappa)
 
-        return BaseDist(self.phi, self.alpha).cdf(basequantiles)
+        return self._base_dist().cdf(basequantiles)
 
+    def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(x, "gamma", "xi", "kappa", "delta")
+        w = (transform_from_semibound_lower(x, self.l) - xi) / kappa
+        # derivative of the transformation into internal space: 1 / (x - l)
+        return self._base_dist().pdf(gamma + delta * arcsinh(w)) * delta / (kappa * np.sqrt(w**2 + 1) * (x - self.l))
 
-class J_QPD_extended_B:
+
+class J_QPD_extended_B(_QPDArrayMixin):
     """
     Bounded version of J-QPDs, extended by a shape parameter to enable flexible
     tail behavior. A distribution is parameterized by a symmetric-percentile
     triplet (SPT).
 
+    The SPT values can also be arrays, describing one distribution per entry
+    (see :class:`_QPDArrayMixin`).
+
     Parameters
     ----------
     alpha : float
         lower quantile of SPT (upper is ``1 - alpha``)
-    qv_low : float
+    qv_low : float or np.ndarray
         quantile function value of ``alpha``
-    qv_median : float
+    qv_median : float or np.ndarray
         quantile function value of quantile 0.5
-    qv_high : float
+    qv_high : float or np.ndarray
         quantile function value of quantile ``1 - alpha``
     l : float
         lower bound of supported range
@@ -432,12 +605,14 @@ class J_QPD_extended_B:
         sinh/arcsinh-scaling (only active in sinhlogistic version)
     """
 
+    _row_parameters = ("L", "H", "B", "gamma", "xi", "kappa", "delta")
+
     def __init__(
         self,
         alpha: float,
-        qv_low: float,
-        qv_median: float,
-        qv_high: float,
+        qv_low: Union[float, np.ndarray],
+        qv_median: Union[float, np.ndarray],
+        qv_high: Union[float, np.ndarray],
         l: Optional[float] = 0,
         u: Optional[float] = 1,
         version: Optional[str] = "sinhlogistic",
@@ -447,16 +622,16 @@ class J_QPD_extended_B:
         self.alpha = alpha
 
         if version == "normal":
-            self.phi = norm()
+            self.phi = StandardNormal()
         elif version == "logistic":
-            self.phi = logistic()
+            self.phi = StandardLogistic()
         elif version == "sinhlogistic":
             self.phi = SinhLogistic(shape=self.shape)
         else:
             raise Exception("Invalid version.")
 
-        if (qv_low > qv_median) or (qv_high < qv_median):
-            raise ValueError("The SPT values need to be monotonically increasing.")
+        qv_low, qv_median, qv_high = (np.asarray(qv, dtype=np.float64) for qv in (qv_low, qv_median, qv_high))
+        _check_spt(qv_low, qv_median, qv_high)
 
         self.l = l
         self.u = u
@@ -470,26 +645,43 @@ class J_QPD_extended_B:
         self.gamma, self.xi, self.kappa, self.delta = unconstrained_calc(self.L, self.B, self.H)
 
     def ppf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
-        basequantiles = BaseDist(self.phi, self.alpha).ppf(x)
+        return self._johnson(self._base_dist().ppf(x))
+
+    def _base_dist(self):
+        return BaseDist(self.phi, self.alpha)
 
+    def _johnson(self, basequantiles: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(basequantiles, "gamma", "xi", "kappa", "delta")
         # internal unconstrained quantiles from Johnson transform
-        z = self.xi + self.kappa * sinh((basequantiles - self.gamma) / self.delta)
+        z = xi + kappa * sinh((basequantiles - gamma) / delta)
 
         # back transformation into [l, u]
         return back_transform_in_bounds(z, self.l, self.u)
 
     def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(x, "gamma", "xi", "kappa", "delta")
         # transform from bounded physical space to unconstrained internal space
         z = transform_from_bounds(x, self.l, self.u)
 
         # internal unconstrained quantiles from Johnson transform
-        basequantiles = self.gamma + self.delta * arcsinh((z - self.xi) / self.kappa)
+        basequantiles = gamma + delta * arcsinh((z - xi) / kappa)
 
         # cdf of base distribution
-        p = BaseDist(self.phi, self.alpha).cdf(basequantiles)
+        p = self._base_dist().cdf(basequantiles)
 
         return p
 
+    def pdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        gamma, xi, kappa, delta = self._expanded(x, "gamma", "xi", "kappa", "delta")
+        w = (transform_from_bounds(x, self.l, self.u) - xi) / kappa
+        # derivative of the transformation into internal space: (u - l) / ((x - l) * (u - x))
+        return (
+            self._base_dist().pdf(gamma + delta * arcsinh(w))
+            * delta
+            * (self.u - self.l)
+            / (kappa * np.sqrt(w**2 + 1) * (x - self.l) * (self.u - x))
+        )
+
 
 def transform_from_bounds(x: np.ndarray, l: float, u: float) -> np.ndarray:
     # transform from bounded physical space to [0, 1]
@@ -717,16 +909,13 @@ class QPD_RegressorChain(BaseEstimator):
             pred_lowq = back_transform_in_semibound_upper(self.est_lowq.predict(X), pred_median)
             pred_highq = back_transform_in_semibound_lower(self.est_lowq.predict(X), pred_median)
 
-        qpd = []
-        for i in range(len(X)):
-            if self.bound == "S":
-                qpd.append(
-                    J_QPD_extended_S(self.alpha, pred_lowq[i], pred_median[i], pred_highq[i], self.l, shape=self.shape)
-                )
-            elif self.bound == "B":
-                qpd.append(J_QPD_extended_B(self.alpha, pred_lowq[i], pred_median[i], pred_highq[i], self.l, self.u))
-            else:
-                qpd.append(J_QPD_extended_U(self.alpha, pred_lowq[i], pred_median[i], pred_highq[i]))
+        # one array-valued distribution object for all samples, qpd[i] is the distribution of sample i
+        if self.bound == "S":
+            qpd = J_QPD_extended_S(self.alpha, pred_lowq, pred_median, pred_highq, self.l, shape=self.shape)
+        elif self.bound == "B":
+            qpd = J_QPD_extended_B(self.alpha, pred_lowq, pred_median, pred_highq, self.l, self.u)
+        else:
+            qpd = J_QPD_extended_U(self.alpha, pred_lowq, pred_median, pred_highq)
 
         return pred_lowq, pred_median, pred_highq, qpd
 
@@ -890,3 +1079,261 @@ def quantile_fit_spline(quantiles: np.ndarray, quantile_values: np.ndarray) -> c
     """
     spl = InterpolatedUnivariateSpline(quantiles, quantile_values, k=3, bbox=[0, 1], ext=3)
     return spl
+
+
+def _fit_rows_least_squares(
+    residuals: callable, params: np.ndarray, quantile_values: np.ndarray, max_iterations: Optional[int] = 100
+) -> np.ndarray:
+    """
+    Levenberg-Marquardt least-squares fits of all rows at once, with the
+    Jacobians estimated by forward differences. Rows are no longer updated
+    once their fit has converged.
+
+    Parameters
+    ----------
+    residuals : callable
+        ``residuals(params, quantile_values)`` returns the residuals of shape
+        ``(n_rows, n_quantiles)`` for the parameters of shape
+        ``(n_rows, n_params)`` and the matching rows of ``quantile_values``
+    params : np.ndarray
+        start values of shape ``(n_rows, n_params)``
+    quantile_values : np.ndarray
+        quantile values of shape ``(n_rows, n_quantiles)``
+    max_iterations : int
+        maximal number of iterations
+
+    Returns
+    -------
+    np.ndarray
+        fitted parameters of shape ``(n_rows, n_params)``
+    """
+    params = np.array(params, dtype=np.float64)
+    n_params = params.shape[1]
+    res = residuals(params, quantile_values)
+    cost = np.sum(res**2, axis=1)
+    damping = np.full(len(params), 1e-3)
+    active = np.flatnonzero(np.isfinite(cost))
+
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+        p, r, y = params[active], res[active], quantile_values[active]
+
+        eps = 1e-7 * np.maximum(1.0, np.abs(p))
+        jac = np.empty(r.shape + (n_params,))
+        for j in range(n_params):
+            p_shifted = p.copy()
+            p_shifted[:, j] += eps[:, j]
+            jac[:, :, j] = (residuals(p_shifted, y) - r) / eps[:, j, np.newaxis]
+
+        jtj = np.einsum("imk,iml->ikl", jac, jac)
+        grad = np.einsum("imk,im->ik", jac, r)
+        diag = np.einsum("ikk->ik", jtj)
+        lhs = jtj + (damping[active, np.newaxis] * (diag + 1e-12))[:, :, np.newaxis] * np.eye(n_params)
+        with np.errstate(invalid="ignore"):
+            step = -np.linalg.solve(lhs, grad[:, :, np.newaxis])[:, :, 0]
+            p_new = p + step
+            r_new = residuals(p_new, y)
+            cost_new = np.sum(r_new**2, axis=1)
+            improved = cost_new < cost[active]
+
+        converged = (improved & (cost[active] - cost_new <= 1e-12 * cost[active] + 1e-300)) | (
+            ~improved & (damping[active] > 1e10)
+        )
+        updated = active[improved]
+        params[updated] = p_new[improved]
+        res[updated] = r_new[improved]
+        cost[updated] = cost_new[improved]
+        damping[active] = np.where(improved, damping[active] / 3.0, damping[active] * 2.0)
+        active = active[~converged]
+
+    return params
+
+
+def _quantile_spread(quantiles: np.ndarray, quantile_values: np.ndarray) -> np.ndarray:
+    """Standard deviation estimate of each row from its outermost quantiles
+    assuming a Gaussian distribution."""
+    z = norm.ppf(quantiles)
+    return np.maximum((quantile_values[:, -1] - quantile_values[:, 0]) / (z[-1] - z[0]), 1e-6)
+
+
+def _row_fit_result(dist, mode: str):
+    if mode == "ppf":
+        return dist.ppf
+    elif mode == "dist":
+        return dist
+    elif mode == "cdf":
+        return dist.cdf
+    else:
+        raise Exception("Invalid mode.")
+
+
+def quantile_fit_gaussian_rows(
+    quantiles: np.ndarray, quantile_values: np.ndarray, mode: Optional[str] = "ppf"
+) -> callable:
+    """
+    Row-wise version of :func:`quantile_fit_gaussian`, fitting one Gaussian
+    distribution per row of ``quantile_values`` at once. The least-squares
+    fit of the quantile function ``mu + sigma * norm.ppf(quantiles)`` is
+    linear in the parameters and is solved in closed form.
+
+    Parameters
+    ----------
+    quantiles : np.ndarray
+        quantiles (x values of quantile function) of shape ``(n_quantiles,)``,
+        shared by all rows
+    quantile_values : np.ndarray
+        quantile values (y values of quantile function) of shape
+        ``(n_rows, n_quantiles)``
+    mode : str
+        decides about kind of returned callable, possible values are:
+
+            - ``ppf``: quantile function (default)
+            - ``dist``: fitted Gaussian functions (scipy function)
+            - ``cdf``: CDF function
+
+    Returns
+    -------
+    callable
+        fitted Gaussian functions (see mode), with parameters of shape
+        ``(n_rows, 1)``, i.e., evaluating them on an array of shape ``(m,)``
+        gives an ``(n_rows, m)`` grid
+    """
+    quantile_values = np.asarray(quantile_values, dtype=np.float64)
+    z = norm.ppf(quantiles)
+    z_centered = z - z.mean()
+    sigma = quantile_values @ z_centered / (z_centered @ z_centered)
+    mu = quantile_values.mean(axis=1) - sigma * z.mean()
+    return _row_fit_result(norm(mu[:, np.newaxis], sigma[:, np.newaxis]), mode)
+
+
+def quantile_fit_gamma_rows(
+    quantiles: np.ndarray, quantile_values: np.ndarray, mode: Optional[str] = "ppf"
+) -> callable:
+    """
+    Row-wise version of :func:`quantile_fit_gamma`, fitting one Gamma
+    distribution per row of ``quantile_values`` at once by a batched
+    Levenberg-Marquardt fit of the quantile function (in the logarithms of
+    the parameters), starting from the moments of a Gaussian approximation.
+
+    Parameters
+    ----------
+    quantiles : np.ndarray
+        quantiles (x values of quantile function) of shape ``(n_quantiles,)``,
+        shared by all rows
+    quantile_values : np.ndarray
+        quantile values (y values of quantile function) of shape
+        ``(n_rows, n_quantiles)``
+    mode : str
+        decides about kind of returned callable, possible values are:
+
+            - ``ppf``: quantile function (default)
+            - ``dist``: fitted Gamma functions (scipy function)
+            - ``cdf``: CDF function
+
+    Returns
+    -------
+    callable
+        fitted Gamma functions (see mode), with parameters of shape
+        ``(n_rows, 1)``, i.e., evaluating them on an array of shape ``(m,)``
+        gives an ``(n_rows, m)`` grid
+    """
+    quantile_values = np.asarray(quantile_values, dtype=np.float64)
+
+    def residuals(params, y):
+        return gamma.ppf(quantiles, np.exp(params[:, :1]), scale=np.exp(-params[:, 1:])) - y
+
+    mean = np.maximum(quantile_values.mean(axis=1), 1e-6)
+    var = _quantile_spread(quantiles, quantile_values) ** 2
+    params = np.column_stack([np.log(mean * mean / var), np.log(mean / var)])
+    params = _fit_rows_least_squares(residuals, params, quantile_values)
+
+    alpha = np.exp(params[:, :1])
+    beta = np.exp(params[:, 1:])
+    return _row_fit_result(gamma(alpha, scale=1 / beta), mode)
+
+
+def quantile_fit_nbinom_rows(
+    quantiles: np.ndarray, quantile_values: np.ndarray, mode: Optional[str] = "ppf"
+) -> callable:
+    """
+    Row-wise version of :func:`quantile_fit_nbinom`, fitting one negative
+    binomial distribution per row of ``quantile_values`` at once by a batched
+    Levenberg-Marquardt fit of the CDF at the quantile values. The fit
+    parameters are the logarithms of the mean and of the excess of the
+    variance over the mean.
+
+    Parameters
+    ----------
+    quantiles : np.ndarray
+        quantiles (x values of quantile function) of shape ``(n_quantiles,)``,
+        shared by all rows
+    quantile_values : np.ndarray
+        quantile values (y values of quantile function) of shape
+        ``(n_rows, n_quantiles)``
+    mode : str
+        decides about kind of returned callable, possible values are:
+
+            - ``ppf``: quantile function (default)
+            - ``dist``: fitted negative binomial functions (scipy function)
+            - ``cdf``: CDF function
+
+    Returns
+    -------
+    callable
+        fitted negative binomial functions (see mode), with parameters of
+        shape ``(n_rows, 1)``, i.e., evaluating them on an array of shape
+        ``(m,)`` gives an ``(n_rows, m)`` grid
+    """
+    quantile_values = np.asarray(quantile_values, dtype=np.float64)
+
+    def n_p(params):
+        mu = np.exp(params[:, :1])
+        excess = np.exp(params[:, 1:])
+        return mu * mu / excess, mu / (mu + excess)
+
+    def residuals(params, y):
+        n, p = n_p(params)
+        return nbinom.cdf(y, n, p) - quantiles
+
+    mean = np.maximum(quantile_values.mean(axis=1), 0.1)
+    excess = np.maximum(_quantile_spread(quantiles, quantile_values) ** 2 - mean, 0.1 * mean)
+    params = np.column_stack([np.log(mean), np.log(excess)])
+    params = _fit_rows_least_squares(residuals, params, quantile_values)
+
+    n, p = n_p(params)
+    return _row_fit_result(nbinom(n, p), mode)
+
+
+def quantile_fit_spline_rows(quantiles: np.ndarray, quantile_values: np.ndarray) -> callable:
+    """
+    Row-wise version of :func:`quantile_fit_spline`, interpolating all rows
+    of ``quantile_values`` with a single vector-valued spline. The
+    interpolating cubic splines only depend on the quantiles shared by all
+    rows, so one linear system is solved for all rows.
+
+    Parameters
+    ----------
+    quantiles : np.ndarray
+        quantiles (x values of quantile function) of shape ``(n_quantiles,)``,
+        shared by all rows
+    quantile_values : np.ndarray
+        quantile values (y values of quantile function) of shape
+        ``(n_rows, n_quantiles)``
+
+    Returns
+    -------
+    callable
+        splines fitted to quantile functions, evaluating them on an array of
+        shape ``(m,)`` gives an ``(n_rows, m)`` grid
+    """
+    quantiles = np.asarray(quantiles, dtype=np.float64)
+    # same knots as InterpolatedUnivariateSpline with bbox=[0, 1]
+    knots = np.r_[[0.0] * 4, quantiles[2:-2], [1.0] * 4]
+    spl = make_interp_spline(quantiles, quantile_values, k=3, t=knots, axis=1)
+
+    def ppf(x):
+        # constant extrapolation outside of [0, 1] like ext=3
+        return spl(np.clip(x, 0.0, 1.0))
+
+    return ppf
@@ -120,6 +120,7 @@ class CBNBinomRegressor(CBBaseRegressor):
         a=1.0,
         c=0.0,
         aggregate=True,
+        minimal_feature_factor_change=None,
     ):
         CyclicBoostingBase.__init__(
             self,
@@ -135,6 +136,7 @@ class CBNBinomRegressor(CBBaseRegressor):
             smoother_choice=smoother_choice,
             output_column=output_column,
             learn_rate=learn_rate,
+            minimal_feature_factor_change=minimal_feature_factor_change,
             aggregate=aggregate,
         )
         self.a = a  # TODO: a and c as variable names are too vague
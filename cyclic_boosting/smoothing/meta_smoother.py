@@ -116,6 +116,25 @@ class NormalizationSmoother(AbstractBinSmoother):
         smoothed_y = self.smoother.predict(X_for_smoother)
         return smoothed_y + self.norm_
 
+    def _smooth_groups(self, X_for_smoother, y, groups, n_groups):
+        """Values of clones fitted on each group of bins, for all groups at
+        once (used by :class:`~cyclic_boosting.smoothing.multidim.GroupBySmoother`).
+        None if the subsmoother does not support this."""
+        smooth_groups = getattr(self.smoother, "_smooth_groups", None)
+        if smooth_groups is None:
+            return None
+        w = X_for_smoother[:, -2]
+        weightsum = np.bincount(groups, weights=w, minlength=n_groups)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            norm = np.where(weightsum > 0, np.bincount(groups, weights=y * w, minlength=n_groups) / weightsum, 0.0)
+        norm[~np.isfinite(norm)] = 0.0
+        norm = norm[groups]
+
+        smoothed_y = smooth_groups(X_for_smoother, y - norm, groups, n_groups)
+        if smoothed_y is None:
+            return None
+        return smoothed_y + norm
+
 
 def _selected_events_interpolating(X_for_smoother, ndim, nbins):
     selected_events = np.min(X_for_smoother[:, :ndim], axis=1) < 0.0
@@ -188,6 +207,26 @@ class RegressionTypeSmoother(AbstractBinSmoother, SetNBinsMixin):
         smoothed_y = self.smoother.predict(X_for_smoother)
         return self.apply_cut(X_for_smoother, smoothed_y)
 
+    def _apply_cut_groups(self, X_for_smoother, smoothed_y):
+        """:meth:`apply_cut` at the bins of the fit. These are within the
+        bin boundaries, so only bins without weight are cut, if the
+        regression type is discontinuous."""
+        if not_interpolating(self.reg_type):
+            return np.where(X_for_smoother[:, -2] == 0.0, np.nan, smoothed_y)
+        return smoothed_y
+
+    def _smooth_groups(self, X_for_smoother, y, groups, n_groups):
+        """Values of clones fitted on each group of bins, for all groups at
+        once (used by :class:`~cyclic_boosting.smoothing.multidim.GroupBySmoother`).
+        None if the subsmoother does not support this."""
+        smooth_groups = getattr(self.smoother, "_smooth_groups", None)
+        if smooth_groups is None:
+            return None
+        smoothed_y = smooth_groups(X_for_smoother, y, groups, n_groups)
+        if smoothed_y is None:
+            return None
+        return self._apply_cut_groups(X_for_smoother, smoothed_y)
+
 
 class NormalizationRegressionTypeSmoother(NormalizationSmoother, RegressionTypeSmoother):
     """Meta-smoother to constrain all values according to their
@@ -226,6 +265,12 @@ class NormalizationRegressionTypeSmoother(NormalizationSmoother, RegressionTypeS
         smoothed_y = self.smoother.predict(X_for_smoother) + self.norm_
         return self.apply_cut(X_for_smoother, smoothed_y)
 
+    def _smooth_groups(self, X_for_smoother, y, groups, n_groups):
+        smoothed_y = NormalizationSmoother._smooth_groups(self, X_for_smoother, y, groups, n_groups)
+        if smoothed_y is None:
+            return None
+        return self._apply_cut_groups(X_for_smoother, smoothed_y)
+
 
 class SectionSmoother(AbstractBinSmoother):
     """Meta-smoother that splits the fitted data into two parts which are
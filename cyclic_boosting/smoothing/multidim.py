@@ -4,7 +4,6 @@ Multidimensional smoothers
 from __future__ import absolute_import, division, print_function
 
 import numpy as np
-import pandas as pd
 from scipy import sparse
 
 from cyclic_boosting import utils
@@ -274,20 +273,11 @@ class PriorExpectationMetaSmoother(AbstractBinSmoother, PredictingBinValueMixin)
         return self
 
 
-def _fit_est_on_group(X, n_group_columns, est):
-    est = utils.clone(est)
-    est.fit(X.iloc[:, n_group_columns:-1].values, X.iloc[:, -1].values)
-    return est
-
-
-def _predict_groups(x, gb, n_group_columns):
-    try:
-        est = gb.loc(axis=0)[x.name]
-    except KeyError:
-        p = np.nan
-    else:
-        p = est.predict(np.c_[x.values])
-    return p
+def _group_keys(X, n_group_columns):
+    """Rows of the first ``n_group_columns`` columns of ``X`` as records
+    that can be sorted and compared with :mod:`numpy` functions."""
+    keys = np.ascontiguousarray(X[:, :n_group_columns], dtype=np.float64)
+    return keys.view([("", np.float64)] * n_group_columns).ravel()
 
 
 class GroupBySmoother(AbstractBinSmoother):
@@ -295,6 +285,15 @@ class GroupBySmoother(AbstractBinSmoother):
     of a k dimensional feature and smoothes a clone of the specified 1-dimensional
     smoother on each group.
 
+    The rows are sorted by group once and the clones are fitted on contiguous
+    slices. If the 1-dimensional smoother supports it (like
+    :class:`~cyclic_boosting.smoothing.onedim.WeightedMeanSmoother` and
+    :class:`~cyclic_boosting.smoothing.onedim.BinValuesSmoother`, also
+    wrapped in the meta-smoothers of
+    :mod:`~cyclic_boosting.smoothing.meta_smoother`) and each group contains
+    all its bins ``0, 1, ...`` in order, as for the profiles in cyclic
+    boosting, all groups are smoothed in one call and no clones are created.
+
     Parameters
     ----------
 
@@ -307,6 +306,19 @@ class GroupBySmoother(AbstractBinSmoother):
     index_weight_col: int
        Index of weight column. If specified, rows with zero weight are removed.
        If `None`, no rows are dropped.
+
+    **Estimated parameters**
+
+    :param `group_keys_`: sorted values of the group columns of all groups
+    :type `group_keys_`: :class:`numpy.ndarray` (structured, shape `(n_groups,)`)
+
+    :param `smoothed_y_`: smoothed values of the bins of each group,
+        ``nan`` beyond the last bin of the group, if all groups are smoothed in
+        one call, else None
+    :type `smoothed_y_`: :class:`numpy.ndarray` (float64, shape `(n_groups, n_bins)`)
+
+    :param `estimators_`: fitted clones of ``est`` for each group, else None
+    :type `estimators_`: list
     """
 
     @property
@@ -319,24 +331,79 @@ class GroupBySmoother(AbstractBinSmoother):
         self.index_weight_col = index_weight_col
 
     def fit(self, X_for_smoother, y):
+        X_for_smoother = np.asarray(X_for_smoother, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n_group_columns = self.n_group_columns
+
+        # rows with missing group values are not in any group
+        is_valid = np.all(np.isfinite(X_for_smoother[:, :n_group_columns]), axis=1)
+        if not np.all(is_valid):
+            X_for_smoother = X_for_smoother[is_valid]
+            y = y[is_valid]
+
+        group_keys, groups = np.unique(_group_keys(X_for_smoother, n_group_columns), return_inverse=True)
         if self.index_weight_col is not None:
-            Xp = pd.DataFrame(X_for_smoother)
-            gb_cols = list(range(self.n_dim - 1))
-            gb = Xp.groupby(gb_cols)[self.n_dim].sum()
-            Xp = Xp[gb_cols].merge(gb.reset_index(), how="left", on=gb_cols)
-            mask = Xp[self.n_dim].values > 0
+            weightsum = np.bincount(groups, weights=X_for_smoother[:, self.n_dim], minlength=len(group_keys))
+            is_used = weightsum > 0
+            mask = is_used[groups]
             X_for_smoother = X_for_smoother[mask]
             y = y[mask]
-        X = pd.DataFrame(np.c_[X_for_smoother, y])
-        self.group_cols = list(range(self.n_group_columns))
-        self.gb = X.groupby(self.group_cols, sort=False).apply(_fit_est_on_group, self.n_group_columns, self.est)
+            group_keys = group_keys[is_used]
+            groups = (np.cumsum(is_used) - 1)[groups[mask]]
+        n_groups = len(group_keys)
+
+        order = np.argsort(groups, kind="stable")
+        X_sorted = X_for_smoother[order, n_group_columns:]
+        y_sorted = y[order]
+        groups_sorted = groups[order]
+        counts = np.bincount(groups_sorted, minlength=n_groups)
+        starts = np.cumsum(counts) - counts
+        positions = np.arange(len(groups_sorted)) - starts[groups_sorted]
+
+        self.group_keys_ = group_keys
+        self.smoothed_y_ = None
+        self.estimators_ = None
+
+        smoothed_y = None
+        smooth_groups = getattr(self.est, "_smooth_groups", None)
+        if smooth_groups is not None and np.array_equal(X_sorted[:, 0], positions):
+            smoothed_y = smooth_groups(X_sorted, y_sorted, groups_sorted, n_groups)
+        if smoothed_y is not None:
+            self.smoothed_y_ = utils.nans((n_groups, counts.max() if n_groups else 0))
+            self.smoothed_y_[groups_sorted, positions] = smoothed_y
+        else:
+            self.estimators_ = []
+            for start, count in zip(starts, counts):
+                est = utils.clone(self.est)
+                est.fit(X_sorted[start : start + count], y_sorted[start : start + count])
+                self.estimators_.append(est)
+        return self
 
     def predict(self, X):
-        X = pd.DataFrame(X)
-        pred = X.groupby(self.group_cols, sort=False)[X.columns[-1]].transform(
-            _predict_groups, self.gb, self.n_group_columns
-        )
-        return pred.values
+        X = np.asarray(X, dtype=np.float64)
+        pred = utils.nans(len(X))
+        n_groups = len(self.group_keys_)
+        if n_groups == 0 or len(X) == 0:
+            return pred
+
+        keys = _group_keys(X, self.n_group_columns)
+        groups = np.minimum(np.searchsorted(self.group_keys_, keys), n_groups - 1)
+        is_known = self.group_keys_[groups] == keys
+
+        if self.smoothed_y_ is not None:
+            binnos = X[:, -1]
+            binnos_round = np.asarray(np.rint(binnos), dtype=np.int64)
+            is_valid = is_known & np.isfinite(binnos) & (binnos >= 0) & (binnos_round < self.smoothed_y_.shape[1])
+            pred[is_valid] = self.smoothed_y_[groups[is_valid], binnos_round[is_valid]]
+            return pred
+
+        rows = np.flatnonzero(is_known)
+        rows = rows[np.argsort(groups[rows], kind="stable")]
+        boundaries = np.flatnonzero(np.diff(groups[rows])) + 1
+        for chunk in np.split(rows, boundaries):
+            if len(chunk):
+                pred[chunk] = self.estimators_[groups[chunk[0]]].predict(np.c_[X[chunk, -1]])
+        return pred
 
 
 class GroupBySmootherCB(GroupBySmoother):
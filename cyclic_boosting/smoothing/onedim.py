@@ -15,8 +15,11 @@ from sklearn.linear_model import LassoLarsIC
 from cyclic_boosting import utils
 from cyclic_boosting.smoothing.base import AbstractBinSmoother
 from cyclic_boosting.smoothing.orthofit import (
+    apply_orthogonal_poly_basis,
     cy_apply_orthogonal_poly_fit_equidistant,
-    cy_orthogonal_poly_fit_equidistant,
+    cy_orthogonal_poly_fit_from_basis,
+    orthogonal_poly_basis_,
+    orthogonal_poly_weights,
 )
 
 
@@ -88,6 +91,11 @@ class BinValuesSmoother(AbstractBinSmoother, PredictingBinValueMixin):
         self.smoothed_y_ = y
         return self
 
+    def _smooth_groups(self, X_for_smoother, y, groups, n_groups):
+        """Values of clones fitted on each group of bins, for all groups at
+        once (used by :class:`~cyclic_boosting.smoothing.multidim.GroupBySmoother`)."""
+        return np.asarray(y, dtype=np.float64)
+
     def __getstate__(self):
         """Return state values to be pickled."""
         state = self.__dict__.copy()
@@ -158,6 +166,15 @@ class RegularizeToPriorExpectationSmoother(AbstractBinSmoother, PredictingBinVal
         )
         return self
 
+    def _smooth_groups(self, X_for_smoother, y, groups, n_groups):
+        """Values of clones fitted on each group of bins, for all groups at
+        once (used by :class:`~cyclic_boosting.smoothing.multidim.GroupBySmoother`)."""
+        if np.ndim(self.prior_expectation) > 0:
+            return None
+        return utils.regularize_to_prior_expectation(
+            y, X_for_smoother[:, 2], self.prior_expectation, threshold=self.threshold
+        )
+
 
 class RegularizeToOneSmoother(RegularizeToPriorExpectationSmoother):
     """Smoother for one-dimensional bins regularizing values with uncertainties
@@ -219,6 +236,13 @@ class WeightedMeanSmoother(AbstractBinSmoother, PredictingBinValueMixin):
     def fit(self, X_for_smoother, y):
         self.smoothed_y_ = utils.regularize_to_error_weighted_mean(y, X_for_smoother[:, 2], self.prior_prediction)
 
+    def _smooth_groups(self, X_for_smoother, y, groups, n_groups):
+        """Values of clones fitted on each group of bins, for all groups at
+        once (used by :class:`~cyclic_boosting.smoothing.multidim.GroupBySmoother`)."""
+        return utils.regularize_to_error_weighted_mean_groups(
+            y, X_for_smoother[:, 2], groups, n_groups, self.prior_prediction
+        )
+
 
 class WeightedMeanSmootherNeighbors(AbstractBinSmoother, PredictingBinValueMixin):
     """
@@ -238,17 +262,33 @@ class OrthogonalPolynomialSmoother(AbstractBinSmoother):
     """A polynomial fit that uses orthogonal polynomials as basis functions.
 
     Ansatz, see Blobel (http://www.desy.de/~blobel/eBuch.pdf)
+
+    The orthogonal polynomials only depend on the bin centers and the
+    uncertainties, not on the bin values. They are cached between fits and
+    reused as long as both are unchanged, which is checked by an exact
+    comparison, so the results are the same as without the cache. The
+    prediction at the bin centers of the fit is taken from the cached
+    polynomials as well.
     """
 
+    def _get_basis(self, x, y_errors):
+        cache = getattr(self, "_basis_cache", None)
+        if cache is not None and np.array_equal(cache[0], x) and np.array_equal(cache[1], y_errors):
+            return cache[2:]
+        weights = orthogonal_poly_weights(y_errors)
+        basis, recurrence = orthogonal_poly_basis_(x, weights)
+        self._basis_cache = (x, y_errors, weights, basis, recurrence)
+        return weights, basis, recurrence
+
     def fit(self, X_for_smoother, y):
-        x = np.ascontiguousarray(X_for_smoother[:, 0], dtype=np.float64)
+        x = np.array(X_for_smoother[:, 0], dtype=np.float64)
+        y_errors = np.array(X_for_smoother[:, 2], dtype=np.float64)
 
         self.minimal_x = np.nanmin(x)
         self.maximal_x = np.nanmax(x)
-        self.pp_, self.n_degrees_ = cy_orthogonal_poly_fit_equidistant(
-            x,
-            np.ascontiguousarray(y, dtype=np.float64),
-            np.ascontiguousarray(X_for_smoother[:, 2], dtype=np.float64),
+        weights, basis, recurrence = self._get_basis(x, y_errors)
+        self.pp_, self.n_degrees_ = cy_orthogonal_poly_fit_from_basis(
+            basis, recurrence, np.ascontiguousarray(y, dtype=np.float64), weights
         )
 
         return self
@@ -258,6 +298,9 @@ class OrthogonalPolynomialSmoother(AbstractBinSmoother):
         if not hasattr(self, "pp_"):
             raise ValueError("The {} has not been fitted!".format(self.__class__.__name__))
         x = np.ascontiguousarray(X[:, 0], dtype=np.float64)
+        cache = getattr(self, "_basis_cache", None)
+        if cache is not None and np.array_equal(cache[0], x):
+            return apply_orthogonal_poly_basis(cache[3], self.pp_, self.n_degrees_)
         x[x < self.minimal_x] = self.minimal_x
         x[x > self.maximal_x] = self.maximal_x
         y = cy_apply_orthogonal_poly_fit_equidistant(x, self.pp_, self.n_degrees_)
@@ -299,6 +342,37 @@ def _seasonality_third_order(x, c_const, c_sin_1x, c_cos_1x, c_sin_2x, c_cos_2x,
     )
 
 
+#: Orders of the built-in fit functions of the :class:`SeasonalSmoother`,
+#: which are linear in their parameters
+_SEASONALITY_ORDERS = {
+    _seasonality_first_order: 1,
+    _seasonality_second_order: 2,
+    _seasonality_third_order: 3,
+}
+
+_seasonal_design_matrices = {}
+
+
+def _seasonal_design_matrix(x, order):
+    """Design matrix of the built-in seasonal fit function of order
+    ``order`` at ``x``, with the columns ``1, sin(x), cos(x), ..., sin(order
+    * x), cos(order * x)`` in the order of the fit parameters.
+
+    The matrix of the last ``x`` is cached per order and number of bins, as
+    the smoother is fitted on the same bins in every iteration.
+    """
+    key = (order, len(x))
+    cached = _seasonal_design_matrices.get(key)
+    if cached is not None and np.array_equal(cached[0], x):
+        return cached[1]
+    columns = [np.ones_like(x)]
+    for k in range(1, order + 1):
+        columns += [np.sin(k * x), np.cos(k * x)]
+    design_matrix = np.column_stack(columns)
+    _seasonal_design_matrices[key] = (x.copy(), design_matrix)
+    return design_matrix
+
+
 class SeasonalSmoother(AbstractBinSmoother):
     """Seasonal Smoother of one-dimensional bins that applies an sinus/cosinus
     fit to smooth the bin values of y (as received from the profile function in
@@ -313,6 +387,11 @@ class SeasonalSmoother(AbstractBinSmoother):
     Instead of specifying an order, a custom fit-function can be supplied via
     the ``custom_fit_function`` argument.
 
+    The built-in fit functions are linear in their parameters, so they are
+    fitted by a weighted linear least-squares solution with a cached design
+    matrix. Only a ``custom_fit_function`` is fitted with
+    :func:`scipy.optimize.curve_fit`.
+
     Parameters
     ----------
     offset_tozero : bool
@@ -375,8 +454,14 @@ class SeasonalSmoother(AbstractBinSmoother):
     def fit(self, X_for_smoother, y):
         self.frequency_ = 1.0 / len(X_for_smoother)
         xdata = self.transform_X(X_for_smoother)
+        order = _SEASONALITY_ORDERS.get(self.fit_function)
         try:
-            self.par_, _ = scipy.optimize.curve_fit(self.fit_function, xdata=xdata, ydata=y, sigma=X_for_smoother[:, 2])
+            if order is None:
+                self.par_, _ = scipy.optimize.curve_fit(
+                    self.fit_function, xdata=xdata, ydata=y, sigma=X_for_smoother[:, 2]
+                )
+            else:
+                self.par_ = self._fit_linear(xdata, y, X_for_smoother[:, 2], order)
             if self.offset_tozero:
                 self.par_[0] = 0.0
         except TypeError:
@@ -387,10 +472,30 @@ class SeasonalSmoother(AbstractBinSmoother):
 
         return self
 
+    @staticmethod
+    def _fit_linear(xdata, y, sigma, order):
+        """Weighted least-squares parameters of the built-in fit function,
+        the same solution as the one of :func:`scipy.optimize.curve_fit`."""
+        y = np.asarray_chkfinite(y, dtype=np.float64)
+        design_matrix = _seasonal_design_matrix(xdata, order)
+        if len(y) < design_matrix.shape[1]:
+            # curve_fit raises a TypeError for less data points than parameters
+            raise TypeError(
+                "Improper input: number of parameters {} must not exceed number of data points {}".format(
+                    design_matrix.shape[1], len(y)
+                )
+            )
+        sigma = np.asarray(sigma, dtype=np.float64)
+        par, _, _, _ = np.linalg.lstsq(design_matrix / sigma[:, None], y / sigma, rcond=None)
+        return par
+
     def predict(self, X):
         if self.converged or self.converged is None:
             if not hasattr(self, "par_"):
                 raise ValueError("The {} has not been fitted!".format(self.__class__.__name__))
+            order = _SEASONALITY_ORDERS.get(self.fit_function)
+            if order is not None:
+                return _seasonal_design_matrix(self.transform_X(X), order).dot(self.par_)
             return self.fit_function(self.transform_X(X), *self.par_)
         else:
             return np.ones(len(X), dtype=np.float64) * self.fallback_value
@@ -9,13 +9,29 @@ N_PARAMETERS = 21
 
 @nb.njit()
 def cy_orthogonal_poly_fit_equidistant(binnos: nb.float64[:], y_values: nb.float64[:], y_errors: nb.float64[:]):
+    weights = orthogonal_poly_weights(y_errors)
+    basis, recurrence = orthogonal_poly_basis_(binnos, weights)
+    return cy_orthogonal_poly_fit_from_basis(basis, recurrence, y_values, weights)
+
+
+@nb.njit()
+def orthogonal_poly_weights(y_errors: nb.float64[:]):
     weights = np.empty(y_errors.shape[0])
-    parameters = np.empty((N_PARAMETERS, N_COEFFICIENTS))
 
     for j in range(y_errors.shape[0]):
         weights[j] = 1.0 / (y_errors[j] * y_errors[j])
+    return weights
 
-    n_degrees = fit_orthogonal_poly_(binnos, y_values, weights, parameters)
+
+@nb.njit()
+def cy_orthogonal_poly_fit_from_basis(
+    basis: nb.float64[:, :], recurrence: nb.float64[:, :], y_values: nb.float64[:], weights: nb.float64[:]
+):
+    """Same as :func:`cy_orthogonal_poly_fit_equidistant` for a basis
+    precomputed with :func:`orthogonal_poly_basis_`."""
+    parameters = np.empty((N_PARAMETERS, N_COEFFICIENTS))
+
+    n_degrees = project_on_orthogonal_poly_(basis, recurrence, y_values, weights, parameters)
 
     n_significant_parameters = significant_parameters_(parameters, n_degrees, len(y_values))
     n_degrees = reduce_to_signifcant_parameters(n_significant_parameters, parameters, n_degrees, len(y_values))
@@ -29,65 +45,107 @@ def fit_orthogonal_poly_(
     weights: nb.float64[:],
     parameters: nb.float64[:],
 ) -> nb.float64:
+    basis, recurrence = orthogonal_poly_basis_(x, weights)
+    return project_on_orthogonal_poly_(basis, recurrence, y, weights, parameters)
+
+
+@nb.njit()
+def orthogonal_poly_basis_(x: nb.float64[:], weights: nb.float64[:]):
+    """Orthonormal polynomials evaluated at the supporting points ``x`` for
+    the scalar product weighted with ``weights``.
+
+    Returns the basis with shape ``(n_degrees, len(x))`` and the coefficients
+    ``alpha``, ``beta``, ``gamma`` of the three-term recurrence
+    ``p_k = ((x - alpha_k) * p_(k-1) - beta_k * p_(k-2)) * gamma_k`` with
+    shape ``(n_degrees, 3)``. Both only depend on ``x`` and ``weights``, not
+    on the values to be fitted.
+    """
     n_supporting_points = x.shape[0]
-    alpha = 0.0
-    beta = 0.0
-    gamma = 0.0
-    delta = 0.0
-    scratch = np.empty((2, x.shape[0]))
+    n_degrees = min(N_PARAMETERS, n_supporting_points)
+    basis = np.empty((n_degrees, n_supporting_points))
+    recurrence = np.zeros((n_degrees, 3))
+    zeros = np.zeros(n_supporting_points)
 
+    gamma = 0.0
     for j in range(n_supporting_points):
-        delta += weights[j] * y[j]
         gamma += weights[j]
 
-    n_degrees = min(N_PARAMETERS, n_supporting_points)
-
     if gamma != 0.0:
         gamma = 1.0 / np.sqrt(gamma)
 
-    delta *= gamma
-
-    sum_squared = 0.0
-
     for k in range(n_supporting_points):
-        tmp = y[k] - gamma * delta
-        sum_squared += weights[k] * tmp * tmp
-        scratch[0, k] = gamma
-        scratch[1, k] = 0.0
-
-    parameters[0, 0] = alpha
-    parameters[0, 1] = beta
-    parameters[0, 2] = gamma
-    parameters[0, 3] = delta
-    parameters[0, 4] = sum_squared
+        basis[0, k] = gamma
+    recurrence[0, 2] = gamma
 
     # recursive loop for higher terms
-    ii = 1
     for k in range(1, n_degrees):
-        ii = 3 - ii
+        previous = basis[k - 1]
+        before_previous = basis[k - 2] if k >= 2 else zeros
         alpha = 0.0
         beta = 0.0
         for j in range(0, n_supporting_points):
-            alpha += weights[j] * x[j] * scratch[3 - ii - 1, j] * scratch[3 - ii - 1, j]
-            beta += weights[j] * x[j] * scratch[ii - 1, j] * scratch[3 - ii - 1, j]
+            alpha += weights[j] * x[j] * previous[j] * previous[j]
+            beta += weights[j] * x[j] * before_previous[j] * previous[j]
 
         gamma = 0.0
         for j in range(0, n_supporting_points):
-            scratch[ii - 1, j] = (x[j] - alpha) * scratch[3 - ii - 1, j] - beta * scratch[ii - 1, j]
-            gamma += weights[j] * scratch[ii - 1, j] * scratch[ii - 1, j]
+            basis[k, j] = (x[j] - alpha) * previous[j] - beta * before_previous[j]
+            gamma += weights[j] * basis[k, j] * basis[k, j]
 
         if gamma != 0.0:
             gamma = 1.0 / np.sqrt(gamma)
 
+        for j in range(0, n_supporting_points):
+            basis[k, j] *= gamma
+
+        recurrence[k, 0] = alpha
+        recurrence[k, 1] = beta
+        recurrence[k, 2] = gamma
+    return basis, recurrence
+
+
+@nb.njit()
+def project_on_orthogonal_poly_(
+    basis: nb.float64[:, :],
+    recurrence: nb.float64[:, :],
+    y: nb.float64[:],
+    weights: nb.float64[:],
+    parameters: nb.float64[:, :],
+) -> nb.float64:
+    """Fill ``parameters`` with the recurrence coefficients, the
+    coefficients ``delta`` of the fit of ``y`` in the orthonormal ``basis``
+    and the remaining sums of squares, see :func:`orthogonal_poly_basis_`."""
+    n_supporting_points = y.shape[0]
+    n_degrees = basis.shape[0]
+    gamma = recurrence[0, 2]
+
+    delta = 0.0
+    for j in range(n_supporting_points):
+        delta += weights[j] * y[j]
+
+    delta *= gamma
+
+    sum_squared = 0.0
+
+    for k in range(n_supporting_points):
+        tmp = y[k] - gamma * delta
+        sum_squared += weights[k] * tmp * tmp
+
+    parameters[0, 0] = 0.0
+    parameters[0, 1] = 0.0
+    parameters[0, 2] = gamma
+    parameters[0, 3] = delta
+    parameters[0, 4] = sum_squared
+
+    for k in range(1, n_degrees):
         delta = 0.0
         for j in range(0, n_supporting_points):
-            scratch[ii - 1, j] *= gamma
-            delta += weights[j] * scratch[ii - 1, j] * y[j]
+            delta += weights[j] * basis[k, j] * y[j]
 
         sum_squared = max(0.0, sum_squared - delta * delta)
-        parameters[k, 0] = alpha
-        parameters[k, 1] = beta
-        parameters[k, 2] = gamma
+        parameters[k, 0] = recurrence[k, 0]
+        parameters[k, 1] = recurrence[k, 1]
+        parameters[k, 2] = recurrence[k, 2]
         parameters[k, 3] = delta
         parameters[k, 4] = sum_squared
     parameters[0, 1] = 1.0
@@ -151,18 +209,42 @@ def reduce_to_signifcant_parameters(n_signi_par, parameters, n_degrees, n_suppor
 def cy_apply_orthogonal_poly_fit_equidistant(binnos, parameters, n_degrees):
     n_supporting_points = binnos.shape[0]
     result = np.empty(n_supporting_points)
-    values = np.empty(2)
+    previous = np.empty(n_supporting_points)
+    before_previous = np.zeros(n_supporting_points)
+
+    # evaluate the recurrence for all points at once, degree by degree
+    y_estimate = parameters[0, 2] * parameters[0, 3]
+    for i in range(n_supporting_points):
+        previous[i] = parameters[0, 2]
+        result[i] = y_estimate
+
+    for k in range(1, n_degrees):
+        alpha = parameters[k, 0]
+        beta = parameters[k, 1]
+        gamma = parameters[k, 2]
+        delta = parameters[k, 3]
+        for i in range(n_supporting_points):
+            value = ((binnos[i] - alpha) * previous[i] - beta * before_previous[i]) * gamma
+            before_previous[i] = previous[i]
+            previous[i] = value
+            result[i] += delta * value
+    return result
+
+
+@nb.njit()
+def apply_orthogonal_poly_basis(basis, parameters, n_degrees):
+    """Same as :func:`cy_apply_orthogonal_poly_fit_equidistant` at the
+    supporting points of a basis precomputed with
+    :func:`orthogonal_poly_basis_`."""
+    n_supporting_points = basis.shape[1]
+    result = np.empty(n_supporting_points)
 
+    y_estimate = parameters[0, 2] * parameters[0, 3]
     for i in range(n_supporting_points):
-        values[0] = parameters[0, 2]
-        values[1] = 0.0
-        y_estimate = parameters[0, 2] * parameters[0, 3]
-        j = 1
-        for k in range(1, n_degrees):
-            j = 3 - j
-            values[j - 1] = (
-                (binnos[i] - parameters[k, 0]) * values[2 - j] - parameters[k, 1] * values[j - 1]
-            ) * parameters[k, 2]
-            y_estimate += parameters[k, 3] * values[j - 1]
         result[i] = y_estimate
+
+    for k in range(1, n_degrees):
+        delta = parameters[k, 3]
+        for i in range(n_supporting_points):
+            result[i] += delta * basis[k, i]
     return result
@@ -1,6 +1,5 @@
 import copy
 import logging
-import warnings
 
 import decorator
 import numba as nb
@@ -12,6 +11,11 @@ from typing import Iterable, List, Optional
 
 from dataclasses import dataclass
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 _logger = logging.getLogger(__name__)
 
 
@@ -78,17 +82,20 @@ def not_seen_events(x, wx, n_bins):
 
 def get_X_column(X, column, array_for_1_dim=True):
     """
-    Picks columns from :class:`pandas.DataFrame` or :class:`numpy.ndarray`.
+    Picks columns from :class:`pandas.DataFrame`, :class:`numpy.ndarray`,
+    Arrow :class:`pyarrow.Table`/:class:`pyarrow.RecordBatch` or
+    :class:`~cyclic_boosting.binning.BinnedDataset`.
 
     Parameters
     ----------
-    X: :class:`pandas.DataFrame` or :class:`numpy.ndarray`
+    X: :class:`pandas.DataFrame`, :class:`numpy.ndarray`, Arrow table or binned dataset
         Data Source from which columns are picked.
     column:
-        The format depends on the type of X. For :class:`pandas.DataFrame` you
-        can give a string or a list/tuple of strings naming the columns. For
-        :class:`numpy.ndarray` an integer or a list/tuple of integers indexing
-        the columns.
+        The format depends on the type of X. For :class:`pandas.DataFrame`,
+        Arrow tables and binned datasets you can give a string or a
+        list/tuple of strings naming the columns. For
+        :class:`numpy.ndarray` an integer or a list/tuple of integers
+        indexing the columns.
     array_for_1_dim: bool
         In default mode (set to True) the return type for a one dimensional
         access is a np.ndarray with shape (n, ). If set to False it is a
@@ -104,10 +111,112 @@ def get_X_column(X, column, array_for_1_dim=True):
             column = column[0]
     if isinstance(X, pd.DataFrame):
         return X[column].values
+    elif is_arrow_table(X):
+        if isinstance(column, list):
+            return np.column_stack([arrow_column_to_numpy(get_arrow_column(X, col)) for col in column])
+        return arrow_column_to_numpy(get_arrow_column(X, column))
+    elif is_binned_dataset(X):
+        if isinstance(column, list):
+            if len(column) == 1:
+                return X[column[0]][:, None]
+            return np.column_stack([X[col] for col in column])
+        return X[column]
     else:
         return X[:, column]
 
 
+def is_binned_dataset(X):
+    """Check if ``X`` is a :class:`~cyclic_boosting.binning.BinnedDataset`."""
+    from cyclic_boosting.binning.binned_dataset import BinnedDataset
+
+    return isinstance(X, BinnedDataset)
+
+
+def get_target(X, y):
+    """The target ``y`` or, if it is None and ``X`` is a
+    :class:`~cyclic_boosting.binning.BinnedDataset`, the target stored in
+    ``X``."""
+    if y is None and is_binned_dataset(X):
+        return X.y
+    return y
+
+
+def is_arrow_table(X):
+    """Check if ``X`` is a :class:`pyarrow.Table` or a
+    :class:`pyarrow.RecordBatch`. Always False if :mod:`pyarrow` is not
+    installed."""
+    return pa is not None and isinstance(X, (pa.Table, pa.RecordBatch))
+
+
+def get_arrow_column(X, column):
+    """Column of an Arrow table or record batch as a single
+    :class:`pyarrow.Array`. Only chunked columns with more than one chunk are
+    copied."""
+    index = X.schema.get_field_index(column)
+    if index < 0:
+        raise KeyError(column)
+    arr = X.column(index)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.chunk(0) if arr.num_chunks == 1 else pa.concat_arrays(arr.chunks)
+    return arr
+
+
+def is_arrow_numeric(arr):
+    """Check if a :class:`pyarrow.Array` contains integers, floats or
+    booleans."""
+    return pa.types.is_integer(arr.type) or pa.types.is_floating(arr.type) or pa.types.is_boolean(arr.type)
+
+
+def arrow_values_and_validity(arr):
+    """Values of a numeric :class:`pyarrow.Array` as :class:`numpy.ndarray`
+    together with the validity of each value.
+
+    The values are a read-only zero-copy view of the Arrow data buffer
+    (except for booleans, which are bit-packed in Arrow). Missing values are
+    not replaced, so the values of invalid entries are arbitrary and have to
+    be masked with the validity, which is None if there are no missing
+    values.
+    """
+    if pa.types.is_boolean(arr.type):
+        values = arr.fill_null(False).to_numpy(zero_copy_only=False)
+    elif arr.null_count == 0:
+        return arr.to_numpy(zero_copy_only=True), None
+    else:
+        dtype = np.dtype(arr.type.to_pandas_dtype())
+        values = np.frombuffer(arr.buffers()[1], dtype=dtype, count=arr.offset + len(arr))[arr.offset :]
+    valid = None if arr.null_count == 0 else arr.is_valid().to_numpy(zero_copy_only=False)
+    return values, valid
+
+
+def arrow_column_to_numpy(arr):
+    """Convert a :class:`pyarrow.Array` to a :class:`numpy.ndarray` (or a
+    :class:`pandas.Categorical` for dictionary-encoded arrays), without
+    copying numeric arrays without missing values. Missing values of numeric
+    arrays become :obj:`numpy.nan`, the ones of other arrays None."""
+    if pa.types.is_dictionary(arr.type):
+        return pd.Categorical.from_codes(
+            arr.indices.fill_null(-1).to_numpy(zero_copy_only=False),
+            categories=arr.dictionary.to_pandas(),
+        )
+    if not is_arrow_numeric(arr):
+        return arr.to_numpy(zero_copy_only=False)
+    values, valid = arrow_values_and_validity(arr)
+    if valid is None:
+        return values
+    return np.where(valid, values, np.nan)
+
+
+def replace_arrow_columns(X, columns):
+    """Arrow table or record batch like ``X`` with the columns in the dict
+    ``columns`` replaced by the given :class:`numpy.ndarray`. The other
+    columns are not copied."""
+    names = X.schema.names
+    arrays = [pa.array(columns[name]) if name in columns else X.column(i) for i, name in enumerate(names)]
+    if isinstance(X, pa.RecordBatch):
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+    return pa.Table.from_arrays(arrays, names=names)
+
+
 def slice_finite_semi_positive(x):
     """
     Return slice of all finite and semi positive definite values of x
@@ -429,6 +538,187 @@ def digitize(x, bins):
     return bin_numbers
 
 
+@nb.njit(nogil=True)
+def _grouped_statistics(codes, y, weights, n_groups, quantiles, interpolate):
+    """Means, counts and quantiles of ``y`` for all groups given by
+    ``codes`` (``0 <= codes < n_groups``) after sorting only once.
+
+    With ``interpolate``, the weights are ignored and the quantiles are
+    linearly interpolated between the non-missing values as in
+    :meth:`pandas.Series.quantile`, and the counts are the number of rows.
+    Otherwise, the quantile is the smallest value for which the cumulative
+    weight reaches the quantile of the total weight, and the counts are the
+    sums of weights.
+    """
+    n = len(y)
+    n_quantiles = len(quantiles)
+
+    # sort by y (missing values last) and then stably by group
+    order = np.argsort(y, kind="mergesort")
+    starts = np.zeros(n_groups + 1, dtype=np.int64)
+    for i in range(n):
+        starts[codes[i] + 1] += 1
+    for g in range(n_groups):
+        starts[g + 1] += starts[g]
+    position = starts[:-1].copy()
+    sorted_y = np.empty(n, dtype=np.float64)
+    sorted_w = np.empty(n, dtype=np.float64)
+    for i in order:
+        g = codes[i]
+        sorted_y[position[g]] = y[i]
+        sorted_w[position[g]] = weights[i]
+        position[g] += 1
+
+    means = np.full(n_groups, np.nan)
+    counts = np.zeros(n_groups, dtype=np.float64)
+    result = np.full((n_groups, n_quantiles), np.nan)
+    for g in range(n_groups):
+        lo = starts[g]
+        hi = starts[g + 1]
+        if hi == lo:
+            continue
+        n_finite = 0
+        sum_y = 0.0
+        sum_w = 0.0
+        sum_wy = 0.0
+        for j in range(lo, hi):
+            sum_w += sorted_w[j]
+            if not np.isnan(sorted_y[j]):
+                n_finite += 1
+                sum_y += sorted_y[j]
+                sum_wy += sorted_w[j] * sorted_y[j]
+
+        if interpolate:
+            counts[g] = hi - lo
+            if n_finite == 0:
+                continue
+            means[g] = sum_y / n_finite
+            for k in range(n_quantiles):
+                pos = quantiles[k] * (n_finite - 1)
+                i = int(np.floor(pos))
+                value = sorted_y[lo + i]
+                if i + 1 < n_finite:
+                    value += (sorted_y[lo + i + 1] - value) * (pos - i)
+                result[g, k] = value
+        else:
+            counts[g] = sum_w
+            means[g] = sum_wy / sum_w
+            for k in range(n_quantiles):
+                cutoff = sum_w * quantiles[k]
+                value = sorted_y[lo]
+                cumsum = 0.0
+                for j in range(lo, hi):
+                    cumsum += sorted_w[j]
+                    if cumsum >= cutoff:
+                        value = sorted_y[j]
+                        break
+                result[g, k] = value
+
+    row_counts = starts[1:] - starts[:-1]
+    return means, counts, result, row_counts
+
+
+@dataclass
+class GroupedStatistics:
+    """Statistics of a target grouped by bin numbers, see
+    :func:`calc_grouped_statistics`. All arrays have the length of
+    ``groups``, the bin numbers containing at least one sample."""
+
+    groups: np.ndarray
+    means: np.ndarray
+    medians: np.ndarray
+    counts: np.ndarray
+    #: 1 and 2 sigma quantiles (lower and upper) minus the medians,
+    #: shape ``(4, len(groups))``
+    errors: np.ndarray
+    #: requested quantiles, shape ``(len(groups), len(quantiles))``
+    quantiles: np.ndarray
+
+
+def calc_grouped_statistics(binnumbers, y, weights=None, quantiles=(), interpolate=None):
+    """Calculate the means, medians, counts, sigma-band errors and arbitrary
+    quantiles of y grouped over the binnumbers in one pass over the data
+    sorted once.
+
+    Parameters
+    ----------
+
+    binnumbers: :obj:`list` or :class:`numpy.ndarray` (dim=1)
+        binnumbers, missing values are ignored
+
+    y: :obj:`list` or :class:`numpy.ndarray` (float64, dim=1)
+        target values
+
+    weights: :obj:`list` or :class:`numpy.ndarray` (float64, dim=1)
+        array of event weights
+
+    quantiles: sequence of float
+        additional quantiles to calculate
+
+    interpolate: bool or None
+        If true, the weights are ignored, the counts are the number of samples
+        and the medians and quantiles are interpolated between the
+        non-missing values like :meth:`pandas.Series.quantile`. If false,
+        the counts are the sums of weights and the (weighted) quantiles are
+        the smallest values for which the cumulative weights reach the
+        quantiles of the total weights. By default, interpolate if the weights
+        are missing or all equal.
+
+    Returns
+    -------
+    :class:`GroupedStatistics`
+    """
+    binnumbers = np.asarray(binnumbers)
+    y = np.asarray(y, dtype=np.float64)
+    if weights is None:
+        weights = np.ones(len(y))
+    weights = np.asarray(weights, dtype=np.float64)
+    if interpolate is None:
+        interpolate = len(weights) == 0 or bool(np.all(weights == weights[0]))
+
+    if binnumbers.dtype.kind == "f":
+        finite = ~np.isnan(binnumbers)
+        if not finite.all():
+            binnumbers, y, weights = binnumbers[finite], y[finite], weights[finite]
+    if binnumbers.dtype.kind in "iu" and len(binnumbers) > 0:
+        # small ranges of integers do not need another sort
+        minimum = binnumbers.min()
+        n_groups = int(binnumbers.max()) - int(minimum) + 1
+        if n_groups <= 2 * len(binnumbers):
+            groups = np.arange(minimum, minimum + n_groups, dtype=binnumbers.dtype)
+            codes = (binnumbers - minimum).astype(np.int64)
+        else:
+            groups, codes = np.unique(binnumbers, return_inverse=True)
+    else:
+        groups, codes = np.unique(binnumbers, return_inverse=True)
+
+    all_quantiles = np.array(
+        [
+            0.5,
+            LOWER_1_SIGMA_QUANTILE,
+            1 - LOWER_1_SIGMA_QUANTILE,
+            LOWER_2_SIGMA_QUANTILE,
+            1 - LOWER_2_SIGMA_QUANTILE,
+        ]
+        + list(quantiles),
+        dtype=np.float64,
+    )
+    means, counts, result, row_counts = _grouped_statistics(
+        codes.astype(np.int64), y, weights, len(groups), all_quantiles, interpolate
+    )
+    present = row_counts > 0
+    result = result[present]
+    medians = result[:, 0]
+    return GroupedStatistics(
+        groups=groups[present],
+        means=means[present],
+        medians=medians,
+        counts=row_counts[present] if interpolate else counts[present],
+        errors=result[:, 1:5].T - medians,
+        quantiles=result[:, 5:],
+    )
+
+
 def calc_means_medians(binnumbers, y, weights=None):
     """Calculate the means, medians, counts, and errors for y grouped over the
     binnumbers.
@@ -492,159 +782,25 @@ def calc_means_medians(binnumbers, y, weights=None):
     3.0    2
     dtype: int64
     """
-    with warnings.catch_warnings(record=False):
-        warnings.simplefilter("ignore")
-        if weights is None or len(np.unique(weights)) == 1:
-            return _calc_means_medians_evenly_weighted(binnumbers, y)
-        else:
-            return _calc_means_medians_with_weights(binnumbers, y, weights)
-
-
-def calc_weighted_quantile(binnumbers, y, weights, quantile):
-    df = pd.DataFrame({"y": y, "weights": weights, "binnumbers": binnumbers})
-    return df.groupby("binnumbers").apply(_weighted_quantile_of_dataframe(quantile))
-
-
-def _calc_means_medians_evenly_weighted(binnumbers, y):
-    """Calculate the means, medians, counts, and errors for y grouped over the
-    binnumbers.
-
-    Parameters
-    ----------
-
-    binnumbers: :obj:`list` or :class:`numpy.ndarray` (float64, dim=1)
-        binnumbers
-
-    y: :obj:`list` or :class:`numpy.ndarray` (float64, dim=1)
-        target values
-    """
-    groupby = pd.Series(y).groupby(binnumbers)
-    means = groupby.mean()
-    medians = groupby.median()
-    counts = groupby.size()
-
-    quantiles = [
-        groupby.quantile(LOWER_1_SIGMA_QUANTILE),
-        groupby.quantile(1 - LOWER_1_SIGMA_QUANTILE),
-        groupby.quantile(LOWER_2_SIGMA_QUANTILE),
-        groupby.quantile(1 - LOWER_2_SIGMA_QUANTILE),
-    ]
-
-    errors = [series - medians for series in quantiles]
-
-    return means, medians, counts, errors
-
-
-def _calc_means_medians_with_weights(binnumbers, y, weights):
-    """Calculate the means, medians, counts, and errors for y grouped over the
-    binnumbers using weights.
-
-    Parameters
-    ----------
-
-    binnumbers: :obj:`list` or :class:`numpy.ndarray` (float64, dim=1)
-        binnumbers
-
-    y: :obj:`list` or :class:`numpy.ndarray` (float64, dim=1)
-        target values
-
-    weights: :obj:`list` or :class:`numpy.ndarray` (float64, dim=1)
-        array of event weights
-    """
-    df = pd.DataFrame({"y": y, "weights": weights, "binnumbers": binnumbers})
-    groupby = df.groupby("binnumbers")
-
-    means = groupby.apply(_weighted_mean_of_dataframe)
-    medians = groupby.apply(_weighted_median_of_dataframe)
-    counts = groupby.apply(_weighted_size_of_dataframe)
-
-    quantiles = [
-        groupby.apply(_weighted_quantile_of_dataframe(LOWER_1_SIGMA_QUANTILE)),
-        groupby.apply(_weighted_quantile_of_dataframe(1 - LOWER_1_SIGMA_QUANTILE)),
-        groupby.apply(_weighted_quantile_of_dataframe(LOWER_2_SIGMA_QUANTILE)),
-        groupby.apply(_weighted_quantile_of_dataframe(1 - LOWER_2_SIGMA_QUANTILE)),
-    ]
-    errors = [series - medians for series in quantiles]
-
+    stats = calc_grouped_statistics(binnumbers, y, weights)
+    index = pd.Index(stats.groups)
+    means = pd.Series(stats.means, index=index)
+    medians = pd.Series(stats.medians, index=index)
+    counts = pd.Series(stats.counts, index=index)
+    errors = [pd.Series(error, index=index) for error in stats.errors]
     return means, medians, counts, errors
 
 
-def _weighted_quantile_of_dataframe(quantile):
-    """
-    Generates a function which calculates the weighted quantile of a given pandas.DataFrame
-
-    Parameters
-    ----------
-
-    quantile: float between 0 and 1
-    """
-
-    def quantile_calculation(x):
-        """
-        Calculates the weighted quantile of a given pandas.DataFrame.
-        Expects two columns: y and weights
-
-        Parameters
-        ----------
-
-        x: :class:`pandas.DataFrame` with (at least) two columns y and weights
-        """
-        x = x.sort_values("y")
-        cumsum = x.weights.cumsum()
-        cutoff = x.weights.sum() * quantile
-        try:
-            return x.y[cumsum >= cutoff].iloc[0]
-        except IndexError:
-            return min(x.y)
-
-    return quantile_calculation
-
-
-def _weighted_median_of_dataframe(x):
-    """
-    Calculates the weighted size of a given pandas.DataFrame.
-    Expects two columns: y and weights
-
-    Parameters
-    ----------
-
-    x: :class:`pandas.DataFrame` with (at least) two columns y and weights
-    """
-    x = x.sort_values("y")
-    cumsum = x.weights.cumsum()
-    cutoff = x.weights.sum() / 2.0
-    try:
-        return x.y[cumsum >= cutoff].iloc[0]
-    except IndexError:
-        return min(x.y)
-
-
-def _weighted_mean_of_dataframe(x):
-    """
-    Calculates the weighted mean of a given pandas.DataFrame.
-    Expects two columns: y and weights
-
-    Parameters
-    ----------
-
-    x: :class:`pandas.DataFrame` with (at least) two columns y and weights
-    """
-    weighted_sum = (x.y * x.weights).sum()
-    sum_of_weights = x.weights.sum()
-    return weighted_sum / sum_of_weights
-
-
-def _weighted_size_of_dataframe(x):
-    """
-    Calculates the weighted size of a given pandas.DataFrame.
-    Expects one column: weights
-
-    Parameters
-    ----------
+def calc_weighted_quantile(binnumbers, y, weights, quantile):
+    """Calculate the weighted quantile of y grouped over the binnumbers, see
+    :func:`calc_grouped_statistics`.
 
-    x: :class:`pandas.DataFrame` with (at least) one column called weights
+    Returns
+    -------
+    :class:`pandas.Series` indexed by the binnumbers
     """
-    return x.weights.sum()
+    stats = calc_grouped_statistics(binnumbers, y, weights, quantiles=[quantile], interpolate=False)
+    return pd.Series(stats.quantiles[:, 0], index=pd.Index(stats.groups))
 
 
 def weighted_stddev(values, weights):
@@ -848,6 +1004,68 @@ def regularize_to_error_weighted_mean(values, uncertainties, prior_prediction=No
     return res
 
 
+def regularize_to_error_weighted_mean_groups(values, uncertainties, groups, n_groups, prior_prediction=None):
+    r"""Apply :func:`regularize_to_error_weighted_mean` to each group of
+    values separately, for all groups at once.
+
+    :param values: measured values
+    :type values: :class:`numpy.ndarray` (float64, dim=1)
+
+    :param uncertainties: uncertainties for the values.
+    :type uncertainties: :class:`numpy.ndarray` (float64, dim=1)
+
+    :param groups: group index of each value
+    :type groups: :class:`numpy.ndarray` (int, dim=1)
+
+    :param n_groups: number of groups
+    :type n_groups: int
+
+    :param prior_prediction: If the `prior_prediction` is specified, all values
+        are regularized with it and not with the error weighted mean.
+    :type prior_prediction: float
+
+    :returns: regularized values
+    :rtype: :class:`numpy.ndarray` (float64, dim=1)
+
+    >>> values = np.array([100., 100., 90., 110., 180., 20.])
+    >>> uncertainties = np.array([10., 10., 10., 10., 10., 10.])
+    >>> groups = np.array([0, 0, 1, 1, 2, 2])
+    >>> from cyclic_boosting.utils import regularize_to_error_weighted_mean_groups
+    >>> regularize_to_error_weighted_mean_groups(values, uncertainties, groups, 3)
+    array([ 100.        ,  100.        ,   95.        ,  105.        ,
+            178.76923077,   21.23076923])
+    """
+    if values.shape != uncertainties.shape or values.shape != groups.shape:
+        raise ValueError("values, uncertainties and groups must have the same shape")
+    x = np.asarray(values, dtype=np.float64)
+    if len(x) == 0:
+        return x
+    counts = np.bincount(groups, minlength=n_groups)
+    wx = 1.0 / np.square(uncertainties)
+    sum_wx = np.bincount(groups, weights=wx, minlength=n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if prior_prediction is None:
+            first = np.full(n_groups, len(x))
+            np.minimum.at(first, groups, np.arange(len(x)))
+            reference = x[np.minimum(first, len(x) - 1)][groups]
+            x_mean = (np.bincount(groups, weights=wx * x, minlength=n_groups) / sum_wx)[groups]
+            # a single value is kept, like in regularize_to_error_weighted_mean
+            unchanged = counts <= 1
+        else:
+            reference = prior_prediction
+            x_mean = np.full(len(x), prior_prediction, dtype=np.float64)
+            unchanged = np.zeros(n_groups, dtype=bool)
+
+        # if all values of a group are the same, regularizing makes no sense
+        not_close = ~(np.abs(x - reference) <= 1e-8 + 1e-5 * np.abs(reference))
+        unchanged |= np.bincount(groups, weights=not_close, minlength=n_groups) == 0
+
+        wx_incl = (1.0 / (np.bincount(groups, weights=wx * np.square(x - x_mean), minlength=n_groups) / sum_wx))[groups]
+        res = (wx * x + wx_incl * x_mean) / (wx + wx_incl)
+    return np.where(unchanged[groups], x, res)
+
+
 def regularize_to_error_weighted_mean_neighbors(
     values: np.ndarray, uncertainties: np.ndarray, window_size: Optional[int] = 3
 ) -> np.ndarray:
@@ -0,0 +1,256 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cyclic_boosting import flags
+from cyclic_boosting.binning import BinNumberTransformer, ECdfTransformer
+
+
+def test_binning_n_jobs():
+    rng = np.random.default_rng(1)
+    n = 10000
+    X = pd.DataFrame({"a": rng.normal(size=n), "b": rng.integers(0, 5, size=n), "c": rng.uniform(size=n)})
+    X.loc[::7, "c"] = np.nan
+    feature_properties = {"a": flags.IS_CONTINUOUS, "b": flags.IS_ORDERED, "c": flags.IS_CONTINUOUS}
+
+    for transformer in [BinNumberTransformer, ECdfTransformer]:
+        serial = transformer(n_bins=10, feature_properties=feature_properties).fit(X)
+        parallel = transformer(n_bins=10, feature_properties=feature_properties, n_jobs=-1).fit(X)
+        for (col_s, eps_s, bins_s), (col_p, eps_p, bins_p) in zip(serial.bins_and_cdfs_, parallel.bins_and_cdfs_):
+            assert col_s == col_p and eps_s == eps_p
+            np.testing.assert_array_equal(bins_s, bins_p)
+
+        pd.testing.assert_frame_equal(serial.transform(X), parallel.transform(X))
+
+    Xt = BinNumberTransformer(n_bins=10, feature_properties=feature_properties, n_jobs=2).fit_transform(X)
+    assert (Xt.dtypes == np.int8).all()
+    assert (Xt["c"][X["c"].isna()] == -1).all()
+
+    X_np = X.values
+    serial = BinNumberTransformer(n_bins=10).fit_transform(X_np)
+    parallel = BinNumberTransformer(n_bins=10, n_jobs=3).fit_transform(X_np)
+    assert parallel.dtype == np.int8
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_binning_categorical_lookup():
+    X = pd.DataFrame(
+        {
+            "cat": pd.Categorical(["b", "a", "c", None, "a", "b"]),
+            "str": np.array(["y", "x", None, "z", "x", "y"], dtype=object),
+            "int": np.array([3, 1, -9, 7, 1, 3]),
+            "num_cat": pd.Categorical([2.0, 4.0, 4.0, np.nan, 8.0, 2.0]),
+        }
+    )
+    feature_properties = {
+        "cat": flags.IS_UNORDERED,
+        "str": flags.IS_ORDERED,
+        "int": flags.IS_UNORDERED | flags.HAS_MAGIC_INT_MISSING,
+        "num_cat": flags.IS_UNORDERED,
+    }
+    trans = BinNumberTransformer(feature_properties=feature_properties).fit(X)
+    np.testing.assert_array_equal(trans.categories_["cat"], ["a", "b", "c"])
+    np.testing.assert_array_equal(trans.categories_["str"], ["x", "y", "z"])
+    assert set(trans.categories_) == {"cat", "str"}
+
+    Xt = trans.transform(X)
+    np.testing.assert_array_equal(Xt["cat"], [1, 0, 2, -1, 0, 1])
+    np.testing.assert_array_equal(Xt["str"], [1, 0, -1, 2, 0, 1])
+    np.testing.assert_array_equal(Xt["int"], [2, 1, -1, 3, 1, 2])
+    np.testing.assert_array_equal(Xt["num_cat"], [0, 1, 1, -1, 2, 0])
+
+    X_new = pd.DataFrame(
+        {
+            "cat": pd.Categorical(["c", "d", "a"], categories=["d", "c", "a"]),
+            "str": np.array(["w", "z", "x"], dtype=object),
+            "int": np.array([2, 7, 1000]),
+            "num_cat": pd.Categorical([8, 3, 4]),
+        }
+    )
+    Xt = trans.transform(X_new)
+    np.testing.assert_array_equal(Xt["cat"], [2, -1, 0])
+    np.testing.assert_array_equal(Xt["str"], [-1, 2, 0])
+    np.testing.assert_array_equal(Xt["int"], [-1, 3, -1])
+    np.testing.assert_array_equal(Xt["num_cat"], [2, -1, 1])
+
+    # same bins as with the binary search on float values
+    X_float = X[["int", "num_cat"]].astype(float)
+    expected = BinNumberTransformer(feature_properties=feature_properties).fit(X_float).transform(X_float)
+    np.testing.assert_array_equal(trans.transform(X)[["int", "num_cat"]], expected)
+
+    # nullable integers with missing values
+    X_nullable = pd.DataFrame({"int": pd.array([3, 5, pd.NA, 7], dtype="Int64")})
+    Xt = BinNumberTransformer(feature_properties={"int": flags.IS_UNORDERED}).fit_transform(X_nullable)
+    np.testing.assert_array_equal(Xt["int"], [0, 1, -1, 2])
+
+    # cdf values of the non-numeric categories
+    ecdf = ECdfTransformer(feature_properties=feature_properties).fit(X)
+    Xt = ecdf.transform(pd.concat([X, X_new], ignore_index=True))
+    np.testing.assert_allclose(Xt["cat"], [0.8, 0.4, 1.0, np.nan, 0.4, 0.8, 1.0, np.nan, 0.4])
+    np.testing.assert_allclose(Xt["str"], [0.8, 0.4, np.nan, 1.0, 0.4, 0.8, np.nan, 1.0, 0.4])
+
+
+@pytest.mark.parametrize("sketch_epsilon, share_tolerance", [(None, 0.04), (1e-3, 0.005)])
+def test_partial_fit_and_drift(sketch_epsilon, share_tolerance):
+    rng = np.random.default_rng(2)
+    n = 50000
+
+    def sample(shift):
+        return pd.DataFrame({"a": rng.normal(shift, 1, n), "b": rng.integers(0, 10, n)})
+
+    feature_properties = {"a": flags.IS_CONTINUOUS, "b": flags.IS_UNORDERED}
+    X_old, X_same, X_shifted = sample(0.0), sample(0.0), sample(1.0)
+
+    trans = BinNumberTransformer(
+        n_bins=10, feature_properties=feature_properties, sketch_epsilon=sketch_epsilon
+    ).partial_fit(X_old)
+    assert trans.rebinned_ == []
+    binned_old = trans.transform(X_old)
+
+    drift = trans.drift(X_shifted)
+    assert drift["a"] > 0.3 and drift["b"] < 0.02
+
+    trans.partial_fit(X_same)
+    assert trans.rebinned_ == []
+    assert max(trans.drift_.values()) < 0.02
+    pd.testing.assert_frame_equal(trans.transform(X_old), binned_old)
+
+    # the stored CDFs correspond to old and new samples
+    X_all = pd.concat([X_old, X_same])
+    for col, _, bins_and_cdfs in trans.bins_and_cdfs_:
+        expected = np.mean(X_all[col].values[:, None] <= bins_and_cdfs[None, :, 0], axis=0)
+        np.testing.assert_allclose(bins_and_cdfs[1:, 1], expected[1:], atol=1e-3)
+
+    trans.partial_fit(X_shifted)
+    assert trans.rebinned_ == ["a"]
+    assert trans.drift_["a"] > 0.3
+
+    X_all = pd.concat([X_old, X_same, X_shifted])
+    full = BinNumberTransformer(n_bins=10, feature_properties=feature_properties).fit(X_all)
+    shares = np.bincount(trans.transform(X_all)["a"]) / len(X_all)
+    np.testing.assert_allclose(shares, 0.1, atol=share_tolerance)
+    np.testing.assert_array_equal(trans.bins_and_cdfs_[1][2][:, 0], full.bins_and_cdfs_[1][2][:, 0])
+    np.testing.assert_allclose(trans.bins_and_cdfs_[1][2][:, 1], full.bins_and_cdfs_[1][2][:, 1], atol=1e-9)
+
+
+@pytest.mark.parametrize("sketch_epsilon", [None, 1e-3])
+def test_drift_point_mass_at_minimum(sketch_epsilon):
+    rng = np.random.default_rng(4)
+    n = 20000
+    X = pd.DataFrame({"z": np.where(rng.uniform(size=n) < 0.5, 0.0, rng.exponential(size=n)), "c": rng.normal(size=n)})
+    feature_properties = {"z": flags.IS_CONTINUOUS, "c": flags.IS_CONTINUOUS}
+
+    trans = ECdfTransformer(n_bins=20, feature_properties=feature_properties, sketch_epsilon=sketch_epsilon).fit(X)
+    for drift in trans.drift(X).values():
+        assert drift < 1e-3
+    assert trans.drift(X.assign(z=X["z"] - 1))["z"] > 0.3
+
+    bins = [bins_and_cdfs.copy() for _, _, bins_and_cdfs in trans.bins_and_cdfs_]
+    trans.partial_fit(X, max_drift=0.05)
+    assert trans.rebinned_ == []
+    for bins_and_cdfs, (_, _, updated) in zip(bins, trans.bins_and_cdfs_):
+        np.testing.assert_array_equal(updated[:, 0], bins_and_cdfs[:, 0])
+
+
+def test_binning_and_fit_from_arrow():
+    pa = pytest.importorskip("pyarrow")
+    from cyclic_boosting.pipelines import pipeline_CBPoissonRegressor
+
+    rng = np.random.default_rng(3)
+    n = 2000
+    X = pd.DataFrame(
+        {
+            "a": rng.normal(size=n),
+            "b": rng.integers(0, 5, size=n),
+            "c": pd.Categorical(rng.choice(["x", "y", "z"], size=n)),
+            "w": rng.uniform(0.5, 1.5, size=n),
+        }
+    )
+    X.loc[::10, "a"] = np.nan
+    y = rng.poisson(2, size=n)
+    feature_properties = {"a": flags.IS_CONTINUOUS, "b": flags.IS_ORDERED, "c": flags.IS_UNORDERED}
+    table = pa.Table.from_pandas(X, preserve_index=False)
+    assert table.column("a").null_count == n // 10
+
+    binner_pd = BinNumberTransformer(n_bins=10, feature_properties=feature_properties, weight_column="w").fit(X)
+    binner_pa = BinNumberTransformer(n_bins=10, feature_properties=feature_properties, weight_column="w").fit(table)
+    for (_, _, bins_pd), (_, _, bins_pa) in zip(binner_pd.bins_and_cdfs_, binner_pa.bins_and_cdfs_):
+        np.testing.assert_allclose(bins_pd, bins_pa)
+
+    binned = binner_pa.transform(table)
+    assert isinstance(binned, pa.Table)
+    assert binned.column_names == table.column_names
+    pd.testing.assert_frame_equal(
+        binned.to_pandas()[["a", "b", "c"]], binner_pd.transform(X)[["a", "b", "c"]], check_dtype=False
+    )
+
+    batch = table.to_batches(max_chunksize=n)[0]
+    binned_batch = binner_pa.transform(batch)
+    assert isinstance(binned_batch, pa.RecordBatch)
+    assert binned_batch.equals(binned.to_batches(max_chunksize=n)[0])
+
+    ecdf_pd = ECdfTransformer(n_bins=10, feature_properties=feature_properties, weight_column="w").fit(X)
+    ecdf_pa = ECdfTransformer(n_bins=10, feature_properties=feature_properties, weight_column="w").fit(table)
+    transformed = ecdf_pa.transform(table)
+    assert isinstance(transformed, pa.Table)
+    pd.testing.assert_frame_equal(
+        transformed.to_pandas()[["a", "b", "c"]], ecdf_pd.transform(X)[["a", "b", "c"]], check_dtype=False
+    )
+
+    features = ["a", "b", "c"]
+    est_pd = pipeline_CBPoissonRegressor(feature_groups=features, feature_properties=feature_properties).fit(X, y)
+    est_pa = pipeline_CBPoissonRegressor(feature_groups=features, feature_properties=feature_properties).fit(table, y)
+    np.testing.assert_allclose(est_pa.predict(table), est_pd.predict(X))
+
+
+def test_binned_dataset_cache(tmp_path):
+    from cyclic_boosting import CBPoissonRegressor
+    from cyclic_boosting.binning import BinnedDataset
+
+    rng = np.random.default_rng(4)
+    n = 5000
+    X = pd.DataFrame(
+        {
+            "a": rng.normal(size=n),
+            "b": rng.integers(0, 300, size=n),
+            "c": pd.Categorical(rng.choice(["x", "y", "z"], size=n)),
+            "w": rng.uniform(0.5, 1.5, size=n),
+            "id": np.array(["row"] * n, dtype=object),
+        }
+    )
+    y = rng.poisson(2, size=n).astype(np.float64)
+    feature_properties = {"a": flags.IS_CONTINUOUS, "b": flags.IS_UNORDERED, "c": flags.IS_UNORDERED}
+    binner = BinNumberTransformer(n_bins=10, feature_properties=feature_properties, weight_column="w")
+
+    ds = BinnedDataset.from_data(str(tmp_path), binner, X, y)
+    assert binner.bins_and_cdfs_ is None
+    assert ds.columns == ["a", "b", "c", "w"]
+    assert len(ds) == n
+    assert ds["a"].dtype == np.int8 and ds["b"].dtype == np.int16
+    assert not ds["a"].flags.writeable
+    np.testing.assert_array_equal(ds.weights, X["w"])
+
+    cached = BinnedDataset.from_data(str(tmp_path), binner.set_params(n_jobs=2), X, y)
+    assert cached.path == ds.path
+    assert len(list(tmp_path.iterdir())) == 1
+    X_changed = X.copy()
+    X_changed.loc[0, "a"] += 1e-9
+    assert BinnedDataset.from_data(str(tmp_path), binner, X_changed, y).key != ds.key
+    assert BinnedDataset.from_data(str(tmp_path), binner.set_params(n_bins=5), X, y).key != ds.key
+    assert len(list(tmp_path.iterdir())) == 3
+
+    Xt = ds.binner.transform(X)
+    for col in ds.columns:
+        np.testing.assert_array_equal(ds[col], Xt[col])
+
+    def estimator():
+        return CBPoissonRegressor(
+            feature_groups=["a", "b", "c", ("a", "c")],
+            feature_properties=feature_properties,
+            weight_column="w",
+            maximal_iterations=3,
+        )
+
+    est_ds = estimator().fit(cached)
+    est_df = estimator().fit(Xt, y)
+    np.testing.assert_allclose(est_ds.predict(cached), est_df.predict(Xt))
@@ -1,4 +1,7 @@
+import json
+
 import numpy as np
+import pandas as pd
 from sklearn.model_selection import train_test_split
 import pytest
 import matplotlib.pyplot as plt
@@ -30,7 +33,15 @@ from cyclic_boosting.quantile_matching import (
 )
 from cyclic_boosting.utils import smear_discrete_cdftruth
 from cyclic_boosting.interaction_selection import select_interaction_terms_anova
-from tests.utils import plot_CB, costs_mad, costs_mse
+from cyclic_boosting.generic_loss import (
+    CBGenericLoss,
+    CBMultiplicativeGenericCRegressor,
+    check_y_multiplicative,
+    model_multiplicative,
+    uncertainty_gamma,
+)
+from cyclic_boosting.link import LogLinkMixin
+from tests.utils import plot_CB, costs_mad, costs_mse, costs_mse_gradient, costs_mse_hessian
 
 np.random.seed(42)
 
@@ -329,6 +340,98 @@ def test_poisson_regression_default_features_notaggregated(prepare_data, default
     np.testing.assert_almost_equal(mad, 1.7144, 3)
 
 
+def test_poisson_regression_skip_converged_features(prepare_data, features, feature_properties):
+    X, y = prepare_data
+
+    def fit(minimal_feature_factor_change):
+        CB_est = pipeline_CBPoissonRegressor(
+            feature_groups=features,
+            feature_properties=feature_properties,
+            minimal_factor_change=1e-4,
+            minimal_loss_change=1e-6,
+            maximal_iterations=50,
+            minimal_feature_factor_change=minimal_feature_factor_change,
+        )
+        CB_est.fit(X.copy(), y)
+        return CB_est
+
+    CB_full = fit(None)
+    CB_skip = fit(1e-3)
+    est = CB_skip[-1]
+    assert est.stop_criteria_ == (False, True, False)
+    # the last iteration visits all features
+    assert est.skipped_features_ == []
+    n_visits = [len(feature.factor_sum) for feature in est.features]
+    assert min(n_visits) < est.iteration_ and max(n_visits) == est.iteration_
+
+    mad_full = np.nanmean(np.abs(y - CB_full.predict(X.copy())))
+    mad_skip = np.nanmean(np.abs(y - CB_skip.predict(X.copy())))
+    np.testing.assert_allclose(mad_skip, mad_full, rtol=1e-3)
+
+
+def test_poisson_regression_metrics_observer(prepare_data, default_features, feature_properties, tmp_path):
+    X, y = prepare_data
+    X = X[default_features]
+
+    metrics = observers.MetricsObserver(
+        path=tmp_path / "iterations.jsonl", feature_path=tmp_path / "features.jsonl", capacity=2
+    )
+    CB_est = pipeline_CBPoissonRegressor(
+        feature_properties=feature_properties, aggregate=False, minimal_feature_factor_change=1e-3, observers=[metrics]
+    )
+    CB_est.fit(X, y)
+    est = CB_est[-1]
+
+    mad = np.nanmean(np.abs(y - CB_est.predict(X)))
+    np.testing.assert_almost_equal(mad, 1.7144, 3)
+
+    iterations = metrics.iteration_metrics
+    np.testing.assert_equal(iterations["iteration"].values, np.arange(est.iteration_ + 1))
+    np.testing.assert_almost_equal(iterations["loss"].values[[0, -1]], [est.initial_loss_, est.insample_loss_])
+    assert np.isnan(iterations["factor_change"].values[0])
+    assert iterations["seconds"].values[0] == 0 and (iterations["seconds"].values[1:] > 0).all()
+
+    features = metrics.feature_metrics
+    n_visits = [len(feature.factor_sum) for feature in est.features]
+    assert len(features) == sum(n_visits) == iterations["n_features_updated"].sum()
+    assert features.groupby("feature").size().to_dict() == {
+        str(feature.feature_group): n for feature, n in zip(est.features, n_visits)
+    }
+    # the mean of the per-feature factor changes is the convergence criterion
+    last = features[features["iteration"] == est.iteration_ - 1]
+    np.testing.assert_almost_equal(last["factor_change"].mean(), iterations["factor_change"].values[-1])
+
+    # the duration of an iteration includes the durations of its feature updates
+    feature_seconds = features.groupby("iteration")["seconds"].sum()
+    assert (iterations["seconds"].values[1:] >= feature_seconds.reindex(np.arange(est.iteration_), fill_value=0)).all()
+
+    for name, expected in [("iterations.jsonl", iterations), ("features.jsonl", features)]:
+        with open(tmp_path / name) as f:
+            records = [json.loads(line) for line in f.read().splitlines()]
+        pd.testing.assert_frame_equal(pd.DataFrame(records), expected, check_dtype=False)
+
+
+def test_metrics_observer_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(2)
+    X = pd.DataFrame({"a": rng.integers(0, 5, 1000), "b": rng.normal(size=1000)})
+    y = rng.poisson(np.exp(0.2 * X["a"]))
+
+    metrics = observers.MetricsObserver(
+        path=tmp_path / "iterations.parquet", feature_path=tmp_path / "features.parquet", capacity=2
+    )
+    pipeline_CBPoissonRegressor(
+        feature_properties={"a": flags.IS_UNORDERED, "b": flags.IS_CONTINUOUS}, observers=[metrics]
+    ).fit(X, y)
+
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / "iterations.parquet"), metrics.iteration_metrics, check_dtype=False
+    )
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / "features.parquet"), metrics.feature_metrics, check_dtype=False
+    )
+
+
 def test_nbinom_regression_default_features(prepare_data, default_features, feature_properties):
     X, y = prepare_data
     X = X[default_features]
@@ -417,7 +520,7 @@ def test_exponential_regression(is_plot, prepare_data, cb_exponential_regressor_
     yhat = CB_est.predict(X)
 
     mad = np.nanmean(np.abs(y - yhat))
-    np.testing.assert_almost_equal(mad, 1.7203, 3)
+    np.testing.assert_almost_equal(mad, 1.6869, 3)
 
 
 @pytest.fixture(scope="function")
@@ -511,6 +614,28 @@ def test_width_regression_default_features(feature_properties, default_features,
     np.testing.assert_almost_equal(c.mean(), 0.365, 3)
 
 
+def test_width_regression_newton(feature_properties, default_features, prepare_data):
+    X, y = prepare_data
+    X = X[default_features]
+
+    fp = feature_properties
+    CB_est = pipeline_CBPoissonRegressor(feature_properties=fp)
+    CB_est.fit(X, y)
+    yhat = CB_est.predict(X)
+    X = X.assign(yhat_mean=yhat)
+
+    CB_est_width = pipeline_CBNBinomC(
+        mean_prediction_column="yhat_mean",
+        feature_properties=fp,
+        feature_groups=["dayofweek", "L_ID", "PG_ID_3", "PROMOTION_TYPE"],
+        maximal_iterations=50,
+        solver="newton",
+    )
+    CB_est_width.fit(X, y)
+    c = CB_est_width.predict(X)
+    np.testing.assert_almost_equal(c.mean(), 0.286, 3)
+
+
 def test_GBS_regression_default_features(is_plot, feature_properties, default_features, prepare_data):
     X, y = prepare_data
     X = X[default_features]
@@ -896,6 +1021,24 @@ def test_additive_regression_mse(is_plot, prepare_data, default_features, featur
     np.testing.assert_almost_equal(mad, 1.738, 3)
 
 
+def test_additive_regression_mse_newton(is_plot, prepare_data, default_features, feature_properties):
+    X, y = prepare_data
+    X = X[default_features]
+
+    CB_est = pipeline_CBAdditiveGenericCRegressor(
+        feature_properties=feature_properties,
+        costs=costs_mse,
+        gradient=costs_mse_gradient,
+        hessian=costs_mse_hessian,
+    )
+    CB_est.fit(X, y)
+
+    yhat = CB_est.predict(X)
+
+    mad = np.nanmean(np.abs(y - yhat))
+    np.testing.assert_almost_equal(mad, 1.738, 3)
+
+
 def test_multiplicative_regression_mad(is_plot, prepare_data, default_features, feature_properties):
     X, y = prepare_data
 
@@ -930,6 +1073,61 @@ def test_multiplicative_regression_mse(is_plot, prepare_data, default_features,
     np.testing.assert_almost_equal(mad, 1.7171, 3)
 
 
+def test_multiplicative_regression_mse_newton(is_plot, prepare_data, default_features, feature_properties):
+    X, y = prepare_data
+
+    X = X[default_features]
+
+    CB_est = pipeline_CBMultiplicativeGenericCRegressor(
+        feature_properties=feature_properties,
+        costs=costs_mse,
+        gradient=costs_mse_gradient,
+        hessian=costs_mse_hessian,
+    )
+    CB_est.fit(X, y)
+
+    yhat = CB_est.predict(X)
+
+    mad = np.nanmean(np.abs(y - yhat))
+    np.testing.assert_almost_equal(mad, 1.7171, 3)
+
+
+class MultiplicativeMSERegressor(CBGenericLoss, LogLinkMixin):
+    """Generic-loss estimator as defined downstream, without derivatives"""
+
+    def loss(self, prediction, y, weights):
+        return costs_mse(prediction, y, weights)
+
+    def _check_y(self, y):
+        check_y_multiplicative(y)
+
+    def costs(self, prediction, y, weights):
+        return costs_mse(prediction, y, weights)
+
+    def model(self, param, yhat_others):
+        return model_multiplicative(param, yhat_others)
+
+    def uncertainty(self, y, weights):
+        return uncertainty_gamma(y, weights)
+
+
+def test_generic_loss_without_model_derivative():
+    rng = np.random.default_rng(4)
+    X = pd.DataFrame({"a": rng.integers(0, 5, 1000), "b": rng.integers(0, 3, 1000)})
+    y = rng.poisson(np.exp(0.2 * X["a"])).astype(np.float64)
+    feature_properties = {"a": flags.IS_UNORDERED, "b": flags.IS_UNORDERED}
+
+    est = MultiplicativeMSERegressor(feature_properties=feature_properties, maximal_iterations=3).fit(X, y)
+    assert not est.has_derivatives()
+    with pytest.raises(NotImplementedError):
+        est.model_derivative(1.0, np.ones(3))
+
+    expected = CBMultiplicativeGenericCRegressor(
+        feature_properties=feature_properties, maximal_iterations=3, costs=costs_mse
+    ).fit(X, y)
+    np.testing.assert_allclose(est.predict(X), expected.predict(X))
+
+
 def poisson_likelihood(prediction, y, weights):
     negative_log_likelihood = np.nanmean(prediction + np.log(factorial(y)) - np.log(prediction) * y)
     return negative_log_likelihood
@@ -1,8 +1,17 @@
+import numpy as np
 import pandas as pd
+import pytest
 from pandas.testing import assert_frame_equal
+from sklearn.feature_selection import SelectKBest, f_classif, f_regression
 
-from cyclic_boosting.interaction_selection import create_interactions, build_binned_interaction_features
+from cyclic_boosting.interaction_selection import (
+    create_interactions,
+    build_binned_interaction_features,
+    select_interaction_terms_anova,
+    select_interaction_terms_hierarchical,
+)
 from cyclic_boosting import flags
+from cyclic_boosting.pipelines import pipeline_CBPoissonRegressor
 
 
 def test_create_interactions():
@@ -41,3 +50,75 @@ def test_build_binned_interaction_features():
     expected = pd.DataFrame({"('A', 'B')": [6, 4, 2], "('B', 'C')": [2, 4, 6]})
     interaction_features.rename(columns=lambda x: str(x), inplace=True)
     assert_frame_equal(interaction_features, expected)
+
+
+@pytest.mark.parametrize("classification", [False, True])
+def test_select_interaction_terms_anova_streaming(classification):
+    rng = np.random.default_rng(5)
+    n = 3000
+    X = pd.DataFrame(
+        {
+            "a": rng.integers(0, 4, n),
+            "b": rng.integers(0, 6, n),
+            "c": rng.normal(size=n),
+            "d": rng.integers(0, 3, n),
+            "e": np.zeros(n),
+        }
+    )
+    X.loc[::13, "c"] = np.nan
+    y = X["a"] * X["b"] + 2 * X["d"] * (X["c"] > 0) + rng.normal(0, 1, n)
+    if classification:
+        y = np.digitize(y, [3, 8])
+    feature_properties = {
+        "a": flags.IS_UNORDERED,
+        "b": flags.IS_ORDERED,
+        "c": flags.IS_CONTINUOUS,
+        "d": flags.IS_UNORDERED,
+        "e": flags.IS_CONTINUOUS,
+    }
+
+    # reference: SelectKBest on the materialized interaction features
+    interaction_terms = create_interactions(list(feature_properties), 3)
+    features = build_binned_interaction_features(X, interaction_terms, feature_properties)
+    est = SelectKBest(f_classif if classification else f_regression, k=6).fit(features, y)
+    expected = list(est.get_feature_names_out(input_features=features.columns))
+
+    for n_jobs in [None, 2]:
+        selected = select_interaction_terms_anova(
+            X, y, feature_properties, 3, 6, classification=classification, n_jobs=n_jobs
+        )
+        assert selected == expected
+
+
+def test_select_interaction_terms_hierarchical():
+    rng = np.random.default_rng(3)
+    n = 20000
+    X = pd.DataFrame({"f{}".format(i): rng.integers(0, 4, n) for i in range(8)})
+    X["c"] = rng.normal(size=n)
+    eta = (
+        0.5
+        + 0.2 * X["f0"]
+        + 0.6 * ((X["f1"] == 1) & (X["f2"] == 2) & (X["f3"] == 0))
+        + 0.4 * (X["f4"] == X["f5"])
+        + 0.3 * np.sign(X["c"]) * (X["f6"] > 1)
+    )
+    y = rng.poisson(np.exp(eta))
+    feature_properties = {col: flags.IS_UNORDERED for col in X}
+    feature_properties["c"] = flags.IS_CONTINUOUS
+
+    est = pipeline_CBPoissonRegressor(
+        feature_groups=list(feature_properties), feature_properties=feature_properties, maximal_iterations=20
+    ).fit(X, y)
+
+    selected = select_interaction_terms_hierarchical(X, y, feature_properties, est, 3, 3)
+    assert selected == [("f4", "f5"), ("f6", "c"), ("f1", "f2", "f3")]
+    assert select_interaction_terms_hierarchical(X, y, feature_properties, est, 3, 3, n_jobs=2) == selected
+    assert select_interaction_terms_hierarchical(X, y, feature_properties, est, 3, 3, max_stage_size=1) == [
+        ("f4", "f5")
+    ]
+    assert select_interaction_terms_hierarchical(X, y, feature_properties, est, 3, 3, min_gain=1e6) == []
+    # the stage keeps only the best max_stage_size terms
+    all_pairs = select_interaction_terms_hierarchical(X, y, feature_properties, est, 2, 100, min_gain=-np.inf)
+    assert (
+        select_interaction_terms_hierarchical(X, y, feature_properties, est, 2, 100, max_stage_size=2) == all_pairs[:2]
+    )
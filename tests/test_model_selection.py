@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sklearn.base as sklearnb
+from sklearn.model_selection import KFold, ShuffleSplit
+
+from cyclic_boosting import CBNBinomRegressor, CBPoissonRegressor, flags
+from cyclic_boosting.binning import BinNumberTransformer
+from cyclic_boosting.learning_rate import constant_learn_rate_one, half_linear_learn_rate
+from cyclic_boosting.model_selection import CBSearchCV, cross_validate_cb
+from cyclic_boosting.nbinom import lgamma_y_plus_one, loss_nbinom_c
+from cyclic_boosting.observers import MetricsObserver
+from cyclic_boosting.pipelines import pipeline_CBNBinomC, pipeline_CBPoissonRegressor
+
+
+@pytest.fixture(scope="module")
+def poisson_data():
+    rng = np.random.default_rng(11)
+    n = 4000
+    X = pd.DataFrame(
+        {
+            "a": rng.normal(size=n),
+            "b": rng.integers(0, 5, n),
+            "c": rng.integers(0, 3, n),
+        }
+    )
+    y = rng.poisson(np.exp(0.5 * np.tanh(X["a"]) + 0.2 * X["b"])).astype(np.float64)
+    feature_properties = {"a": flags.IS_CONTINUOUS, "b": flags.IS_UNORDERED, "c": flags.IS_UNORDERED}
+    return X, y, feature_properties
+
+
+def test_cb_search_cv(poisson_data, tmp_path):
+    X, y, feature_properties = poisson_data
+    pipeline = pipeline_CBPoissonRegressor(feature_properties=feature_properties, maximal_iterations=5)
+    param_grid = {
+        "CB__feature_groups": [["a", "b"], ["c"], ["a", "b", "c"]],
+        "CB__learn_rate": [half_linear_learn_rate, constant_learn_rate_one],
+    }
+    cv = KFold(3)
+    search = CBSearchCV(pipeline, param_grid, cv=cv, cache_dir=str(tmp_path)).fit(X, y)
+    # training and test dataset of each fold
+    assert len(list(tmp_path.iterdir())) == 6
+
+    # same scores as fitting the pipelines on the unbinned fold data
+    for params, score in zip(search.cv_results_["params"], search.cv_results_["split1_test_score"]):
+        train, test = list(cv.split(X))[1]
+        est = sklearnb.clone(pipeline).set_params(**params).fit(X.iloc[train], y[train])
+        expected = -est[-1].loss(est.predict(X.iloc[test]), y[test], np.ones(len(test)))
+        np.testing.assert_allclose(score, expected)
+
+    assert search.best_params_["CB__feature_groups"] == ["a", "b"]
+    assert search.cv_results_["rank_test_score"][search.best_index_] == 1
+    np.testing.assert_allclose(search.predict(X), search.best_estimator_.predict(X))
+
+    pruned = CBSearchCV(
+        CBPoissonRegressor(feature_properties=feature_properties, maximal_iterations=5),
+        {"feature_groups": param_grid["CB__feature_groups"], "maximal_iterations": [1, 5]},
+        cv=cv,
+        n_jobs=2,
+        prune_iterations=2,
+        prune_tolerance=0.02,
+    ).fit(X, y)
+    # the candidates without the important features are pruned
+    np.testing.assert_equal(pruned.cv_results_["pruned"], [False, False, True, True, False, False])
+    assert np.isnan(pruned.cv_results_["mean_test_score"][pruned.cv_results_["pruned"]]).all()
+    assert pruned.cv_results_["rank_test_score"][2] == 5
+    assert np.isfinite(pruned.cv_results_["mean_test_score"][~pruned.cv_results_["pruned"]]).all()
+    # candidates with maximal_iterations <= prune_iterations are scored after the first stage
+    assert pruned.best_params_ == {"feature_groups": ["a", "b"], "maximal_iterations": 5}
+
+    # the first stage follows the first iterations of the full fits
+    est = CBPoissonRegressor(feature_properties=feature_properties, feature_groups=["a", "b"], maximal_iterations=5)
+    metrics = MetricsObserver()
+    X_binned = BinNumberTransformer(n_bins=100, feature_properties=feature_properties).fit_transform(X)
+    sklearnb.clone(est).set_params(observers=[metrics]).fit(X_binned, y)
+    capped = sklearnb.clone(est)
+    capped._iteration_cap = 2
+    capped.fit(X_binned, y)
+    assert capped.iteration_ == 2
+    np.testing.assert_allclose(capped.insample_loss_, metrics.iteration_metrics["loss"][2])
+
+    with pytest.raises(ValueError):
+        CBSearchCV(pipeline, {"binning__n_bins": [10, 20]}).fit(X, y)
+
+
+def test_cb_search_cv_nbinom_c(poisson_data):
+    X, y, feature_properties = poisson_data
+    # the loss of CBNBinomC needs the mean prediction column of the test data
+    X = X.assign(yhat_mean=np.exp(0.2 * X["b"]))
+    pipeline = pipeline_CBNBinomC(
+        mean_prediction_column="yhat_mean", feature_properties=feature_properties, maximal_iterations=3
+    )
+    cv = KFold(2)
+    search = CBSearchCV(pipeline, {"CB__feature_groups": [["a"], ["b"], ["a", "b"]]}, cv=cv).fit(X, y)
+
+    for params, score in zip(search.cv_results_["params"], search.cv_results_["split0_test_score"]):
+        train, test = list(cv.split(X))[0]
+        est = sklearnb.clone(pipeline).set_params(**params).fit(X.iloc[train], y[train])
+        c = est.predict(X.iloc[test])
+        expected = -loss_nbinom_c(y[test], X["yhat_mean"].values[test], c, 0.0, lgamma_y_plus_one(y[test]))
+        np.testing.assert_allclose(score, expected)
+    assert not hasattr(search.best_estimator_[-1], "mu")
+
+
+def test_cross_validate_cb(poisson_data):
+    X, y, feature_properties = poisson_data
+    pipeline = pipeline_CBPoissonRegressor(
+        feature_groups=["a", "b", "c", ("a", "c")],
+        feature_properties=feature_properties,
+        maximal_iterations=10,
+        minimal_feature_factor_change=0.01,
+    )
+    cv = KFold(4, shuffle=True, random_state=3)
+    results = cross_validate_cb(pipeline, X, y, cv=cv, return_estimator=True)
+    assert len(results["test_score"]) == 4
+    assert results["binning_includes_test_folds"]
+
+    # same models as independent fits on the binned data with zero weights for the test fold
+    X_binned = BinNumberTransformer(n_bins=100, feature_properties=feature_properties).fit_transform(X)
+    for k, (train, test) in enumerate(cv.split(X)):
+        X_weighted = X_binned.assign(weight=0.0)
+        X_weighted.loc[train, "weight"] = 1.0
+        est = sklearnb.clone(pipeline[-1]).set_params(weight_column="weight").fit(X_weighted, y)
+        fold_est = results["estimator"][k]
+        np.testing.assert_allclose(fold_est.predict(X), est.predict(X_weighted))
+        assert fold_est[-1].iteration_ == est.iteration_
+        np.testing.assert_allclose(results["insample_loss"][k], est.insample_loss_)
+        expected = -est.loss(est.predict(X_weighted.iloc[test]), y[test], np.ones(len(test)))
+        np.testing.assert_allclose(results["test_score"][k], expected)
+
+    with pytest.raises(ValueError):
+        cross_validate_cb(pipeline, X, y, cv=ShuffleSplit(3))
+    with pytest.raises(ValueError):
+        cross_validate_cb(CBNBinomRegressor(feature_properties=feature_properties), X, y)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from cyclic_boosting.nbinom import (
+    binned_derivatives_nbinom_c,
+    binned_loss_nbinom_c,
+    compute_2d_loss,
+    get_new_c_link_for_iteration,
+    lgamma_y_plus_one,
+    newton_parameters_nbinom_c,
+)
+from scipy.special import gammaln
+
+
+def test_compute_2d_loss_matches_binned_loss():
+    np.random.seed(42)
+    n_samples = 1000
+    minlength = 7
+    y = np.random.poisson(3, n_samples)
+    mu = np.random.uniform(0.5, 10, n_samples)
+    c_link = np.random.normal(size=n_samples)
+    binnumbers = np.random.randint(0, minlength - 1, n_samples)
+    new_c_link = get_new_c_link_for_iteration(1, 15)
+
+    for y_test in [y, y + 0.5 * (np.arange(n_samples) % 2)]:
+        loss = compute_2d_loss(y_test, mu, c_link, binnumbers, minlength, 0.1, new_c_link, lgamma_y_plus_one(y_test))
+
+        assert loss.shape == (len(new_c_link), minlength)
+        for i, c in enumerate(new_c_link):
+            expected = binned_loss_nbinom_c(y_test.astype(np.float64), mu, c_link, binnumbers, minlength, 0.1, c)
+            np.testing.assert_allclose(loss[i], expected, rtol=1e-10)
+        np.testing.assert_equal(loss[:, -1], 0.0)
+
+
+def test_lgamma_y_plus_one():
+    y = np.array([0, 1, 2, 3, 10, 250, 0])
+    np.testing.assert_allclose(lgamma_y_plus_one(y), gammaln(y + 1.0), rtol=1e-12)
+
+    y = np.array([0.0, 0.5, 3.2, 7.0])
+    np.testing.assert_allclose(lgamma_y_plus_one(y), gammaln(y + 1.0), rtol=1e-12)
+
+
+def test_binned_derivatives_nbinom_c():
+    np.random.seed(42)
+    n_samples = 2000
+    minlength = 5
+    y = np.random.poisson(4, n_samples)
+    mu = np.random.uniform(1, 8, n_samples)
+    c_link = 0.5 * np.random.normal(size=n_samples)
+    binnumbers = np.random.randint(0, minlength, n_samples)
+    delta = 0.3 * np.random.normal(size=minlength)
+
+    new_c_link = get_new_c_link_for_iteration(1, 15)
+    eps = 1e-5
+
+    # integer targets (with large values) and non-integer targets
+    for y_test in [y + 20 * (np.arange(n_samples) % 3 == 0), y + 0.5]:
+        lgamma_y1 = lgamma_y_plus_one(y_test)
+        args = (y_test, mu, c_link, binnumbers, minlength, 0.1)
+        loss, gradient, hessian = binned_derivatives_nbinom_c(*args, delta, lgamma_y1)
+
+        c_link_shifted = c_link + delta[binnumbers]
+        np.testing.assert_allclose(
+            loss,
+            compute_2d_loss(y_test, mu, c_link_shifted, binnumbers, minlength, 0.1, new_c_link, lgamma_y1)[15],
+        )
+
+        for j in range(minlength):
+            shift = np.zeros(minlength)
+            shift[j] = eps
+            loss_up, gradient_up, _ = binned_derivatives_nbinom_c(*args, delta + shift, lgamma_y1)
+            loss_down, gradient_down, _ = binned_derivatives_nbinom_c(*args, delta - shift, lgamma_y1)
+            np.testing.assert_allclose(gradient[j], (loss_up[j] - loss_down[j]) / (2 * eps), rtol=1e-5)
+            np.testing.assert_allclose(hessian[j], (gradient_up[j] - gradient_down[j]) / (2 * eps), rtol=1e-5)
+
+
+def test_newton_parameters_nbinom_c_matches_fine_grid():
+    np.random.seed(42)
+    n_samples = 2000
+    minlength = 6
+    y = np.random.poisson(4, n_samples)
+    mu = np.random.uniform(1, 8, n_samples)
+    c_link = 0.5 * np.random.normal(size=n_samples)
+    binnumbers = np.random.randint(0, minlength - 1, n_samples)
+
+    fine_grid = np.linspace(-10, 10, 4001)
+    loss = compute_2d_loss(y, mu, c_link, binnumbers, minlength, 0.1, fine_grid, lgamma_y_plus_one(y))
+    expected = fine_grid[np.argmin(loss, axis=0)]
+    expected[-1] = 0.0
+
+    result = newton_parameters_nbinom_c(y, mu, c_link, binnumbers, minlength, 0.1, False, -10, 10)
+    np.testing.assert_allclose(result, expected, atol=5e-3)
+
+    result_bayes = newton_parameters_nbinom_c(y, mu, c_link, binnumbers, minlength, 0.1, True, -10, 10)
+    np.testing.assert_allclose(result_bayes, result, atol=5e-3)
+
+    result_bounded = newton_parameters_nbinom_c(y, mu, c_link, binnumbers, minlength, 0.1, False, -1, 1)
+    np.testing.assert_allclose(result_bounded[:-1], -1.0)
@@ -134,6 +134,38 @@ def test_analysis_regressor_with_file_handle(get_inputs):
         assert os.path.exists(filepath)
 
 
+def test_analysis_parallel(get_inputs):
+    X, y, feature_prop, _fg = get_inputs
+    feature_groups = [str(i) for i in range(9)] + [("1", "7"), ("2", "4", "8")]
+    plobs = observers.PlottingObserver()
+    est = CBPoissonRegressor(
+        feature_groups=feature_groups,
+        feature_properties=feature_prop,
+        observers=[plobs],
+    )
+    est.fit(X, y)
+    with temp_dirname_created_and_removed() as dirname:
+        rendered = plots.plot_analysis_parallel(plobs, dirname, features_per_file=4, n_jobs=2)
+        expected = ["overview.pdf", "features_000.pdf", "features_001.pdf", "features_002.pdf"]
+        assert [os.path.basename(filepath) for filepath in rendered] == expected
+        assert sorted(os.listdir(dirname)) == sorted(expected + ["analysis.json"])
+
+        # nothing changed
+        assert plots.plot_analysis_parallel(plobs, dirname, features_per_file=4) == []
+
+        # only the file containing the changed feature is rendered again
+        feature = list(plobs.features)[5]
+        feature.factors_link = feature.factors_link + 0.1
+        rendered = plots.plot_analysis_parallel(plobs, dirname, features_per_file=4)
+        assert [os.path.basename(filepath) for filepath in rendered] == ["features_001.pdf"]
+
+        rendered = plots.plot_analysis_parallel(plobs, dirname, image_format="png", n_jobs=2)
+        assert len(rendered) == 2 + len(feature_groups)
+        assert sorted(os.listdir(dirname)) == sorted(
+            [os.path.basename(filepath) for filepath in rendered] + ["analysis.json"]
+        )
+
+
 def test_analysis_location(get_inputs):
     X, y, feature_prop, feature_groups = get_inputs
     y = np.sin(y) * 5.3
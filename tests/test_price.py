@@ -0,0 +1,82 @@
+import numpy as np
+
+from cyclic_boosting.price import newton_bisect, newton_bisect_exponent, newton_step
+
+
+def _exponent_problem(n_samples=5000, n_bins=8, seed=42):
+    np.random.seed(seed)
+    binnumbers = np.random.randint(0, n_bins - 1, n_samples)
+    true_l = np.random.uniform(0.5, 1.8, n_bins)
+    log_x = np.log(np.random.uniform(0.5, 1.0, n_samples))
+    k = -np.random.uniform(1.0, 3.0, n_samples)
+    p = np.random.uniform(1.0, 10.0, n_samples)
+    y = np.random.poisson(p * np.exp(k * true_l[binnumbers] * log_x)).astype(np.float64)
+    prior = -2.0 * np.ones(n_samples)
+    s = 1.0 / p
+    log_k_prior = np.log(k / prior)
+    return y, p, log_x, k, prior, s, log_k_prior, binnumbers, n_bins
+
+
+def _solve_exponents(problem, valid, epsilon, maximal_iterations):
+    y, p, log_x, k, prior, s, log_k_prior, binnumbers, n_bins = problem
+    sorting = np.argsort(binnumbers, kind="stable")
+    bin_offsets = np.r_[0, np.cumsum(np.bincount(binnumbers, minlength=n_bins))]
+    x_l = np.zeros(n_bins)
+    x_r = 2 * np.ones(n_bins)
+    l, hessian = newton_bisect_exponent(
+        y[sorting],
+        p[sorting],
+        log_x[sorting],
+        k[sorting],
+        prior[sorting],
+        s[sorting],
+        log_k_prior[sorting],
+        0.1,
+        bin_offsets,
+        valid,
+        x_l,
+        x_r,
+        np.ones(n_bins),
+        epsilon,
+        maximal_iterations,
+        10,
+    )
+    return l, hessian, x_l, x_r
+
+
+def test_newton_bisect_exponent_matches_newton_bisect():
+    problem = _exponent_problem()
+    y, p, log_x, k, prior, s, log_k_prior, binnumbers, n_bins = problem
+    valid = np.bincount(binnumbers, minlength=n_bins) > 0
+    epsilon = 1e-8
+
+    l_expected, hess_inv_expected, _, _ = newton_bisect(
+        newton_step,
+        (y, p, log_x, k, prior, s, log_k_prior, 0.1, binnumbers, n_bins),
+        valid.copy(),
+        np.zeros(n_bins),
+        2 * np.ones(n_bins),
+        epsilon=epsilon,
+        maximal_iterations=50,
+        start_values=np.ones(n_bins),
+    )
+    l, hessian, x_l, x_r = _solve_exponents(problem, valid, epsilon, 50)
+
+    np.testing.assert_allclose(l[valid], l_expected[valid], rtol=1e-6)
+    np.testing.assert_allclose(1.0 / hessian[valid], hess_inv_expected[valid], rtol=1e-4)
+    np.testing.assert_equal(l[~valid], 1.0)
+    # brackets are updated in place and enclose the solution
+    assert np.all(x_l[valid] <= l[valid]) and np.all(l[valid] <= x_r[valid])
+    assert np.any(x_l[valid] > 0) and np.all(x_r[valid] <= 2)
+
+
+def test_newton_bisect_exponent_per_bin_exit():
+    problem = _exponent_problem()
+    binnumbers, n_bins = problem[-2:]
+    valid = np.bincount(binnumbers, minlength=n_bins) > 0
+
+    # each bin stops at its own convergence, independent of the other bins
+    l, hessian, _, _ = _solve_exponents(problem, valid, 0.01, 3)
+    for j in np.flatnonzero(valid):
+        l_j, hessian_j, _, _ = _solve_exponents(problem, np.arange(n_bins) == j, 0.01, 3)
+        assert l[j] == l_j[j] and hessian[j] == hessian_j[j]
@@ -12,6 +12,10 @@ from cyclic_boosting.quantile_matching import (
     quantile_fit_gamma,
     quantile_fit_nbinom,
     quantile_fit_spline,
+    quantile_fit_gaussian_rows,
+    quantile_fit_gamma_rows,
+    quantile_fit_nbinom_rows,
+    quantile_fit_spline_rows,
 )
 
 
@@ -363,6 +367,72 @@ def test_J_QPD_extended_B(is_plot):
         plt.clf()
 
 
+def test_J_QPD_arrays():
+    alpha = 0.2
+    rng = np.random.default_rng(42)
+    n = 50
+    qv_median = rng.uniform(1.0, 3.0, n)
+    # left- and right-skewed SPTs
+    qv_low = qv_median - rng.choice([0.3, 0.5, 0.7], n)
+    qv_high = qv_median + rng.choice([0.4, 0.6, 0.8], n)
+    quantiles = np.array([0.05, 0.2, 0.35, 0.5, 0.65, 0.8, 0.95])
+
+    for dist, args, kwargs in [
+        (J_QPD_S, (), {}),
+        (J_QPD_S, (), {"version": "logistic"}),
+        (J_QPD_B, (-5.0, 10.0), {}),
+        (J_QPD_extended_U, (), {"version": "normal"}),
+        (J_QPD_extended_U, (), {"shape": -0.5}),
+        (J_QPD_extended_S, (), {"shape": 0.5}),
+        (J_QPD_extended_B, (-5.0, 10.0), {}),
+    ]:
+        qpd = dist(alpha, qv_low, qv_median, qv_high, *args, **kwargs)
+        assert len(qpd) == n
+
+        grid = qpd.ppf(quantiles[np.newaxis, :])
+        assert grid.shape == (n, len(quantiles))
+        np.testing.assert_allclose(grid[:, [1, 3, 5]], np.column_stack([qv_low, qv_median, qv_high]), rtol=1e-6)
+        np.testing.assert_allclose(qpd.cdf(grid), np.broadcast_to(quantiles, grid.shape), atol=1e-8)
+        np.testing.assert_allclose(qpd.ppf(0.5), qv_median, rtol=1e-6)
+        np.testing.assert_allclose(qpd.cdf(qv_high), 1 - alpha, atol=1e-8)
+
+        eps = 1e-6
+        pdf_numeric = (qpd.cdf(grid + eps) - qpd.cdf(grid - eps)) / (2 * eps)
+        np.testing.assert_allclose(qpd.pdf(grid), pdf_numeric, rtol=1e-5)
+
+        for i in [0, 17, n - 1]:
+            single = dist(alpha, qv_low[i], qv_median[i], qv_high[i], *args, **kwargs)
+            np.testing.assert_allclose(single.ppf(quantiles), grid[i], rtol=1e-12)
+            np.testing.assert_allclose(qpd[i].ppf(quantiles), grid[i], rtol=1e-12)
+            np.testing.assert_allclose(single.cdf(grid[i]), qpd.cdf(grid)[i], rtol=1e-12)
+
+
+def test_J_QPD_rvs():
+    alpha = 0.2
+    qv_low = np.array([0.5, 1.0, 2.0])
+    qv_median = np.array([1.0, 1.5, 2.6])
+    qv_high = np.array([2.2, 2.1, 3.4])
+    quantiles = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+
+    for dist, args, kwargs in [
+        (J_QPD_S, (), {}),
+        (J_QPD_B, (-5.0, 10.0), {"version": "logistic"}),
+        (J_QPD_extended_U, (), {"version": "normal"}),
+        (J_QPD_extended_S, (), {"shape": 0.5}),
+        (J_QPD_extended_B, (-5.0, 10.0), {"shape": -0.3}),
+    ]:
+        qpd = dist(alpha, qv_low, qv_median, qv_high, *args, **kwargs)
+        samples = qpd.rvs(20000, random_state=1)
+        assert samples.shape == (3, 20000)
+        # the CDF values of the samples are uniformly distributed
+        np.testing.assert_allclose(np.quantile(qpd.cdf(samples), quantiles, axis=1).T, [quantiles] * 3, atol=0.01)
+        np.testing.assert_array_equal(samples, qpd.rvs(20000, random_state=np.random.default_rng(1)))
+
+        assert qpd.rvs(random_state=2).shape == (3,)
+        assert qpd.rvs((4, 5), random_state=2).shape == (3, 4, 5)
+        assert np.shape(qpd[1].rvs(random_state=2)) == ()
+
+
 def test_cdf_fit_gaussian(is_plot):
     quantiles = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
     mu_exp = 0.3
@@ -468,3 +538,46 @@ def test_quantile_fit_spline(is_plot):
         plt.plot(xs, spl(xs))
         plt.savefig("spline.png")
         plt.clf()
+
+
+def test_quantile_fit_rows():
+    quantiles = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+    rng = np.random.default_rng(7)
+    n = 20
+    mu = rng.uniform(2.0, 10.0, n)
+    sigma = rng.uniform(0.5, 1.0, n) * np.sqrt(mu)
+    xs = np.linspace(0.05, 0.95, 7)
+
+    quantile_values = norm.ppf(quantiles, mu[:, np.newaxis], sigma[:, np.newaxis]) + rng.normal(0, 0.05, (n, 5))
+    dist = quantile_fit_gaussian_rows(quantiles, quantile_values, mode="dist")
+    assert dist.ppf(xs).shape == (n, len(xs))
+    np.testing.assert_allclose(dist.mean()[:, 0], mu, atol=0.1)
+
+    shape, scale = (mu / sigma)[:, np.newaxis] ** 2, (sigma**2 / mu)[:, np.newaxis]
+    quantile_values = gamma.ppf(quantiles, shape, scale=scale) * 1.01
+    dist = quantile_fit_gamma_rows(quantiles, quantile_values, mode="dist")
+    np.testing.assert_allclose(dist.mean()[:, 0], 1.01 * mu, rtol=1e-4)
+    np.testing.assert_allclose(dist.std()[:, 0], 1.01 * sigma, rtol=1e-4)
+
+    for fit, fit_rows in [
+        (quantile_fit_gaussian, quantile_fit_gaussian_rows),
+        (quantile_fit_gamma, quantile_fit_gamma_rows),
+        (quantile_fit_spline, quantile_fit_spline_rows),
+    ]:
+        quantile_values = norm.ppf(quantiles, mu[:, np.newaxis], sigma[:, np.newaxis])
+        ppf = fit_rows(quantiles, quantile_values)
+        for i in [0, 11]:
+            np.testing.assert_allclose(ppf(xs)[i], fit(quantiles, quantile_values[i])(xs), rtol=1e-6)
+            np.testing.assert_allclose(ppf(-0.1)[i], fit(quantiles, quantile_values[i])(-0.1), rtol=1e-6)
+
+    # first row as in test_cdf_fit_nbinom, the fits of the CDF are at least as good as the ones per row
+    mu = mu[:, np.newaxis]
+    excess = mu * rng.uniform(0.2, 1.5, (n, 1))
+    quantile_values = nbinom.ppf(quantiles, mu * mu / excess, mu / (mu + excess))
+    quantile_values = np.vstack([nbinom.ppf(quantiles, 5.3**2 / (3.1**2 - 5.3), 5.3 / 3.1**2), quantile_values])
+    cdf = quantile_fit_nbinom_rows(quantiles, quantile_values, mode="cdf")
+    np.testing.assert_allclose(cdf([3, 5, 8])[0], [0.251, 0.51, 0.809], atol=1e-3)
+    for i in [1, 12]:
+        cdf_row = quantile_fit_nbinom(quantiles, quantile_values[i], mode="cdf")
+        cost_rows = np.sum((cdf(quantile_values[i])[i] - quantiles) ** 2)
+        assert cost_rows <= np.sum((cdf_row(quantile_values[i]) - quantiles) ** 2) + 1e-9
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cyclic_boosting import flags
+from cyclic_boosting.binning import BinNumberTransformer, WeightedQuantileSketch
+from cyclic_boosting.binning.ecdf_transformer import calculate_cdf_from_weighted_data
+
+
+def test_sketch_exact_without_pruning():
+    z = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, np.nan, 6.0])
+    w = np.array([4.0, 2.0, 2.0, 1.0, 0.0, 1.0, 1.0, 0.0])
+    sketch = WeightedQuantileSketch(epsilon=0.1).update(z[:3], w[:3]).update(z[3:], w[3:])
+
+    values, cdf = sketch.cdf()
+    assert sketch.is_exact
+    assert sketch.rank_error == 0
+    np.testing.assert_equal(values, [1.0, 2.0, 3.0, 4.0, 6.0])
+    np.testing.assert_allclose(cdf, [0.4, 0.6, 0.8, 0.9, 1.0])
+    np.testing.assert_allclose(sketch.total_weight, 10.0)
+
+
+def test_sketch_rank_error():
+    rng = np.random.default_rng(42)
+    x = np.round(rng.lognormal(size=200000), 3)
+    w = rng.uniform(0, 2, size=len(x))
+
+    epsilon = 0.01
+    partitions = []
+    for x_part, w_part in zip(np.array_split(x, 4), np.array_split(w, 4)):
+        sketch = WeightedQuantileSketch(epsilon)
+        for x_chunk, w_chunk in zip(np.array_split(x_part, 25), np.array_split(w_part, 25)):
+            sketch.update(x_chunk, w_chunk)
+        partitions.append(sketch)
+    sketch = partitions[0]
+    for other in partitions[1:]:
+        sketch.merge(other)
+
+    values, cdf = sketch.cdf()
+    assert not sketch.is_exact
+    assert len(values) < 4 * sketch.summary_size
+    assert values[0] == x.min() and values[-1] == x.max()
+    np.testing.assert_allclose(sketch.total_weight, w.sum())
+
+    x_exact, cdf_exact, _, _ = calculate_cdf_from_weighted_data(x, w)
+    expected = cdf_exact[np.searchsorted(x_exact, values)]
+    assert np.abs(cdf - expected).max() <= sketch.rank_error <= epsilon
+
+
+def test_binning_with_sketch():
+    rng = np.random.default_rng(0)
+    n = 100000
+    X = pd.DataFrame({"a": rng.normal(size=n), "b": rng.integers(0, 20, size=n)})
+    X.loc[::100, "a"] = np.nan
+    feature_properties = {"a": flags.IS_CONTINUOUS, "b": flags.IS_UNORDERED}
+
+    exact = BinNumberTransformer(n_bins=20, feature_properties=feature_properties).fit(X)
+    approx = BinNumberTransformer(
+        n_bins=20, feature_properties=feature_properties, sketch_epsilon=1e-3, sketch_chunk_size=10000
+    ).fit(X)
+    assert list(approx.sketches_) == ["a"]
+
+    _, _, bins_exact_a = exact.bins_and_cdfs_[0]
+    _, _, bins_exact_b = exact.bins_and_cdfs_[1]
+    _, _, bins_approx_a = approx.bins_and_cdfs_[0]
+    assert bins_approx_a.shape == bins_exact_a.shape
+    np.testing.assert_allclose(bins_approx_a[:, 1], bins_exact_a[:, 1], atol=2e-3)
+    np.testing.assert_array_equal(approx.bins_and_cdfs_[1][2], bins_exact_b)
+
+    counts = np.bincount(approx.transform(X)["a"][X["a"].notna()], minlength=20)
+    np.testing.assert_allclose(counts / counts.sum(), 0.05, atol=2e-3)
+
+    sketches = {
+        col: WeightedQuantileSketch(1e-3)
+        .update(X[col].values[:50000])
+        .merge(WeightedQuantileSketch(1e-3).update(X[col].values[50000:]))
+        for col in X.columns
+    }
+    from_sketches = BinNumberTransformer(n_bins=20, feature_properties=feature_properties).fit_from_sketches(sketches)
+    np.testing.assert_array_equal(from_sketches.bins_and_cdfs_[1][2], bins_exact_b)
+    np.testing.assert_allclose(from_sketches.bins_and_cdfs_[0][2][:, 1], bins_exact_a[:, 1], atol=2e-3)
+
+    with pytest.raises(ValueError):
+        BinNumberTransformer(feature_properties={"a": flags.IS_UNORDERED}).fit_from_sketches({"a": sketches["a"]})
@@ -193,3 +193,39 @@ def test_groupby_smoother_cb_weights_all_zero():
     est.fit(X, y)
     p = est.predict(X)
     assert np.all(np.isnan(p))
+
+
+def test_groupby_smoother_cb_batched_groups():
+    rng = np.random.default_rng(0)
+    n_groups, n_bins = 50, 6
+    groups = np.repeat(rng.permutation(n_groups), n_bins).astype(np.float64)
+    binnos = np.tile(np.arange(n_bins), n_groups).astype(np.float64)
+    weights = rng.uniform(0, 2, len(groups))
+    weights[rng.random(len(groups)) < 0.2] = 0
+    weights[groups == 3] = 0
+    X = np.c_[groups, binnos, weights, rng.uniform(0.1, 1, len(groups))]
+    y = rng.normal(size=len(groups))
+    Xt = np.c_[np.r_[groups, 100, 3, 1, 1], np.r_[binnos, 1, 1, n_bins, np.nan]]
+
+    for inner in [
+        smoothing.meta_smoother.NormalizationRegressionTypeSmoother(
+            smoothing.onedim.WeightedMeanSmoother(), RegressionType.discontinuous
+        ),
+        smoothing.meta_smoother.RegressionTypeSmoother(
+            smoothing.onedim.BinValuesSmoother(), RegressionType.discontinuous
+        ),
+    ]:
+        est = smoothing.multidim.GroupBySmootherCB(inner, 2)
+        est.fit(X, y)
+        assert est.estimators_ is None and est.smoothed_y_.shape == (n_groups - 1, n_bins)
+        p = est.predict(Xt)
+
+        # same as fitting a clone on each group
+        expected = utils.nans(len(Xt))
+        for group in np.unique(groups[weights > 0]):
+            clone = utils.clone(inner)
+            clone.fit(X[groups == group, 1:], y[groups == group])
+            mask = Xt[:, 0] == group
+            expected[mask] = clone.predict(Xt[mask, 1:])
+        np.testing.assert_allclose(p, expected)
+        assert np.all(np.isnan(p[-4:]))
@@ -3,6 +3,7 @@ import warnings
 import numpy as np
 import pandas as pd
 import pytest
+import scipy.optimize
 
 from cyclic_boosting import smoothing
 
@@ -123,6 +124,23 @@ def test_custom_choice_function():
     assert np.mean(np.abs(ytruth - ypred)) < 0.1
 
 
+@pytest.mark.parametrize("order", [1, 2, 3])
+def test_linear_fit_matches_curve_fit(order):
+    X, y, _ = _create_seasonal_test_data(c_const=0.3, c_sin_2x=0.2, c_cos_3x=-0.1, n=365)
+    X[:, 2] *= np.random.uniform(0.5, 2.0, size=len(X))
+
+    smoother = smoothing.onedim.SeasonalSmoother(order=order, offset_tozero=False).fit(X, y)
+    fit_function = smoothing.onedim._choose_default_fit_function(order)
+    par_curve_fit, _ = scipy.optimize.curve_fit(fit_function, xdata=smoother.transform_X(X), ydata=y, sigma=X[:, 2])
+    np.testing.assert_allclose(smoother.par_, par_curve_fit, rtol=1e-6, atol=1e-7)
+    np.testing.assert_allclose(
+        smoother.predict(X), fit_function(smoother.transform_X(X), *par_curve_fit), rtol=1e-6, atol=1e-7
+    )
+    assert smoothing.onedim._seasonal_design_matrix(smoother.transform_X(X), order) is (
+        smoothing.onedim._seasonal_design_matrix(smoother.transform_X(X.copy()), order)
+    )
+
+
 def test_small_sample_size():
     X, y, ytruth = _create_seasonal_test_data()
     fallback_value = 1
@@ -2,6 +2,10 @@ import numpy as np
 import pandas as pd
 
 from cyclic_boosting.smoothing.onedim import OrthogonalPolynomialSmoother
+from cyclic_boosting.smoothing.orthofit import (
+    cy_apply_orthogonal_poly_fit_equidistant,
+    cy_orthogonal_poly_fit_equidistant,
+)
 
 
 def test_orthogonal_polynomial_smoother_blobel():
@@ -81,3 +85,29 @@ def test_orthogonal_polynomial_smoother_degree_is_reduced_to_one_fith_of_the_sup
     est.fit(X_for_smoother, y)
 
     assert est.n_degrees_ == 4
+
+
+def test_orthogonal_polynomial_smoother_cached_basis():
+    rng = np.random.default_rng(1)
+    n = 50
+    X_for_smoother = np.c_[np.arange(n, dtype=np.float64), np.ones(n), rng.uniform(0.1, 1.0, n)]
+    x_test = np.c_[rng.uniform(-5, n + 5, 200)]
+
+    est = OrthogonalPolynomialSmoother()
+    for i in range(3):
+        y = np.sin(X_for_smoother[:, 0] / 10.0) + rng.normal(size=n) * 0.3
+        if i == 2:
+            X_for_smoother[:, 2] *= 1.5
+        est.fit(X_for_smoother, y)
+
+        parameters, n_degrees = cy_orthogonal_poly_fit_equidistant(X_for_smoother[:, 0], y, X_for_smoother[:, 2])
+        assert est.n_degrees_ == n_degrees
+        np.testing.assert_array_equal(est.pp_[:n_degrees], parameters[:n_degrees])
+        np.testing.assert_array_equal(
+            est.predict(X_for_smoother),
+            cy_apply_orthogonal_poly_fit_equidistant(X_for_smoother[:, 0].copy(), parameters, n_degrees),
+        )
+        np.testing.assert_array_equal(
+            est.predict(x_test),
+            cy_apply_orthogonal_poly_fit_equidistant(np.clip(x_test[:, 0], 0, n - 1), parameters, n_degrees),
+        )
@@ -87,3 +87,77 @@ def test_regularize_to_error_weighted_mean_neighbors():
         ]
     )
     np.testing.assert_allclose(res, ref)
+
+
+def test_calc_grouped_statistics():
+    rng = np.random.default_rng(7)
+    n = 2000
+    binnumbers = rng.integers(0, 20, n) * 2
+    y = rng.normal(size=n).round(1)
+    y[::17] = np.nan
+    weights = rng.random(n)
+
+    means, medians, counts, errors = utils.calc_means_medians(binnumbers, y)
+    groupby = pd.Series(y).groupby(binnumbers)
+    pd.testing.assert_series_equal(means, groupby.mean(), check_index_type=False)
+    pd.testing.assert_series_equal(medians, groupby.median(), check_index_type=False)
+    pd.testing.assert_series_equal(counts, groupby.size(), check_index_type=False)
+    for error, q in zip(errors, [0.15865, 0.84135, 0.02275, 0.97725]):
+        pd.testing.assert_series_equal(error, groupby.quantile(q) - groupby.median(), check_index_type=False)
+
+    means, medians, counts, errors = utils.calc_means_medians(binnumbers.astype(float), y, weights)
+    stats = utils.calc_grouped_statistics(binnumbers, y, weights, quantiles=[0.1, 0.9])
+    np.testing.assert_equal(means.index.values, np.arange(0, 40, 2))
+    for i, b in enumerate(stats.groups):
+        y_b, w_b = y[binnumbers == b], weights[binnumbers == b]
+        np.testing.assert_allclose(means[b], np.nansum(y_b * w_b) / np.sum(w_b))
+        np.testing.assert_allclose(counts[b], np.sum(w_b))
+        order = np.argsort(y_b, kind="mergesort")
+        cumsum = np.cumsum(w_b[order])
+        for q, value in zip([0.5, 0.1, 0.9], [medians[b], *stats.quantiles[i]]):
+            # missing values are sorted last
+            np.testing.assert_equal(value, y_b[order][np.argmax(cumsum >= q * cumsum[-1])])
+    np.testing.assert_allclose(stats.errors[0], errors[0].values)
+
+    quantile = utils.calc_weighted_quantile(binnumbers, y, weights, 0.9)
+    np.testing.assert_equal(quantile.values, stats.quantiles[:, 1])
+
+
+def test_arrow_values_and_validity():
+    pa = pytest.importorskip("pyarrow")
+
+    arr = pa.array(np.arange(10, dtype=np.float64))
+    values, valid = utils.arrow_values_and_validity(arr)
+    assert valid is None
+    # zero-copy view of the Arrow data buffer
+    assert values.ctypes.data == arr.buffers()[1].address
+    assert not values.flags.writeable
+
+    arr = pa.array([1, None, 3, 4, None, 6], type=pa.int64()).slice(1)
+    values, valid = utils.arrow_values_and_validity(arr)
+    np.testing.assert_array_equal(valid, [False, True, True, False, True])
+    np.testing.assert_array_equal(values[valid], [3, 4, 6])
+    assert values.ctypes.data == arr.buffers()[1].address + arr.offset * 8
+    np.testing.assert_array_equal(utils.arrow_column_to_numpy(arr), [np.nan, 3, 4, np.nan, 6])
+
+    values, valid = utils.arrow_values_and_validity(pa.array([True, None, False]))
+    np.testing.assert_array_equal(values, [True, False, False])
+    np.testing.assert_array_equal(valid, [True, False, True])
+
+
+def test_replace_arrow_columns():
+    pa = pytest.importorskip("pyarrow")
+
+    batch = pa.RecordBatch.from_pydict({"a": [1.0, 2.0], "b": [3, 4]})
+    replaced = utils.replace_arrow_columns(batch, {"a": np.array([5, 6])})
+    assert isinstance(replaced, pa.RecordBatch)
+    assert replaced.schema.names == ["a", "b"]
+    assert replaced.column(0).to_pylist() == [5, 6]
+    # the other columns are not copied
+    assert replaced.column(1).buffers()[1].address == batch.column(1).buffers()[1].address
+
+    table = pa.Table.from_batches([batch])
+    replaced = utils.replace_arrow_columns(table, {"b": np.array([7, 8])})
+    assert isinstance(replaced, pa.Table)
+    assert replaced.column("a").to_pylist() == [1.0, 2.0]
+    assert replaced.column("b").to_pylist() == [7, 8]
@@ -17,3 +17,11 @@ def costs_mad(prediction: np.ndarray, y: np.ndarray, weights):
 
 def costs_mse(prediction: np.ndarray, y: np.ndarray, weights):
     return np.nanmean(np.square(y - prediction))
+
+
+def costs_mse_gradient(prediction: np.ndarray, y: np.ndarray, weights):
+    return 2 * (prediction - y)
+
+
+def costs_mse_hessian(prediction: np.ndarray, y: np.ndarray, weights):
+    return np.full_like(prediction, 2.0)